@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.pagination import paginate
 from app.db.models import Component
 from app.schemas.responses import ComponentResponse
 
@@ -12,14 +13,17 @@ router = APIRouter()
 
 @router.get("/components", response_model=list[ComponentResponse])
 async def read_components(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(deps.get_session),
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
-    """Get all components"""
-    result = await session.execute(select(Component).offset(skip).limit(limit))
-
-    return result.scalars().all()
+    """Get all components, by id (paginated by `cursor`, see the Link header)"""
+    return await paginate(
+        session, Component, request, response, skip=skip, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/components/{component_id}", response_model=ComponentResponse)
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.pagination import paginate
 from app.db.models import Curriculum
 from app.schemas.responses import CurriculumResponse
 
@@ -11,12 +12,17 @@ router = APIRouter()
 
 @router.get("/curricula", response_model=list[CurriculumResponse])
 async def read_curricula(
-    session: AsyncSession = Depends(deps.get_session), skip: int = 0, limit: int = 100
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(deps.get_session),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
 ):
-    """Get all curricula"""
-    result = await session.execute(select(Curriculum).offset(skip).limit(limit))
-
-    return result.scalars().all()
+    """Get all curricula, by id (paginated by `cursor`, see the Link header)"""
+    return await paginate(
+        session, Curriculum, request, response, skip=skip, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/curricula/{curriculum_id}", response_model=CurriculumResponse)
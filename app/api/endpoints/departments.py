@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.pagination import paginate
 from app.db.models import Department
 from app.schemas.requests import DepartmentCreateRequest, DepartmentUpdateRequest
 from app.schemas.responses import DepartmentResponse
@@ -91,14 +92,17 @@ async def update_department(
 
 @router.get("/departments", response_model=list[DepartmentResponse])
 async def read_departments(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(deps.get_session),
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
-    """Get all departments"""
-    result = await session.execute(select(Department).offset(skip).limit(limit))
-
-    return result.scalars().all()
+    """Get all departments, by id (paginated by `cursor`, see the Link header)"""
+    return await paginate(
+        session, Department, request, response, skip=skip, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/departments/{department_id}", response_model=DepartmentResponse)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.db.curriculum_component import has_curricula_components
+
+router = APIRouter()
+
+# The catalog is never unloaded, so it's only checked until it's found
+catalog_loaded = False
+
+
+@router.get("/health/live")
+async def read_liveness():
+    """Check if the API is up"""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def read_readiness(session: AsyncSession = Depends(deps.get_session)):
+    """Check if the catalog (SIGAA data) is loaded"""
+    global catalog_loaded
+
+    if not catalog_loaded:
+        catalog_loaded = await has_curricula_components(session)
+
+    if not catalog_loaded:
+        raise HTTPException(status_code=503, detail="Catálogo não carregado")
+
+    return {"status": "ready"}
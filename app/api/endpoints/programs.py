@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.pagination import paginate
 from app.db.models import Program
 from app.schemas.responses import ProgramResponse
 
@@ -10,23 +11,26 @@ router = APIRouter()
 
 
 @router.get("/programs", response_model=list[ProgramResponse])
-async def read_departments(
+async def read_programs(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(deps.get_session),
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
 ):
-    """Get all departments"""
-    result = await session.execute(select(Program).offset(skip).limit(limit))
-
-    return result.scalars().all()
+    """Get all programs, by id (paginated by `cursor`, see the Link header)"""
+    return await paginate(
+        session, Program, request, response, skip=skip, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/programs/{program_id}", response_model=ProgramResponse)
-async def read_department(
+async def read_program(
     program_id: int,
     session: AsyncSession = Depends(deps.get_session),
 ):
-    """Get a department"""
+    """Get a program"""
     result = await session.execute(select(Program).where(Program.id == program_id))
 
     program = result.scalars().one_or_none()
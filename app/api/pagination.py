@@ -0,0 +1,76 @@
+"""
+Keyset (cursor) pagination of the list endpoints.
+
+Rows are listed by id, and the cursor is an opaque token of the last id of a
+page, so the next page is `WHERE id > :id ORDER BY id LIMIT :limit`: an index
+range scan, however deep the page, that doesn't shift while rows are written.
+The next page is given by the `Link` (rel="next") and `X-Next-Cursor` headers.
+`skip` still works, and is applied after the cursor.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Base
+
+
+def encode_cursor(last_id: int) -> str:
+    raw_cursor = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(raw_cursor).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw_cursor = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw_cursor)["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    return last_id
+
+
+async def paginate(
+    session: AsyncSession,
+    model: type[Base],
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[Any]:
+    """Get a page of the model rows, by id, setting the next page headers."""
+
+    id_column = model.__table__.c.id
+    statement = select(model)
+
+    if cursor is not None:
+        statement = statement.where(id_column > decode_cursor(cursor))
+
+    # One more row tells if there's a next page
+    result = await session.execute(
+        statement.order_by(id_column).offset(skip).limit(limit + 1)
+    )
+    rows = list(result.scalars().all())
+    has_next_page = len(rows) > limit
+    rows = rows[:limit]
+
+    if has_next_page and rows:
+        next_cursor = encode_cursor(rows[-1].id)
+        next_url = request.url.remove_query_params("skip").include_query_params(
+            cursor=next_cursor, limit=limit
+        )
+
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+    return rows
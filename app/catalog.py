@@ -0,0 +1,48 @@
+"""
+Export or import a catalog snapshot (see `app.db.catalog`).
+
+Usage:
+    python -m app.catalog export catalog.tar.gz
+    python -m app.catalog import catalog.tar.gz
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from app.core.session import async_session
+from app.db.catalog import catalog_log_base_prefix, export_catalog, import_catalog
+
+
+def log_manifest(action: str, manifest: dict, start: float):
+    rows = sum(table["rows"] for table in manifest["tables"].values())
+
+    print(
+        f"{catalog_log_base_prefix} {action} {rows} rows of "
+        f"{len(manifest['tables'])} tables in {time.monotonic() - start:.2f}s"
+    )
+
+
+async def main(arguments: argparse.Namespace):
+    start = time.monotonic()
+
+    async with async_session() as session:
+        if arguments.action == "export":
+            manifest = await export_catalog(session, arguments.path)
+            log_manifest("Exported", manifest, start)
+        else:
+            manifest = await import_catalog(session, arguments.path)
+            log_manifest("Imported", manifest, start)
+
+
+def get_arguments_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export or import a catalog snapshot")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path", type=Path, help="snapshot file (.tar.gz)")
+
+    return parser
+
+
+if __name__ == "__main__":
+    asyncio.run(main(get_arguments_parser().parse_args()))
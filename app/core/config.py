@@ -63,10 +63,52 @@ class Settings(BaseSettings):
     TEST_DATABASE_DB: str = "postgres"
     TEST_SQLALCHEMY_DATABASE_URI: str = ""
 
+    # BULK WRITES
+    DATABASE_UPSERT_CHUNK_SIZE: int = 500
+
     # FIRST SUPERUSER
     FIRST_SUPERUSER_EMAIL: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # CATALOG
+    CATALOG_SNAPSHOT_PATH: str = ""  # imported on startup if the catalog is empty
+
+    # SCRAPER
+    SCRAPER_MAX_CONCURRENCY: int = 4
+    SCRAPER_MIN_RATE: float = 0.2  # navigations per second per host
+    SCRAPER_MAX_RATE: float = 4.0  # politeness limit
+    SCRAPER_TARGET_LATENCY: float = 2.0  # seconds, slower responses back off
+    SCRAPER_SNAPSHOTS_DIR: str = f"{PROJECT_DIR}/snapshots"  # empty to disable
+    SCRAPER_CHECKPOINTS_DIR: str = f"{PROJECT_DIR}/checkpoints"
+    SCRAPER_METRICS_DIR: str = f"{PROJECT_DIR}/metrics"  # empty to disable reports
+    SCRAPER_BENCHMARKS_DIR: str = f"{PROJECT_DIR}/benchmarks"
+    SCRAPER_BENCHMARK_DATABASE: str = "benchmark"  # recreated on each benchmark
+    SCRAPER_CHECKPOINT_BATCH_SIZE: int = 50  # units stored between checkpoints
+    SCRAPER_PIPELINE_MAX_SIZE: int = 200  # records waiting for the writer
+    SCRAPER_MAX_ATTEMPTS: int = 3  # failures before a unit is left out of resumes
+    SCRAPER_BLOCKED_RESOURCES: list[str] = ["image", "stylesheet", "font", "media"]
+
+    # SCRAPER HTTP (server-rendered pages fetched without a browser)
+    SCRAPER_BASE_URL: str = "https://sigaa.unb.br/sigaa/public"
+    SCRAPER_HTTP_FETCH: bool = False
+    SCRAPER_HTTP_CONNECTIONS: int = 8  # pooled keep-alive connections
+    SCRAPER_HTTP_TIMEOUT: float = 30.0  # seconds
+    SCRAPER_HTTP_RECORD_DIR: str = ""  # record pages for a ReplicaServer, if set
+
+    # SCRAPER BROWSERS
+    SCRAPER_BROWSER_HEADLESS: bool = True
+    SCRAPER_BROWSER_EXECUTABLE_PATH: str = "/usr/bin/google-chrome"  # empty: bundled
+    SCRAPER_BROWSER_ARGS: list[str] = [
+        "--disable-gpu",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+    ]
+    SCRAPER_BROWSER_USER_DATA_DIR: str = ""  # empty to use temporary profiles
+    SCRAPER_BROWSER_POOL_SIZE: int = 1
+    SCRAPER_BROWSER_MAX_PAGES: int = 200  # pages opened before a browser is recycled
+    SCRAPER_MAX_OPEN_PAGES: int = 16
+    SCRAPER_LONG_LIVED_PAGE: float = 120  # seconds open before a page is reported
+
     @validator("DEFAULT_SQLALCHEMY_DATABASE_URI")
     def _assemble_default_db_connection(cls, v: str, values: dict[str, str]) -> str:
         return PostgresDsn.build(
@@ -0,0 +1,50 @@
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.db.models import Base
+
+
+async def upsert_by_sigaa_id(
+    session: AsyncSession,
+    model: type[Base],
+    rows: list[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> dict[Any, int]:
+    """Insert or update rows by their SIGAA ID, in chunks, in a single transaction.
+
+    Uses `INSERT ... ON CONFLICT (sigaa_id) DO UPDATE`, so each chunk is one
+    statement. Returns the ids of the rows by SIGAA ID.
+    """
+
+    chunk_size = chunk_size or config.settings.DATABASE_UPSERT_CHUNK_SIZE
+
+    # A statement can't update the same row twice, so the last row wins
+    unique_rows = list({row["sigaa_id"]: row for row in rows}.values())
+
+    ids: dict[Any, int] = {}
+
+    if not unique_rows:
+        return ids
+
+    for start in range(0, len(unique_rows), chunk_size):
+        chunk = unique_rows[start : start + chunk_size]
+
+        statement = insert(model).values(chunk)
+        statement = statement.on_conflict_do_update(
+            index_elements=[model.sigaa_id],
+            set_={
+                column: statement.excluded[column]
+                for column in chunk[0]
+                if column != "sigaa_id"
+            },
+        ).returning(model.sigaa_id, model.id)
+
+        result = await session.execute(statement)
+        ids.update(result.tuples().all())
+
+    await session.commit()
+
+    return ids
@@ -0,0 +1,202 @@
+"""
+Catalog snapshots: the SIGAA tables, dumped with PostgreSQL binary COPY.
+
+A snapshot is a gzipped tar with a `manifest.json` (format version, columns
+and row counts of each table) and the binary COPY of each table, so a fresh
+database (dev, staging, tests) gets the catalog without scraping SIGAA.
+"""
+
+import io
+import json
+import tarfile
+import time
+from pathlib import Path
+from typing import Any
+
+from asyncpg import Connection
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models import (
+    Base,
+    Component,
+    Corequisite,
+    Curriculum,
+    CurriculumComponent,
+    Department,
+    EquivalenceComponent,
+    EquivalenceOption,
+    PageFingerprint,
+    PrerequisiteComponent,
+    PrerequisiteOption,
+    Program,
+)
+
+CATALOG_SNAPSHOT_VERSION = 1
+
+# In insert order, referenced tables first
+catalog_models: tuple[type[Base], ...] = (
+    Department,
+    Program,
+    Curriculum,
+    Component,
+    CurriculumComponent,
+    PrerequisiteOption,
+    PrerequisiteComponent,
+    EquivalenceOption,
+    EquivalenceComponent,
+    Corequisite,
+)
+
+catalog_log_base_prefix = "[Catalog]"
+
+
+def get_columns(model: type[Base]) -> list[str]:
+    return [column.name for column in model.__table__.columns]
+
+
+async def get_driver_connection(session: AsyncSession) -> Connection:
+    """Get the asyncpg connection of the session, in its current transaction."""
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    return raw_connection.driver_connection
+
+
+def add_member(archive: tarfile.TarFile, name: str, data: bytes):
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    member.mtime = int(time.time())
+
+    archive.addfile(member, io.BytesIO(data))
+
+
+def read_member(archive: tarfile.TarFile, name: str) -> bytes:
+    member = archive.extractfile(name)
+
+    if member is None:
+        raise Exception(f"Catalog snapshot member not found ({name})")
+
+    return member.read()
+
+
+async def export_catalog(session: AsyncSession, path: Path) -> dict[str, Any]:
+    """Export the catalog tables to a snapshot file, returning its manifest."""
+
+    # Every table is read from the same database snapshot
+    await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    exported_at = (await session.execute(select(func.now()))).scalar_one()
+    driver_connection = await get_driver_connection(session)
+
+    manifest: dict[str, Any] = {
+        "version": CATALOG_SNAPSHOT_VERSION,
+        "exported_at": exported_at.isoformat(),
+        "tables": {},
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tarfile.open(path, "w:gz") as archive:
+        for model in catalog_models:
+            table, columns = model.__tablename__, get_columns(model)
+            chunks: list[bytes] = []
+
+            async def write(chunk: bytes):
+                chunks.append(chunk)
+
+            status = await driver_connection.copy_from_table(
+                table, columns=columns, output=write, format="binary"
+            )
+
+            # The status is "COPY <rows>"
+            manifest["tables"][table] = {
+                "columns": columns,
+                "rows": int(status.split()[-1]),
+            }
+            add_member(archive, f"{table}.copy", b"".join(chunks))
+
+        add_member(archive, "manifest.json", json.dumps(manifest, indent=2).encode())
+
+    await session.commit()
+
+    return manifest
+
+
+def read_catalog_snapshot(path: Path) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """Read the manifest and the tables of a snapshot, checking they fit the models."""
+
+    with tarfile.open(path, "r:gz") as archive:
+        manifest = json.loads(read_member(archive, "manifest.json"))
+
+        if manifest.get("version") != CATALOG_SNAPSHOT_VERSION:
+            raise Exception(
+                f"Unsupported catalog snapshot version ({manifest.get('version')})"
+            )
+
+        tables: dict[str, bytes] = {}
+
+        for model in catalog_models:
+            table = model.__tablename__
+            columns = manifest["tables"].get(table, {}).get("columns")
+
+            if columns != get_columns(model):
+                raise Exception(f"Catalog snapshot columns don't match ({table})")
+
+            tables[table] = read_member(archive, f"{table}.copy")
+
+    return manifest, tables
+
+
+async def import_catalog(session: AsyncSession, path: Path) -> dict[str, Any]:
+    """Replace the catalog tables by a snapshot, in a single transaction.
+
+    Tables are copied into staging tables first, so a bad snapshot fails
+    before the catalog is touched; then the catalog is swapped by truncating
+    and filling every table at once. Page fingerprints are cleared, so the
+    next scrape stores every page again.
+    """
+
+    manifest, tables = read_catalog_snapshot(path)
+
+    for table in tables:
+        await session.execute(
+            text(f"CREATE TEMP TABLE staging_{table} (LIKE {table}) ON COMMIT DROP")
+        )
+
+    driver_connection = await get_driver_connection(session)
+
+    for model in catalog_models:
+        table = model.__tablename__
+
+        # A bytes source would be taken as a file path
+        await driver_connection.copy_to_table(
+            f"staging_{table}",
+            source=io.BytesIO(tables[table]),
+            columns=get_columns(model),
+            format="binary",
+        )
+
+    await session.execute(text(f"TRUNCATE {', '.join(tables)}"))
+
+    for model in catalog_models:
+        table, columns = model.__tablename__, ", ".join(get_columns(model))
+
+        await session.execute(
+            text(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM staging_{table}"
+            )
+        )
+        await session.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+            )
+        )
+
+    await session.execute(PageFingerprint.__table__.delete())
+    await session.commit()
+
+    return manifest
@@ -1,6 +1,9 @@
+from typing import Any
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.bulk import upsert_by_sigaa_id
 from app.db.models import Component
 
 
@@ -12,11 +15,36 @@ async def store_or_update_component(session: AsyncSession, component: Component)
     current_component = result.scalars().one_or_none()
 
     if current_component:
-        current_component = component
+        component.id = current_component.id
+        current_component = await session.merge(component)
 
     else:
         session.add(component)
+        current_component = component
 
     await session.commit()
 
     return current_component
+
+
+async def upsert_components(
+    session: AsyncSession,
+    components: list[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> dict[str, int]:
+    """Store or update components in bulk, returning their ids by SIGAA ID."""
+
+    return await upsert_by_sigaa_id(session, Component, components, chunk_size)
+
+
+async def get_components_ids_by_sigaa_ids(
+    session: AsyncSession, sigaa_ids: set[str]
+) -> dict[str, int]:
+    """Get the ids of the components with the given SIGAA IDs, by SIGAA ID."""
+
+    expression = Component.sigaa_id.in_(sigaa_ids)
+    result = await session.execute(
+        select(Component.sigaa_id, Component.id).where(expression)
+    )
+
+    return dict(result.tuples().all())
@@ -1,6 +1,9 @@
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.db.bulk import upsert_by_sigaa_id
 from app.db.models import Curriculum
 
 
@@ -12,11 +15,23 @@ async def store_or_update_curriculum(session: AsyncSession, curriculum: Curricul
     current_curriculum = result.scalars().one_or_none()
 
     if current_curriculum:
-        current_curriculum = curriculum
+        curriculum.id = current_curriculum.id
+        current_curriculum = await session.merge(curriculum)
 
     else:
         session.add(curriculum)
+        current_curriculum = curriculum
 
     await session.commit()
 
     return current_curriculum
+
+
+async def upsert_curricula(
+    session: AsyncSession,
+    curricula: list[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> dict[str, int]:
+    """Store or update curricula in bulk, returning their ids by SIGAA ID."""
+
+    return await upsert_by_sigaa_id(session, Curriculum, curricula, chunk_size)
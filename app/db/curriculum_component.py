@@ -0,0 +1,116 @@
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    String,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core import config
+from app.db.models import Component, Curriculum, CurriculumComponent
+
+
+async def replace_curricula_components(
+    session: AsyncSession,
+    curricula_components: dict[str, list[dict[str, Any]]],
+    chunk_size: int | None = None,
+):
+    """Replace the components of the given curricula, in a single transaction.
+
+    Curricula and components are given by SIGAA ID and resolved by the insert
+    itself (INSERT ... SELECT), so components that are not stored yet are left
+    out instead of being looked up one by one.
+    """
+
+    chunk_size = chunk_size or config.settings.DATABASE_UPSERT_CHUNK_SIZE
+
+    if not curricula_components:
+        return
+
+    curricula_ids = select(Curriculum.id).where(
+        Curriculum.sigaa_id.in_(list(curricula_components))
+    )
+    await session.execute(
+        delete(CurriculumComponent).where(
+            CurriculumComponent.curriculum_id.in_(curricula_ids.scalar_subquery())
+        )
+    )
+
+    rows = [
+        (curriculum_sigaa_id, row["component_sigaa_id"], row["type"], row["period"])
+        for curriculum_sigaa_id, rows in curricula_components.items()
+        for row in rows
+    ]
+
+    for start in range(0, len(rows), chunk_size):
+        members = values(
+            column("curriculum_sigaa_id", String),
+            column("component_sigaa_id", String),
+            column("type", String),
+            column("period", Integer),
+            name="members",
+        ).data(rows[start : start + chunk_size])
+
+        members_select = (
+            select(
+                Curriculum.id,
+                Component.id,
+                members.c.type,
+                # Rendered as NULL when missing, which would be typed as text
+                cast(members.c.period, Integer),
+                literal(0),
+            )
+            .join_from(
+                members,
+                Curriculum,
+                Curriculum.sigaa_id == members.c.curriculum_sigaa_id,
+            )
+            .join(Component, Component.sigaa_id == members.c.component_sigaa_id)
+        )
+
+        await session.execute(
+            insert(CurriculumComponent).from_select(
+                [
+                    CurriculumComponent.curriculum_id,
+                    CurriculumComponent.component_id,
+                    CurriculumComponent.type,
+                    CurriculumComponent.period,
+                    CurriculumComponent.percentage_prerequisite,
+                ],
+                members_select,
+            )
+        )
+
+    await session.commit()
+
+
+async def count_curricula_components(
+    session: AsyncSession, curricula_sigaa_ids: set[str]
+) -> dict[str, int]:
+    """Count the stored components of the given curricula, by SIGAA ID."""
+
+    result = await session.execute(
+        select(Curriculum.sigaa_id, func.count(CurriculumComponent.id))
+        .join(CurriculumComponent, CurriculumComponent.curriculum_id == Curriculum.id)
+        .where(Curriculum.sigaa_id.in_(curricula_sigaa_ids))
+        .group_by(Curriculum.sigaa_id)
+    )
+
+    return dict(result.tuples().all())
+
+
+async def has_curricula_components(session: AsyncSession) -> bool:
+    """Check if any curriculum structure is stored, i.e. if the catalog is loaded."""
+
+    result = await session.execute(select(exists().select_from(CurriculumComponent)))
+
+    return bool(result.scalar())
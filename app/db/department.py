@@ -1,6 +1,10 @@
+from typing import Any
+
+from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.db.bulk import upsert_by_sigaa_id
 from app.db.models import Department
 
 
@@ -24,12 +28,22 @@ async def store_or_update_department(
     return department
 
 
+async def upsert_departments(
+    session: AsyncSession,
+    departments: list[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> dict[int, int]:
+    """Store or update departments in bulk, returning their ids by SIGAA ID."""
+
+    return await upsert_by_sigaa_id(session, Department, departments, chunk_size)
+
+
 async def get_department_by_acronym_and_title(
     session: AsyncSession, acronym: str, title: str
 ):
     """Get a department by its acronym and title."""
 
-    expression = Department.acronym == acronym and Department.title == title
+    expression = and_(Department.acronym == acronym, Department.title == title)
 
     result = await session.execute(select(Department).where(expression))
 
@@ -42,3 +56,11 @@ async def get_department_by_title(session: AsyncSession, title: str):
     result = await session.execute(select(Department).where(Department.title == title))
 
     return result.scalars().one()
+
+
+async def get_departments(session: AsyncSession):
+    """Get all departments."""
+
+    result = await session.execute(select(Department))
+
+    return result.scalars().all()
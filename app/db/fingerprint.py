@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.models import PageFingerprint
+
+
+async def get_fingerprints(
+    session: AsyncSession, keys: list[str]
+) -> dict[str, PageFingerprint]:
+    """Get the fingerprints of the given page keys."""
+
+    expression = PageFingerprint.key.in_(keys)
+    result = await session.execute(select(PageFingerprint).where(expression))
+
+    return {fingerprint.key: fingerprint for fingerprint in result.scalars().all()}
+
+
+async def store_fingerprints(session: AsyncSession, content_hashes: dict[str, str]):
+    """Store (or update) the fingerprints of the checked pages."""
+
+    fingerprints = await get_fingerprints(session, list(content_hashes))
+    now = datetime.utcnow()
+
+    for key, content_hash in content_hashes.items():
+        fingerprint = fingerprints.get(key)
+
+        if fingerprint is None:
+            fingerprint = PageFingerprint(
+                key=key,
+                content_hash=content_hash,
+                checks=1,
+                changes=1,
+                checked_at=now,
+                changed_at=now,
+            )
+            session.add(fingerprint)
+            continue
+
+        fingerprint.checks += 1
+        fingerprint.checked_at = now
+
+        if fingerprint.content_hash != content_hash:
+            fingerprint.content_hash = content_hash
+            fingerprint.changes += 1
+            fingerprint.changed_at = now
+
+    await session.commit()
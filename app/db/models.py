@@ -14,6 +14,7 @@ alembic revision --autogenerate -m "migration_name"
 alembic upgrade head
 """
 import uuid
+from datetime import datetime
 from typing import Annotated, Literal
 
 from sqlalchemy import ForeignKey, String
@@ -91,6 +92,7 @@ class Component(Base):
     sigaa_id: Mapped[str_unique_index]
     title: Mapped[str]
     type: Mapped[Literal["COURSE", "ACTIVITY"]]
+    workload: Mapped[int | None]
 
     department_id: Mapped[int] = mapped_column(ForeignKey("department.id"))
 
@@ -100,9 +102,10 @@ class CurriculumComponent(Base):
 
     id: Mapped[int_pk]
     type: Mapped[Literal["MANDATORY", "ELECTIVE"]]
+    period: Mapped[int | None]
     percentage_prerequisite: Mapped[int]
 
-    curriculum_id: Mapped[int] = mapped_column(ForeignKey("curriculum.id"))
+    curriculum_id: Mapped[int] = mapped_column(ForeignKey("curriculum.id"), index=True)
     component_id: Mapped[int] = mapped_column(ForeignKey("component.id"))
 
 
@@ -151,3 +154,15 @@ class Corequisite(Base):
 
     component_id: Mapped[int] = mapped_column(ForeignKey("component.id"))
     corequisite_id: Mapped[int] = mapped_column(ForeignKey("component.id"))
+
+
+class PageFingerprint(Base):
+    __tablename__ = "page_fingerprint"
+
+    id: Mapped[int_pk]
+    key: Mapped[str_unique_index]
+    content_hash: Mapped[str]
+    checks: Mapped[int]
+    changes: Mapped[int]
+    checked_at: Mapped[datetime]
+    changed_at: Mapped[datetime]
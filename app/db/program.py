@@ -1,6 +1,9 @@
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.db.bulk import upsert_by_sigaa_id
 from app.db.models import Program
 
 
@@ -12,16 +15,28 @@ async def store_or_update_program(session: AsyncSession, program: Program):
     current_program = result.scalars().one_or_none()
 
     if current_program:
-        current_program = program
+        program.id = current_program.id
+        current_program = await session.merge(program)
 
     else:
         session.add(program)
+        current_program = program
 
     await session.commit()
 
     return current_program
 
 
+async def upsert_programs(
+    session: AsyncSession,
+    programs: list[dict[str, Any]],
+    chunk_size: int | None = None,
+) -> dict[int, int]:
+    """Store or update programs in bulk, returning their ids by SIGAA ID."""
+
+    return await upsert_by_sigaa_id(session, Program, programs, chunk_size)
+
+
 async def get_programs(session: AsyncSession):
     """Get all programs."""
 
@@ -39,3 +54,16 @@ async def get_program_by_sigaa_id(session: AsyncSession, sigaa_id: int):
     program = result.scalars().one_or_none()
 
     return program
+
+
+async def get_programs_ids_by_sigaa_ids(
+    session: AsyncSession, sigaa_ids: set[int]
+) -> dict[int, int]:
+    """Get the ids of the programs with the given SIGAA IDs, by SIGAA ID."""
+
+    expression = Program.sigaa_id.in_(sigaa_ids)
+    result = await session.execute(
+        select(Program.sigaa_id, Program.id).where(expression)
+    )
+
+    return dict(result.tuples().all())
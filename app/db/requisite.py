@@ -0,0 +1,223 @@
+from sqlalchemy import Integer, String, cast, column, delete, func, insert, values
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+
+from app.core import config
+from app.db.models import (
+    Component,
+    Corequisite,
+    EquivalenceComponent,
+    EquivalenceOption,
+    PrerequisiteComponent,
+    PrerequisiteOption,
+)
+
+
+def get_components_ids(components_sigaa_ids: list[str]):
+    return select(Component.id).where(Component.sigaa_id.in_(components_sigaa_ids))
+
+
+async def get_stored_sigaa_ids(
+    session: AsyncSession, sigaa_ids: list[str], chunk_size: int
+) -> set[str]:
+    """Get which of the components (by SIGAA ID) are stored."""
+
+    stored_sigaa_ids: set[str] = set()
+
+    for start in range(0, len(sigaa_ids), chunk_size):
+        result = await session.execute(
+            select(Component.sigaa_id).where(
+                Component.sigaa_id.in_(sigaa_ids[start : start + chunk_size])
+            )
+        )
+        stored_sigaa_ids.update(result.scalars().all())
+
+    return stored_sigaa_ids
+
+
+async def get_next_ids(session: AsyncSession, table_name: str, count: int) -> list[int]:
+    """Allocate ids from the sequence of a table, in a single statement."""
+
+    sequence = func.nextval(cast(f"{table_name}_id_seq", REGCLASS))
+    result = await session.execute(
+        select(sequence).select_from(func.generate_series(1, count))
+    )
+
+    return list(result.scalars().all())
+
+
+async def replace_options(
+    session: AsyncSession,
+    option_model: type[PrerequisiteOption] | type[EquivalenceOption],
+    member_model: type[PrerequisiteComponent] | type[EquivalenceComponent],
+    components_options: dict[str, list[list[str]]],
+    chunk_size: int,
+):
+    """Replace the options of the given components (by SIGAA ID).
+
+    Option ids are allocated upfront, so options and their components are
+    inserted in bulk (INSERT ... SELECT), resolving SIGAA IDs in the database.
+    Components that are not stored are left out, and so are options with a
+    member that is not stored: without it, an option would be weaker than the
+    requisite (or empty).
+    """
+
+    option_id_column = getattr(member_model, f"{option_model.__tablename__}_id")
+
+    options_ids = select(option_model.id).where(
+        option_model.component_id.in_(
+            get_components_ids(list(components_options)).scalar_subquery()
+        )
+    )
+    await session.execute(
+        delete(member_model).where(option_id_column.in_(options_ids.scalar_subquery()))
+    )
+    await session.execute(
+        delete(option_model).where(option_model.id.in_(options_ids.scalar_subquery()))
+    )
+
+    options = [
+        (component_sigaa_id, option)
+        for component_sigaa_id, component_options in components_options.items()
+        for option in component_options
+    ]
+    stored_sigaa_ids = await get_stored_sigaa_ids(
+        session,
+        sorted({sigaa_id for key, option in options for sigaa_id in [key, *option]}),
+        chunk_size,
+    )
+    options = [
+        (component_sigaa_id, option)
+        for component_sigaa_id, option in options
+        if component_sigaa_id in stored_sigaa_ids
+    ]
+    complete_options = [
+        (component_sigaa_id, option)
+        for component_sigaa_id, option in options
+        if stored_sigaa_ids.issuperset(option)
+    ]
+
+    if len(complete_options) < len(options):
+        print(
+            f"[Requisites] Left out {len(options) - len(complete_options)} "
+            f"{option_model.__tablename__} options with components not stored"
+        )
+
+    options = complete_options
+
+    if not options:
+        return
+
+    ids = await get_next_ids(session, option_model.__tablename__, len(options))
+
+    option_rows = [
+        (option_id, component_sigaa_id)
+        for option_id, (component_sigaa_id, _) in zip(ids, options)
+    ]
+    member_rows = [
+        (option_id, member_sigaa_id)
+        for option_id, (_, option) in zip(ids, options)
+        for member_sigaa_id in option
+    ]
+
+    for start in range(0, len(option_rows), chunk_size):
+        rows = values(
+            column("id", Integer),
+            column("component_sigaa_id", String),
+            name="options",
+        ).data(option_rows[start : start + chunk_size])
+
+        await session.execute(
+            insert(option_model).from_select(
+                [option_model.id, option_model.component_id],
+                select(rows.c.id, Component.id).join_from(
+                    rows, Component, Component.sigaa_id == rows.c.component_sigaa_id
+                ),
+            )
+        )
+
+    for start in range(0, len(member_rows), chunk_size):
+        rows = values(
+            column("option_id", Integer),
+            column("component_sigaa_id", String),
+            name="members",
+        ).data(member_rows[start : start + chunk_size])
+
+        # Every member is stored, so joining the components leaves none out
+        await session.execute(
+            insert(member_model).from_select(
+                [option_id_column, member_model.component_id],
+                select(option_model.id, Component.id)
+                .join_from(rows, option_model, option_model.id == rows.c.option_id)
+                .join(Component, Component.sigaa_id == rows.c.component_sigaa_id),
+            )
+        )
+
+
+async def replace_corequisites(
+    session: AsyncSession,
+    components_corequisites: dict[str, list[str]],
+    chunk_size: int,
+):
+    """Replace the corequisites of the given components (by SIGAA ID)."""
+
+    await session.execute(
+        delete(Corequisite).where(
+            Corequisite.component_id.in_(
+                get_components_ids(list(components_corequisites)).scalar_subquery()
+            )
+        )
+    )
+
+    pairs = [
+        (component_sigaa_id, corequisite_sigaa_id)
+        for component_sigaa_id, corequisites in components_corequisites.items()
+        for corequisite_sigaa_id in corequisites
+    ]
+
+    corequisite = aliased(Component)
+
+    for start in range(0, len(pairs), chunk_size):
+        rows = values(
+            column("component_sigaa_id", String),
+            column("corequisite_sigaa_id", String),
+            name="pairs",
+        ).data(pairs[start : start + chunk_size])
+
+        await session.execute(
+            insert(Corequisite).from_select(
+                [Corequisite.component_id, Corequisite.corequisite_id],
+                select(Component.id, corequisite.id)
+                .join_from(
+                    rows, Component, Component.sigaa_id == rows.c.component_sigaa_id
+                )
+                .join(
+                    corequisite,
+                    corequisite.sigaa_id == rows.c.corequisite_sigaa_id,
+                ),
+            )
+        )
+
+
+async def replace_requisites(
+    session: AsyncSession,
+    prerequisites: dict[str, list[list[str]]],
+    equivalences: dict[str, list[list[str]]],
+    corequisites: dict[str, list[str]],
+    chunk_size: int | None = None,
+):
+    """Replace the requisites of the given components, in a single transaction."""
+
+    chunk_size = chunk_size or config.settings.DATABASE_UPSERT_CHUNK_SIZE
+
+    await replace_options(
+        session, PrerequisiteOption, PrerequisiteComponent, prerequisites, chunk_size
+    )
+    await replace_options(
+        session, EquivalenceOption, EquivalenceComponent, equivalences, chunk_size
+    )
+    await replace_corequisites(session, corequisites, chunk_size)
+
+    await session.commit()
@@ -1,12 +1,14 @@
 import asyncio
+from pathlib import Path
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import config, security
 from app.core.session import async_session
+from app.db.catalog import import_catalog
+from app.db.curriculum_component import has_curricula_components
 from app.db.models import User
-from app.scraper.main import create_sigaa_data
 
 
 async def create_superuser(session: AsyncSession):
@@ -33,10 +35,30 @@ async def create_superuser(session: AsyncSession):
         print("Superuser already exists")
 
 
+async def import_catalog_snapshot(session: AsyncSession):
+    """Import the catalog snapshot, if configured and the catalog is empty."""
+
+    snapshot_path = config.settings.CATALOG_SNAPSHOT_PATH
+
+    if not snapshot_path:
+        return
+
+    if await has_curricula_components(session):
+        print("Catalog already loaded")
+        return
+
+    print(f"Importing catalog snapshot {snapshot_path}...")
+
+    manifest = await import_catalog(session, Path(snapshot_path))
+    rows = sum(table["rows"] for table in manifest["tables"].values())
+
+    print(f"Catalog imported ({rows} rows)")
+
+
 async def main() -> None:
     async with async_session() as session:
         await create_superuser(session)
-        await create_sigaa_data(session)
+        await import_catalog_snapshot(session)
 
 
 if __name__ == "__main__":
@@ -23,6 +23,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination headers of the list endpoints
+    expose_headers=["Link", "X-Next-Cursor"],
 )
 
 # Guards against HTTP Host Header attacks
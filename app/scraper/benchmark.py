@@ -0,0 +1,514 @@
+"""
+Benchmark the scraper against a local replica of SIGAA.
+
+A synthetic page set (or one recorded with SCRAPER_HTTP_RECORD_DIR) is served
+by a `ReplicaServer`, and the whole scraper (departments, programs, curricula
+and components) runs against it in a subprocess. Its metrics report gives:
+
+- pages per second;
+- CDP calls per page (0 with SCRAPER_HTTP_FETCH, except for components);
+- DB statements per stored record;
+- the peak RSS of the largest process (scraper or browser).
+
+The scraper runs against a dedicated database (SCRAPER_BENCHMARK_DATABASE,
+on the configured server), dropped, created and migrated before each run, so
+the configured catalog is never touched.
+
+Usage: python -m app.scraper.benchmark [--pages DIR] [--workers N] [--http]
+       [--database NAME]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from app.core import config
+from app.scraper.http import VIEW_STATE, get_route, get_route_path
+from app.scraper.replica import ReplicaServer
+
+benchmark_log_base_prefix = "[Benchmark]"
+
+database_name_pattern = re.compile(r"[a-z_][a-z0-9_]*")
+
+base_path = "/sigaa/public"
+curricula_form_id = "formCurriculosCurso"
+report_form_id = "formRelatorio"
+report_action = f"{base_path}/curso/relatorio.jsf"
+
+# Mojarra's command link script: submit the form with the link parameters
+command_link_script = """
+<script>
+function jsfcljs(f, pvp, t) {
+    var inputs = [];
+    for (var name in pvp) {
+        var input = document.createElement('input');
+        input.type = 'hidden';
+        input.name = name;
+        input.value = pvp[name];
+        f.appendChild(input);
+        inputs.push(input);
+    }
+    if (t) { f.target = t; }
+    f.submit();
+    inputs.forEach(function (input) { f.removeChild(input); });
+}
+</script>
+"""
+
+
+def get_command_link(form_id: str, params: dict[str, str], title: str) -> str:
+    raw_params = ",".join(f"'{name}':'{value}'" for name, value in params.items())
+    onclick = (
+        "if(typeof jsfcljs == 'function'){jsfcljs(document.getElementById("
+        f"'{form_id}'),{{{raw_params}}},'');}}return false"
+    )
+
+    return f'<a href="#" title="{title}" onclick="{onclick}">{title}</a>'
+
+
+def get_form(form_id: str, action: str, content: str) -> str:
+    return (
+        f'<form id="{form_id}" method="post" action="{action}">'
+        f'<input type="hidden" name="{form_id}" value="{form_id}">'
+        f'<input type="hidden" name="{VIEW_STATE}" value="j_id1">'
+        f"{content}</form>"
+    )
+
+
+def get_page(content: str) -> str:
+    return (
+        "<html><head><meta charset='utf-8'>"
+        f"{command_link_script}</head><body>{content}</body></html>"
+    )
+
+
+class SyntheticSite:
+    """A small SIGAA-like catalog, written as replica pages.
+
+    Each department has its programs, each program its curricula, and each
+    curriculum lists components of its department (shared across curricula,
+    as real ones are), with requisites on earlier components.
+    """
+
+    def __init__(
+        self,
+        departments: int = 4,
+        programs: int = 2,
+        curricula: int = 2,
+        components: int = 40,
+        periods: int = 8,
+    ):
+        self.departments = departments
+        self.programs = programs
+        self.curricula = curricula
+        self.components = components
+        self.periods = periods
+        self.files = 0
+
+    def write(self, root: Path, url: str, html: str, fields: dict | None = None):
+        route_path = get_route_path(root, get_route(url, fields))
+        route_path.parent.mkdir(parents=True, exist_ok=True)
+        route_path.write_text(get_page(html))
+
+        self.files += 1
+
+    def get_department_sigaa_id(self, department: int) -> int:
+        return 100 + department
+
+    def get_component_sigaa_id(self, department: int, component: int) -> str:
+        return f"D{department:02d}{component:04d}"
+
+    def get_program_sigaa_id(self, department: int, program: int) -> int:
+        return 400000 + department * 100 + program
+
+    def write_departments(self, root: Path):
+        options = "".join(
+            f'<option value="{self.get_department_sigaa_id(d)}">D{d:02d}</option>'
+            for d in range(self.departments)
+        )
+        self.write(
+            root,
+            f"{base_path}/componentes/busca_componentes.jsf",
+            '<select id="form:unidades"><option value="0">-- SELECIONE --</option>'
+            f"{options}</select>",
+        )
+
+        for department in range(self.departments):
+            rows = "".join(
+                f'<tr class="linhaPar"><td>{self.get_component_sigaa_id(department, c)}'
+                f"</td><td>COMPONENTE {c}</td><td>DISCIPLINA</td><td>60h</td></tr>"
+                for c in range(self.components)
+            )
+            sigaa_id = self.get_department_sigaa_id(department)
+
+            self.write(
+                root,
+                f"{base_path}/departamento/componentes.jsf?id={sigaa_id}",
+                f'<div id="colDirTop"><h1>D{department:02d}</h1>'
+                f"<h2>DEPARTAMENTO {department}</h2></div>"
+                '<table class="listagem"><tr><th>Código</th><th>Nome</th>'
+                f"<th>Tipo</th><th>CH Total</th></tr>{rows}</table>",
+            )
+
+    def write_programs(self, root: Path):
+        rows = []
+
+        for department in range(self.departments):
+            rows.append(
+                f'<tr><td colspan="3">D{department:02d} - DEPARTAMENTO {department}'
+                "</td></tr>"
+            )
+            rows.extend(
+                f'<tr class="linhaPar"><td><a href="{base_path}/curso/portal.jsf?id='
+                f'{self.get_program_sigaa_id(department, p)}">CURSO {department}.{p}'
+                "</a></td><td>Bacharel</td><td>Diurno</td></tr>"
+                for p in range(self.programs)
+            )
+
+        self.write(
+            root,
+            f"{base_path}/curso/lista.jsf?nivel=G&aba=p-graduacao",
+            f'<table class="listagem">{"".join(rows)}</table>',
+        )
+
+    def write_curricula(self, root: Path):
+        for department in range(self.departments):
+            for program in range(self.programs):
+                program_sigaa_id = self.get_program_sigaa_id(department, program)
+                rows = []
+
+                for curriculum in range(self.curricula):
+                    sigaa_id = f"{program_sigaa_id}/{curriculum}"
+                    params = {
+                        f"{curricula_form_id}:relatorio": (
+                            f"{curricula_form_id}:relatorio"
+                        ),
+                        "id": f"{program_sigaa_id}{curriculum}",
+                    }
+                    anchor = get_command_link(
+                        curricula_form_id,
+                        params,
+                        "Relatório da Estrutura Curricular",
+                    )
+                    rows.append(
+                        f'<tr class="linha_par"><td>Detalhes da Estrutura Curricular '
+                        f"{sigaa_id}, Criado em 2020</td><td>Ativa</td>"
+                        f"<td>{anchor}</td></tr>"
+                    )
+
+                    self.write(
+                        root,
+                        f"{base_path}/curso/curriculo.jsf",
+                        self.get_report(department, sigaa_id, curriculum),
+                        {curricula_form_id: curricula_form_id, **params},
+                    )
+
+                self.write(
+                    root,
+                    f"{base_path}/curso/curriculo.jsf?id={program_sigaa_id}",
+                    get_form(
+                        curricula_form_id,
+                        f"{base_path}/curso/curriculo.jsf",
+                        f'<table id="table_lt">{"".join(rows)}</table>',
+                    ),
+                )
+
+    def get_component_row(self, department: int, component: int) -> str:
+        sigaa_id = self.get_component_sigaa_id(department, component)
+        anchor = get_command_link(
+            report_form_id,
+            {
+                f"{report_form_id}:detalhes": f"{report_form_id}:detalhes",
+                "id": sigaa_id,
+            },
+            "Visualizar Detalhes do Componente Curricular",
+        )
+
+        return (
+            f'<tr class="componentes"><td>{sigaa_id} - COMPONENTE {component}</td>'
+            f"<td>{anchor}</td></tr>"
+        )
+
+    def get_report(self, department: int, sigaa_id: str, curriculum: int) -> str:
+        # Curricula of a department share most components, shifted by one
+        components = [
+            (c + curriculum) % self.components for c in range(self.components)
+        ]
+        mandatory, electives = components[::2], components[1::2]
+        per_period = max(len(mandatory) // self.periods, 1)
+
+        rows = []
+
+        for index, component in enumerate(mandatory):
+            if index % per_period == 0 and index // per_period < self.periods:
+                rows.append(f"<tr><td>{index // per_period + 1}º Período</td></tr>")
+
+            rows.append(self.get_component_row(department, component))
+
+        elective_rows = "".join(
+            self.get_component_row(department, c) for c in electives
+        )
+
+        return get_form(
+            report_form_id,
+            report_action,
+            f"""
+            <table>
+                <tr><th>Código:</th><td>{sigaa_id}</td></tr>
+                <tr><th>Período Letivo de Entrada em Vigor:</th><td>2020.1</td></tr>
+                <tr><th>Mínimo:</th><td>{self.periods}</td>
+                    <th>Máximo:</th><td>{self.periods * 2}</td></tr>
+                <tr><th>Carga Horária Mínima por Período Letivo:</th><td>210h</td></tr>
+                <tr><th>Carga Horária Máxima por Período Letivo:</th><td>480h</td></tr>
+                <tr><th>Total Mínima:</th><td>3000h</td></tr>
+                <tr><th>Total:</th><td>2400h</td></tr>
+                <tr><th>Carga Horária Optativa Mínima:</th><td>360h</td></tr>
+                <tr><th>Carga Horária Complementar Mínima:</th><td>240h</td></tr>
+                <tr><th>Carga Horária Máxima de Componentes Eletivos:</th>
+                    <td>240h</td></tr>
+            </table>
+            <table>{"".join(rows)}</table>
+            <table><tr><td>Optativas</td></tr>{elective_rows}</table>
+            """,
+        )
+
+    def get_prerequisites(self, department: int, component: int) -> str:
+        if component < 2:
+            return "-"
+
+        first, second, third = (
+            self.get_component_sigaa_id(department, c)
+            for c in (component - 1, component - 2, component // 2)
+        )
+
+        return f"( {first} E {second} ) OU {third}"
+
+    def write_components(self, root: Path):
+        for department in range(self.departments):
+            for component in range(self.components):
+                sigaa_id = self.get_component_sigaa_id(department, component)
+                equivalence = self.get_component_sigaa_id(
+                    (department + 1) % self.departments, component
+                )
+
+                self.write(
+                    root,
+                    report_action,
+                    f"""
+                    <table class="visualizacao">
+                        <tr><th>Tipo do Componente Curricular:</th>
+                            <td>DISCIPLINA</td></tr>
+                        <tr><th>Unidade Responsável:</th>
+                            <td>DEPARTAMENTO {department} - D{department:02d}</td></tr>
+                        <tr><th>Código:</th><td>{sigaa_id}</td></tr>
+                        <tr><th>Nome:</th><td>COMPONENTE {component}</td></tr>
+                        <tr><th>Pré-Requisitos:</th>
+                            <td>{self.get_prerequisites(department, component)}</td>
+                        </tr>
+                        <tr><th>Co-Requisitos:</th><td>-</td></tr>
+                        <tr><th>Equivalências:</th><td>( {equivalence} )</td></tr>
+                    </table>
+                    """,
+                    {
+                        report_form_id: report_form_id,
+                        f"{report_form_id}:detalhes": f"{report_form_id}:detalhes",
+                        "id": sigaa_id,
+                    },
+                )
+
+    def generate(self, root: Path):
+        """Write every page of the site under the root directory."""
+
+        self.write_departments(root)
+        self.write_programs(root)
+        self.write_curricula(root)
+        self.write_components(root)
+
+        print(f"{benchmark_log_base_prefix} Generated {self.files} pages in {root}")
+
+
+def get_results(report: dict[str, Any], peak_rss: int) -> dict[str, Any]:
+    """Get the benchmark results from the metrics report of a scrape."""
+
+    counters = report["counters"]
+    pages = counters.get("pages", 0)
+    records = counters.get("records", 0)
+
+    return {
+        "elapsed": report["elapsed"],
+        "pages": pages,
+        "pages_per_second": pages / report["elapsed"] if report["elapsed"] else 0,
+        "cdp_calls_per_page": counters.get("cdp.calls", 0) / pages if pages else 0,
+        "records": records,
+        "db_statements_per_record": (
+            counters.get("db.statements", 0) / records if records else 0
+        ),
+        "peak_rss_mib": peak_rss / 1024,
+        "stages": report["stages"],
+        "counters": counters,
+    }
+
+
+async def create_database(database: str):
+    """Drop and create the benchmark database, on the configured server."""
+
+    settings = config.settings
+
+    if not database_name_pattern.fullmatch(database):
+        raise Exception(f"Invalid benchmark database name ({database})")
+
+    if database == settings.DEFAULT_DATABASE_DB:
+        raise Exception("The benchmark database can't be the configured one")
+
+    connection = await asyncpg.connect(
+        user=settings.DEFAULT_DATABASE_USER,
+        password=settings.DEFAULT_DATABASE_PASSWORD,
+        host=settings.DEFAULT_DATABASE_HOSTNAME,
+        port=settings.DEFAULT_DATABASE_PORT,
+        database=settings.DEFAULT_DATABASE_DB,
+    )
+
+    try:
+        await connection.execute(f"DROP DATABASE IF EXISTS {database}")
+        await connection.execute(f"CREATE DATABASE {database}")
+    finally:
+        await connection.close()
+
+
+def get_environment(
+    base_url: str, work_dir: Path, database: str, http: bool
+) -> dict[str, str]:
+    """Get the environment of the scraper: the replica, the database, no pacing."""
+
+    return {
+        **os.environ,
+        "DEFAULT_DATABASE_DB": database,
+        "SCRAPER_BASE_URL": base_url,
+        "SCRAPER_HTTP_FETCH": json.dumps(http),
+        "SCRAPER_METRICS_DIR": str(work_dir / "metrics"),
+        "SCRAPER_CHECKPOINTS_DIR": str(work_dir / "checkpoints"),
+        "SCRAPER_SNAPSHOTS_DIR": "",
+        # The replica is local, so it is not paced
+        "SCRAPER_MIN_RATE": "1000",
+        "SCRAPER_MAX_RATE": "1000",
+    }
+
+
+def migrate_database(env: dict[str, str]):
+    """Migrate the database of the environment to the latest revision."""
+
+    command = [sys.executable, "-m", "alembic", "upgrade", "head"]
+
+    subprocess.run(command, env=env, cwd=config.PROJECT_DIR, check=True)
+
+
+def run_scraper(env: dict[str, str], workers: int) -> dict[str, Any]:
+    """Run the scraper in the environment, returning its metrics report."""
+
+    command = [
+        sys.executable,
+        "-m",
+        "app.scraper.main",
+        "--all-programs",
+        "--no-resume",
+        "--no-incremental",
+        f"--workers={workers}",
+    ]
+
+    subprocess.run(command, env=env, check=True)
+
+    [report_path] = Path(env["SCRAPER_METRICS_DIR"]).glob("*.json")
+
+    return json.loads(report_path.read_text())
+
+
+def benchmark(
+    pages_dir: Path | None,
+    workers: int = 1,
+    http: bool = False,
+    database: str | None = None,
+) -> dict[str, Any]:
+    """Scrape the page set (a synthetic one if not given) and get the results."""
+
+    database = database or config.settings.SCRAPER_BENCHMARK_DATABASE
+    asyncio.run(create_database(database))
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        work_dir = Path(temporary_dir)
+
+        if pages_dir is None:
+            pages_dir = work_dir / "pages"
+            SyntheticSite().generate(pages_dir)
+
+        with ReplicaServer(pages_dir) as server:
+            env = get_environment(f"{server.url}{base_path}", work_dir, database, http)
+
+            migrate_database(env)
+            report = run_scraper(env, workers)
+            requests = server.requests
+
+    peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    return {
+        "pages_dir": str(pages_dir),
+        "workers": workers,
+        "http": http,
+        "database": database,
+        "replica_requests": requests,
+        **get_results(report, peak_rss),
+    }
+
+
+def get_arguments_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the SIGAA scraper")
+    parser.add_argument(
+        "--pages", type=Path, help="recorded pages to serve (default: synthetic)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes crawling curricula"
+    )
+    parser.add_argument(
+        "--http", action="store_true", help="fetch server-rendered pages over HTTP"
+    )
+    parser.add_argument(
+        "--database", help="database to (re)create and scrape into (dropped first)"
+    )
+    parser.add_argument("--output", type=Path, help="results file (JSON)")
+
+    return parser
+
+
+def main(arguments: argparse.Namespace):
+    results = benchmark(
+        arguments.pages, arguments.workers, arguments.http, arguments.database
+    )
+
+    output = arguments.output or (
+        Path(config.settings.SCRAPER_BENCHMARKS_DIR)
+        / f"{time.strftime('%Y%m%d%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(
+        f"{benchmark_log_base_prefix} {results['pages_per_second']:.1f} pages/s, "
+        f"{results['cdp_calls_per_page']:.1f} CDP calls/page, "
+        f"{results['db_statements_per_record']:.2f} statements/record, "
+        f"{results['peak_rss_mib']:.0f} MiB peak RSS"
+    )
+    print(f"{benchmark_log_base_prefix} Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main(get_arguments_parser().parse_args())
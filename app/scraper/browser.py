@@ -0,0 +1,150 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TypeVar
+
+from pyppeteer import launch
+from pyppeteer.browser import Browser
+from pyppeteer.target import Target
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+T = TypeVar("T")
+
+browser_log_base_prefix = "[Browsers]"
+
+
+async def launch_browser(profile: str = "0") -> Browser:
+    """Launch a browser with the configured options."""
+
+    settings = config.settings
+    options: dict = {
+        "headless": settings.SCRAPER_BROWSER_HEADLESS,
+        "args": settings.SCRAPER_BROWSER_ARGS,
+    }
+
+    if settings.SCRAPER_BROWSER_EXECUTABLE_PATH:
+        options["executablePath"] = settings.SCRAPER_BROWSER_EXECUTABLE_PATH
+
+    # Browsers can't share a profile, so each one gets its own directory
+    if settings.SCRAPER_BROWSER_USER_DATA_DIR:
+        options["userDataDir"] = f"{settings.SCRAPER_BROWSER_USER_DATA_DIR}/{profile}"
+
+    browser = await launch(options)
+    count_cdp_calls(browser)
+
+    return browser
+
+
+def count_cdp_calls(browser: Browser):
+    """Count the CDP messages sent to the browser, including its pages' ones."""
+
+    # Pages' sessions send their messages through the browser connection
+    connection = browser._connection
+    send = connection.send
+
+    def counting_send(method: str, params: dict | None = None):
+        metrics.count("cdp.calls")
+        return send(method, params)
+
+    connection.send = counting_send
+
+
+class PooledBrowser:
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.pages = 0
+        self.leases = 0
+
+        browser.on("targetcreated", self.on_target_created)
+
+    def on_target_created(self, target: Target):
+        if target.type == "page":
+            self.pages += 1
+
+
+class BrowserPool:
+    """Keep warm browsers, recycling each one after `max_pages` opened pages.
+
+    A browser may be leased by many workers at once (each with its own pages).
+    Once it opens too many pages, new leases go to a fresh browser and it is
+    closed when its last lease is released. Every browser is closed on exit,
+    even on exceptions. Pools running at once (e.g. in worker processes) need
+    distinct profile prefixes, so their browsers don't share a profile.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_pages: int | None = None,
+        profile_prefix: str = "",
+    ):
+        self.size = size or config.settings.SCRAPER_BROWSER_POOL_SIZE
+        self.max_pages = max_pages or config.settings.SCRAPER_BROWSER_MAX_PAGES
+        self.profile_prefix = profile_prefix
+        self.browsers: list[PooledBrowser] = []
+        self.retired: list[PooledBrowser] = []
+        self.launched = 0
+        self.lock = asyncio.Lock()
+
+    async def launch(self) -> PooledBrowser:
+        browser = await launch_browser(f"{self.profile_prefix}{self.launched}")
+        self.launched += 1
+
+        return PooledBrowser(browser)
+
+    async def __aenter__(self) -> "BrowserPool":
+        try:
+            for _ in range(self.size):
+                self.browsers.append(await self.launch())
+        except BaseException:
+            await self.close()
+            raise
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        pooled_browsers = [*self.browsers, *self.retired]
+        self.browsers, self.retired = [], []
+
+        await asyncio.gather(
+            *(pooled.browser.close() for pooled in pooled_browsers),
+            return_exceptions=True,
+        )
+
+        print(f"{browser_log_base_prefix} {self.launched} browsers launched")
+
+    @asynccontextmanager
+    async def browser(self) -> AsyncIterator[Browser]:
+        """Lease the least busy browser."""
+
+        async with self.lock:
+            pooled = min(self.browsers, key=lambda pooled: pooled.leases)
+
+            if pooled.pages >= self.max_pages:
+                self.browsers.remove(pooled)
+                self.retired.append(pooled)
+
+                pooled = await self.launch()
+                self.browsers.append(pooled)
+
+            pooled.leases += 1
+
+        try:
+            yield pooled.browser
+        finally:
+            pooled.leases -= 1
+
+            if pooled in self.retired and not pooled.leases:
+                self.retired.remove(pooled)
+                await pooled.browser.close()
+
+    async def run(self, fetch: Callable[[Browser], Awaitable[T]]) -> T:
+        """Run a fetch with a leased browser."""
+
+        async with self.browser() as browser:
+            return await fetch(browser)
@@ -0,0 +1,139 @@
+"""
+Checkpoints of scrape jobs.
+
+A job records each completed (or failed) unit, e.g. a department or a
+curriculum, on a JSON lines file. A job that stops halfway can be resumed,
+skipping the units already done, and units that fail are quarantined and
+retried on the next run instead of aborting the whole job.
+"""
+
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TypeVar
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+T = TypeVar("T")
+
+checkpoint_log_base_prefix = "[Checkpoint]"
+
+
+class Checkpoint:
+    def __init__(self, job_id: str, path: Path | None = None, max_attempts: int = 3):
+        self.job_id = job_id
+        self.path = path
+        self.max_attempts = max_attempts
+        self.done: set[tuple[str, str]] = set()
+        self.failures: dict[tuple[str, str], int] = {}
+        self.finished = False
+
+        if path and path.exists():
+            self.load()
+
+    @classmethod
+    def open(cls, resume: bool = True) -> "Checkpoint":
+        """Resume the latest unfinished job, or start a new one."""
+
+        checkpoints_dir = Path(config.settings.SCRAPER_CHECKPOINTS_DIR)
+        checkpoints_dir.mkdir(parents=True, exist_ok=True)
+        max_attempts = config.settings.SCRAPER_MAX_ATTEMPTS
+
+        if resume:
+            # Skip the files kept along the checkpoints (e.g. job.frontier.jsonl)
+            paths = sorted(
+                path for path in checkpoints_dir.glob("*.jsonl") if "." not in path.stem
+            )
+            latest = cls(paths[-1].stem, paths[-1], max_attempts) if paths else None
+
+            if latest and not latest.finished:
+                print(f"{checkpoint_log_base_prefix} Resuming job {latest.job_id}")
+                return latest
+
+        job_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+        return cls(job_id, checkpoints_dir / f"{job_id}.jsonl", max_attempts)
+
+    def get_path(self, name: str) -> Path | None:
+        """Get the path of a file kept along the checkpoint, e.g. a frontier."""
+
+        return self.path.with_name(f"{self.job_id}.{name}.jsonl") if self.path else None
+
+    def load(self):
+        assert self.path
+
+        with open(self.path) as lines:
+            for line in lines:
+                record = json.loads(line)
+
+                if record["status"] == "finished":
+                    self.finished = True
+                    continue
+
+                unit = (record["kind"], record["key"])
+
+                if record["status"] == "done":
+                    self.done.add(unit)
+                    self.failures.pop(unit, None)
+                else:
+                    self.failures[unit] = self.failures.get(unit, 0) + 1
+
+    def write(self, **record: str):
+        if self.path:
+            with open(self.path, "a") as lines:
+                lines.write(json.dumps(record) + "\n")
+
+    def is_done(self, kind: str, key: str) -> bool:
+        return (kind, key) in self.done
+
+    def pending(self, kind: str, keys: Iterable[T]) -> list[T]:
+        """Get the keys not done yet, skipping units that failed too many times."""
+
+        pending = [
+            key
+            for key in keys
+            if (kind, str(key)) not in self.done
+            and self.failures.get((kind, str(key)), 0) < self.max_attempts
+        ]
+
+        retries = sum((kind, str(key)) in self.failures for key in pending)
+        metrics.count(f"retries.{kind}", retries)
+
+        return pending
+
+    def mark_done(self, kind: str, keys: Iterable[object]):
+        for key in keys:
+            self.done.add((kind, str(key)))
+            self.write(kind=kind, key=str(key), status="done")
+
+    def quarantine(self, kind: str, key: object, error: Exception):
+        unit = (kind, str(key))
+        self.failures[unit] = self.failures.get(unit, 0) + 1
+        metrics.count(f"failures.{kind}")
+        self.write(kind=kind, key=str(key), status="failed", error=repr(error))
+
+        print(f"{checkpoint_log_base_prefix} {kind} {key} failed: {error!r}")
+
+    async def run(
+        self, kind: str, key: object, unit: Callable[[], Awaitable[T]]
+    ) -> T | None:
+        """Run a unit, quarantining it on failure instead of aborting the job."""
+
+        try:
+            return await unit()
+        except Exception as error:
+            self.quarantine(kind, key, error)
+            return None
+
+    def finish(self):
+        self.finished = True
+        self.write(status="finished")
+
+        quarantined = [unit for unit in self.failures if unit not in self.done]
+
+        print(
+            f"{checkpoint_log_base_prefix} Job {self.job_id}: {len(self.done)} units "
+            f"done, {len(quarantined)} quarantined"
+        )
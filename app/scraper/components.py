@@ -1,153 +1,245 @@
-from pyppeteer.browser import Browser
+import asyncio
+
 from pyppeteer.page import Page
+from pyppeteer.target import Target
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.component import store_or_update_component
-from app.db.department import get_department_by_title
-from app.db.models import Component
-from app.scraper.constants import ELEMENT_INNER_TEXT
-from app.scraper.curricula import get_curriculum_page
+from app.db.component import get_components_ids_by_sigaa_ids, upsert_components
+from app.db.curriculum_component import count_curricula_components
+from app.scraper.browser import BrowserPool
+from app.scraper.checkpoint import Checkpoint
+from app.scraper.constants import PAGE_LOADED, SUBMIT_TO_NEW_TAB
+from app.scraper.curricula import (
+    get_curriculum_key,
+    get_curriculum_page,
+    store_curricula_components,
+)
+from app.scraper.department_index import DepartmentIndex
+from app.scraper.frontier import ComponentFrontier, CurriculumKey
+from app.scraper.incremental import ChangeDetector
+from app.scraper.metrics import metrics
+from app.scraper.models.component import Component
+from app.scraper.models.curriculum_component import CurriculumComponent
+from app.scraper.pages import page_registry
+from app.scraper.parsers.components import parse_component
+from app.scraper.parsers.utils import get_content_fingerprint
+from app.scraper.pipeline import WritePipeline
+from app.scraper.pool import PagePool
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.requisites import RequisiteGraph, requisites_fields
+from app.scraper.utils import get_page_html
+
+component_anchor_title = "Visualizar Detalhes do Componente Curricular"
+
+
+def get_component_key(component_sigaa_id: str) -> str:
+    return f"component:{component_sigaa_id}"
+
+
+async def open_component_page(report_page: Page, component_sigaa_id: str) -> Page:
+    """Open the detail page of a component in a new tab, from the curriculum report.
+
+    The detail link is a JSF form post, so its form is submitted to a new tab:
+    the report stays loaded and each component costs a single navigation.
+    """
 
+    tr_selector = f"//td[contains(text(), '{component_sigaa_id}')]/ancestor::tr[1]"
+    anchor_selector = f"{tr_selector}//a[contains(@title, '{component_anchor_title}')]"
 
-async def get_elective_tr_components(curriculum_page: Page):
-    electives_table_xpath = "//td[contains(text(), 'Optativas')]/ancestor::table[1]"
+    [component_anchor, *_] = await report_page.xpath(anchor_selector)
 
-    [electives_table] = await curriculum_page.xpath(electives_table_xpath)
+    browser = report_page.browser
+    target_created: asyncio.Future[Target] = asyncio.get_running_loop().create_future()
 
-    elective_tr_components = await electives_table.JJ("tr.componentes")
+    def on_target_created(target: Target):
+        if target.opener == report_page.target and not target_created.done():
+            target_created.set_result(target)
 
-    return elective_tr_components
+    browser.on("targetcreated", on_target_created)
 
+    async with rate_limiter.limit(report_page.url):
+        try:
+            await report_page.evaluate(SUBMIT_TO_NEW_TAB, component_anchor)
+            target = await asyncio.wait_for(target_created, timeout=30)
+        finally:
+            browser.remove_listener("targetcreated", on_target_created)
 
-async def get_component_page(
-    browser: Browser,
-    program_sigaa_id: int,
-    curriculum_sigaa_id: str,
-    component_sigaa_id: str,
-) -> Page:
-    page = await get_curriculum_page(browser, program_sigaa_id, curriculum_sigaa_id)
+        page = await target.page()
 
-    tr_selector = f"//td[contains(text(), '{component_sigaa_id}')]/ancestor::tr[1]"
-    anchor_selector = f"{tr_selector}//a[contains(@title, 'Visualizar Detalhes do Componente Curricular')]"
+        if page is None:
+            raise Exception(f"Could not open component page ({component_sigaa_id})")
 
-    [component_anchor, *_] = await page.xpath(anchor_selector)
+        page_registry.register(page, browser)
 
-    await component_anchor.click()
-    await page.waitForNavigation()
+        async with page_registry.closing_on_error(page):
+            await page.waitForFunction(PAGE_LOADED, {"polling": 100})
 
     return page
 
 
-async def get_elective_components_ids(curriculum_page: Page) -> set[str]:
-    elective_tr_components = await get_elective_tr_components(curriculum_page)
+async def get_component_html(
+    report_page: Page, submit_lock: asyncio.Lock, component_sigaa_id: str
+) -> str:
+    """Get the HTML of a component detail page."""
 
-    elective_components_ids = set()
+    # Forms of the report page must be submitted one at a time
+    async with submit_lock:
+        component_page = await open_component_page(report_page, component_sigaa_id)
 
-    for tr_component in elective_tr_components:
-        raw: str = await tr_component.Jeval("td:first-child", ELEMENT_INNER_TEXT)
-
-        component_sigaa_id = raw.split(" - ")[0]
-
-        elective_components_ids.add(component_sigaa_id)
+    try:
+        return await get_page_html(
+            component_page, get_component_key(component_sigaa_id)
+        )
+    finally:
+        await component_page.close()
 
-    return elective_components_ids
 
+@metrics.timed("db.store_components")
+async def store_components(
+    session: AsyncSession,
+    components: list[Component],
+    department_index: DepartmentIndex,
+):
+    """Store (or update) the scraped components."""
 
-async def get_cell_text_by_header_text(page: Page, th_text: str) -> str:
-    expression = f"//th[contains(., '{th_text}')]/following-sibling::td"
-    [cell_element, *_] = await page.Jx(expression)
+    rows = []
 
-    cell_inner_text: str = await page.evaluate(ELEMENT_INNER_TEXT, cell_element)
+    for component in components:
+        department = await department_index.get_by_title(
+            session, component.department_title
+        )
 
-    return cell_inner_text
+        # Detail pages don't list the workload, so the department one is kept
+        row = component.dict(
+            exclude={"department_title", "workload", *requisites_fields},
+        )
+        rows.append({**row, "department_id": department.id})
 
+    await upsert_components(session, rows)
 
-async def get_component_sigaa_id(component_page: Page) -> str:
-    header_text = "Código"
 
-    sigaa_id = await get_cell_text_by_header_text(component_page, header_text)
+@metrics.timed("db.sync_curricula_components")
+async def sync_curricula_components(
+    session: AsyncSession,
+    curricula: dict[CurriculumKey, list[CurriculumComponent]],
+):
+    """Store again the structure of curricula stored before their components were.
+
+    Only curricula missing some of their (now stored) components are replaced.
+    """
+
+    components_sigaa_ids = {
+        member.component_sigaa_id
+        for members in curricula.values()
+        for member in members
+    }
+    components_ids = await get_components_ids_by_sigaa_ids(
+        session, components_sigaa_ids
+    )
 
-    return sigaa_id
+    curricula_sigaa_ids = {sigaa_id for _, sigaa_id in curricula}
+    counts = await count_curricula_components(session, curricula_sigaa_ids)
 
+    outdated = {
+        curriculum_sigaa_id: members
+        for (_, curriculum_sigaa_id), members in curricula.items()
+        if counts.get(curriculum_sigaa_id, 0)
+        < sum(member.component_sigaa_id in components_ids for member in members)
+    }
 
-async def get_component_title(component_page: Page) -> str:
-    header_text = "Nome"
+    print(f"[Components] Storing again the structure of {len(outdated)} curricula")
 
-    title = await get_cell_text_by_header_text(component_page, header_text)
+    await store_curricula_components(session, outdated)
 
-    return title
 
+async def scrape_components(
+    browser_pool: BrowserPool,
+    session: AsyncSession,
+    checkpoint: Checkpoint,
+    department_index: DepartmentIndex,
+    frontier: ComponentFrontier,
+    requisites: RequisiteGraph,
+    incremental: bool = True,
+    max_pages: int | None = None,
+):
+    """Scrape and store (or update) the components of the crawled curricula.
 
-async def get_component_type(component_page: Page) -> str:
-    header_text = "Tipo do Componente Curricular"
+    Each distinct component of the frontier is scraped once, opening as few
+    curriculum reports as possible, and their requisites are stored once all
+    of them are. When `incremental`, components whose page did not change
+    since the last scrape are neither parsed nor stored.
+    """
 
-    raw_type = await get_cell_text_by_header_text(component_page, header_text)
+    components_keys = {
+        get_component_key(sigaa_id): sigaa_id
+        for sigaa_id in frontier.components_sigaa_ids
+    }
 
-    type: str
-    if raw_type == "DISCIPLINA":
-        type = "COURSE"
-    elif raw_type == "ATIVIDADE":
-        type = "ACTIVITY"
-    else:
-        raise Exception(f"Invalid component type ({raw_type})")
+    keys = checkpoint.pending("component", list(components_keys))
+    detector = await ChangeDetector.load(session, keys, incremental)
+    keys = detector.prioritize(keys, max_pages)
 
-    return type
+    plan = frontier.plan(components_keys[key] for key in keys)
 
+    print(f"[Components] {len(keys)} to be scraped from {len(plan)} curriculum reports")
 
-async def get_component_department_title(component_page: Page) -> str:
-    header_text = "Unidade Responsável"
-    department = await get_cell_text_by_header_text(component_page, header_text)
+    async def get_component(
+        report_page: Page, submit_lock: asyncio.Lock, sigaa_id: str
+    ) -> tuple[str, Component | None]:
+        key = get_component_key(sigaa_id)
+        html = await get_component_html(report_page, submit_lock, sigaa_id)
 
-    department_title = department.split(" - ")[0]
+        if detector.has_changed(key, get_content_fingerprint(html)):
+            return key, parse_component(html)
 
-    return department_title
+        return key, None
 
+    async def write(checked: list[tuple[str, Component | None]]):
+        checked_keys = [key for key, _ in checked]
+        components = [component for _, component in checked if component]
 
-async def get_component_department_id(
-    component_page: Page, session: AsyncSession
-) -> int:
-    department_title = await get_component_department_title(component_page)
-    db_department = await get_department_by_title(session, department_title)
+        await store_components(session, components, department_index)
+        await detector.store(session, checked_keys)
 
-    return db_department.id
+        requisites.add(components)
 
+        checkpoint.mark_done("component", checked_keys)
 
-async def get_component(component_page: Page, session: AsyncSession) -> Component:
-    sigaa_id = await get_component_sigaa_id(component_page)
-    title = await get_component_title(component_page)
-    type = await get_component_type(component_page)
-    department_id = await get_component_department_id(component_page, session)
+    pool = PagePool("Components")
 
-    return Component(
-        sigaa_id=sigaa_id,
-        title=title,
-        type=type,
-        department_id=department_id,
-    )
+    async with WritePipeline("Components", write) as pipeline:
 
+        async def scrape_report(
+            curriculum_key: CurriculumKey, components_sigaa_ids: list[str]
+        ):
+            # Component tabs are opened by the report, so they share its browser
+            async with browser_pool.browser() as browser:
+                report_page = await get_curriculum_page(browser, *curriculum_key)
 
-async def scrape_components(
-    browser,
-    session: AsyncSession,
-    program_sigaa_id: int | None = None,
-    curriculum_sigaa_id: str | None = None,
-):
-    if not program_sigaa_id or not curriculum_sigaa_id:
-        return
+                async with page_registry.closing(report_page):
+                    submit_lock = asyncio.Lock()
 
-    curriculum_page = await get_curriculum_page(
-        browser, program_sigaa_id, curriculum_sigaa_id
-    )
+                    async def scrape(sigaa_id: str):
+                        result = await checkpoint.run(
+                            "component",
+                            get_component_key(sigaa_id),
+                            lambda: get_component(report_page, submit_lock, sigaa_id),
+                        )
 
-    elective_components_ids = await get_elective_components_ids(curriculum_page)
+                        # Failed components were quarantined and come back as None
+                        if result:
+                            await pipeline.put(result)
 
-    for component_sigaa_id in elective_components_ids:
-        component_page = await get_component_page(
-            browser, program_sigaa_id, curriculum_sigaa_id, component_sigaa_id
-        )
+                    await pool.map(components_sigaa_ids, scrape)
 
-        component = await get_component(component_page, session)
+        for curriculum_key, components_sigaa_ids in plan:
+            await checkpoint.run(
+                "report",
+                get_curriculum_key(*curriculum_key),
+                lambda: scrape_report(curriculum_key, components_sigaa_ids),
+            )
 
-        await store_or_update_component(session, component)
+    await sync_curricula_components(session, frontier.curricula)
+    await requisites.store(session)
 
-        await component_page.close()
+    detector.log("[Components]")
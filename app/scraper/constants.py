@@ -1,6 +1,8 @@
+from app.core import config
+
 # URLs
 
-base_url = "https://sigaa.unb.br/sigaa/public"
+base_url = config.settings.SCRAPER_BASE_URL
 default_language = "pt_BR"
 
 graduation_programs_link = base_url + "/curso/lista.jsf?nivel=G&aba=p-graduacao"
@@ -23,10 +25,16 @@ curricula_list_base_url = f"{programs_base_url}/curriculo.jsf"
 
 # Page functions
 
-ELEMENT_INNER_TEXT = "(element) => element.innerText"
-ELEMENT_PREVIOUS_SIBLINGS = "(element) => element.previousSiblings()"
-FIND_ELEMENT_WITHOUT_CLASS = ".find((element) => element.classList.length === 0)"
-TABLE_CONTENT_ROW_SELECTOR = "tr.linhaPar, tr.linhaImpar"
+PAGE_LOADED = (
+    "() => location.href !== 'about:blank' && document.readyState === 'complete'"
+)
+SUBMIT_TO_NEW_TAB = """(element) => {
+    const form = element.closest('form');
+    const target = form.target;
+    form.target = '_blank';
+    element.click();
+    form.target = target;
+}"""
 
 # Programs
 
@@ -0,0 +1,292 @@
+"""
+Sharded curricula crawl across worker processes.
+
+The programs are split across K worker processes, each one with its own
+browser pool and event loop. Workers only fetch and parse, streaming the results
+back through a queue to the coordinator, the single writer to the database.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import time
+from contextlib import nullcontext
+from multiprocessing.queues import Queue
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.scraper.browser import BrowserPool
+from app.scraper.checkpoint import Checkpoint
+from app.scraper.curricula import (
+    get_curriculum_html,
+    get_curriculum_key,
+    get_program_curricula,
+    get_programs_sigaa_ids,
+    store_curricula,
+    store_curricula_components,
+)
+from app.scraper.frontier import ComponentFrontier
+from app.scraper.http import http_fetcher
+from app.scraper.incremental import ChangeDetector
+from app.scraper.metrics import metrics
+from app.scraper.pages import page_registry
+from app.scraper.parsers.curricula import parse_curriculum, parse_curriculum_components
+from app.scraper.parsers.utils import get_content_fingerprint
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.resources import resource_filter
+from app.scraper.snapshots import snapshot_store
+
+coordinator_log_base_prefix = "[Coordinator]"
+
+# Messages sent by the workers:
+# ("curriculum", key, content_hash, Curriculum, [CurriculumComponent]) once a
+# curriculum is parsed
+# ("failed", kind, key, error) when a unit fails
+# ("program", program_sigaa_id, complete) once all curricula of a program are sent
+# ("metrics", exported metrics) when the worker exits, followed by
+# None when the worker exits
+Message = tuple | None
+
+
+def get_shards(programs_sigaa_ids: list[int], workers: int) -> list[list[int]]:
+    """Split the programs round-robin, so each shard gets a similar workload."""
+
+    shards = [programs_sigaa_ids[index::workers] for index in range(workers)]
+
+    return [shard for shard in shards if shard]
+
+
+async def put_result(results: Queue, message: Message):
+    """Put a result in the queue, waiting for room off the event loop."""
+
+    await asyncio.get_running_loop().run_in_executor(None, results.put, message)
+
+
+async def crawl_shard(
+    index: int,
+    shard: list[int],
+    done_keys: set[str],
+    only_active: bool,
+    results: Queue,
+):
+    """Fetch and parse the curricula of the shard's programs."""
+
+    browser_pool = BrowserPool(size=1, profile_prefix=f"worker-{index}-")
+
+    async with browser_pool, page_registry, (http_fetcher or nullcontext()):
+        for p_sigaa_id in shard:
+            try:
+                program_curricula = await browser_pool.run(
+                    lambda browser: get_program_curricula(browser, p_sigaa_id)
+                )
+            except Exception as error:
+                await put_result(
+                    results, ("failed", "curricula", p_sigaa_id, repr(error))
+                )
+                continue
+
+            complete = True
+
+            for sigaa_id, active in program_curricula:
+                key = get_curriculum_key(p_sigaa_id, sigaa_id)
+
+                if (only_active and not active) or key in done_keys:
+                    continue
+
+                try:
+                    async with browser_pool.browser() as browser:
+                        html = await get_curriculum_html(browser, p_sigaa_id, sigaa_id)
+
+                    curriculum = parse_curriculum(html, p_sigaa_id, active)
+                    curriculum_components = parse_curriculum_components(html)
+                except Exception as error:
+                    complete = False
+                    await put_result(
+                        results, ("failed", "curriculum", key, repr(error))
+                    )
+                    continue
+
+                # The status comes from the list page, so it is part of the fingerprint
+                content_hash = get_content_fingerprint(html, str(active))
+                await put_result(
+                    results,
+                    (
+                        "curriculum",
+                        key,
+                        content_hash,
+                        curriculum,
+                        curriculum_components,
+                    ),
+                )
+
+            await put_result(results, ("program", p_sigaa_id, complete))
+
+
+def run_worker(
+    index: int,
+    shard: list[int],
+    done_keys: set[str],
+    only_active: bool,
+    workers: int,
+    snapshots_run_id: str | None,
+    results: Queue,
+):
+    """Entry point of a worker process."""
+
+    # Workers share the politeness limit
+    rate_limiter.max_rate = config.settings.SCRAPER_MAX_RATE / workers
+    rate_limiter.min_rate = min(rate_limiter.min_rate, rate_limiter.max_rate)
+
+    if snapshot_store and snapshots_run_id:
+        snapshot_store.start_run(snapshots_run_id)
+
+    try:
+        asyncio.run(crawl_shard(index, shard, done_keys, only_active, results))
+    finally:
+        rate_limiter.log()
+        resource_filter.log()
+        results.put(("metrics", metrics.export()))
+        results.put(None)
+
+
+async def store_messages(
+    session: AsyncSession,
+    checkpoint: Checkpoint,
+    frontier: ComponentFrontier,
+    detector: ChangeDetector,
+    messages: list[tuple],
+):
+    """Store a batch of worker results and checkpoint them."""
+
+    keys = [message[1] for message in messages if message[0] == "curriculum"]
+    await detector.extend(session, keys)
+
+    curricula = []
+    curricula_components = {}
+
+    for message in messages:
+        if message[0] == "curriculum":
+            _, key, content_hash, curriculum, curriculum_components = message
+
+            frontier.add(
+                curriculum.program_sigaa_id, curriculum.sigaa_id, curriculum_components
+            )
+
+            if detector.has_changed(key, content_hash):
+                curricula.append(curriculum)
+                curricula_components[curriculum.sigaa_id] = curriculum_components
+        elif message[0] == "failed":
+            _, kind, key, error = message
+            checkpoint.quarantine(kind, key, Exception(error))
+
+    await store_curricula(session, curricula)
+    await store_curricula_components(session, curricula_components)
+    await detector.store(session)
+
+    checkpoint.mark_done("curriculum", keys)
+    checkpoint.mark_done(
+        "curricula",
+        [message[1] for message in messages if message[0] == "program" and message[2]],
+    )
+
+
+async def crawl_curricula(
+    session: AsyncSession,
+    checkpoint: Checkpoint,
+    frontier: ComponentFrontier,
+    program_sigaa_id: int | None = None,
+    workers: int = 2,
+    only_active: bool = True,
+    incremental: bool = True,
+):
+    """Scrape and store (or update) curricula, sharding programs across processes.
+
+    Unlike `scrape_curricula`, reports are fetched in program order, since the
+    fingerprints are only known by the writer.
+    """
+
+    programs_sigaa_ids = await get_programs_sigaa_ids(session, program_sigaa_id)
+    programs_sigaa_ids = checkpoint.pending("curricula", sorted(programs_sigaa_ids))
+    done_keys = {key for kind, key in checkpoint.done if kind == "curriculum"}
+
+    shards = get_shards(programs_sigaa_ids, workers)
+    batch_size = config.settings.SCRAPER_CHECKPOINT_BATCH_SIZE
+    snapshots_run_id = snapshot_store.run_id if snapshot_store else None
+
+    print(
+        f"{coordinator_log_base_prefix} {len(programs_sigaa_ids)} programs "
+        f"across {len(shards)} workers"
+    )
+
+    context = multiprocessing.get_context("spawn")
+
+    # Bounded, so workers wait for the writer instead of piling up results
+    results: Queue = context.Queue(maxsize=batch_size * max(len(shards), 1))
+
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(
+                index,
+                shard,
+                done_keys,
+                only_active,
+                len(shards),
+                snapshots_run_id,
+                results,
+            ),
+        )
+        for index, shard in enumerate(shards)
+    ]
+
+    for process in processes:
+        process.start()
+
+    loop = asyncio.get_running_loop()
+    detector = ChangeDetector({}, incremental)
+    messages: list[tuple] = []
+    running = len(processes)
+    start = time.monotonic()
+
+    try:
+        while running:
+            try:
+                message: Message = await loop.run_in_executor(
+                    None, results.get, True, 1.0
+                )
+            except queue.Empty:
+                # A worker killed abruptly never sends its exit message
+                if not any(process.is_alive() for process in processes):
+                    break
+
+                continue
+
+            if message is None:
+                running -= 1
+            elif message[0] == "metrics":
+                metrics.merge(message[1])
+            else:
+                messages.append(message)
+
+            if message is None or len(messages) >= batch_size:
+                await store_messages(session, checkpoint, frontier, detector, messages)
+                messages = []
+    except BaseException:
+        # Workers blocked on a full queue would never exit
+        for process in processes:
+            process.terminate()
+
+        raise
+    finally:
+        for process in processes:
+            process.join()
+
+    await store_messages(session, checkpoint, frontier, detector, messages)
+
+    elapsed = time.monotonic() - start
+
+    print(
+        f"{coordinator_log_base_prefix} {detector.checked} curricula in {elapsed:.1f}s"
+    )
+    detector.log("[Curricula]")
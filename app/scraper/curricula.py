@@ -1,23 +1,33 @@
-import re
+import asyncio
 
 from pyppeteer.browser import Browser, Page
 from pyppeteer.element_handle import ElementHandle
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.curriculum import store_or_update_curriculum
-from app.db.models import Curriculum
-from app.db.program import get_program_by_sigaa_id, get_programs
-from app.scraper.constants import ELEMENT_INNER_TEXT, curricula_list_base_url
-from app.scraper.utils import get_page
-
-
-async def get_cell_text_by_header_text(page: Page, th_text: str) -> str:
-    expression = f"//th[contains(., '{th_text}')]/following-sibling::td"
-    [cell_element, *_] = await page.Jx(expression)
-
-    cell_inner_text: str = await page.evaluate(ELEMENT_INNER_TEXT, cell_element)
-
-    return cell_inner_text
+from app.db.curriculum import upsert_curricula
+from app.db.curriculum_component import replace_curricula_components
+from app.db.program import get_programs, get_programs_ids_by_sigaa_ids
+from app.scraper.browser import BrowserPool
+from app.scraper.checkpoint import Checkpoint
+from app.scraper.constants import curricula_list_base_url
+from app.scraper.frontier import ComponentFrontier
+from app.scraper.http import http_fetcher
+from app.scraper.incremental import ChangeDetector
+from app.scraper.metrics import metrics
+from app.scraper.models.curriculum import Curriculum
+from app.scraper.models.curriculum_component import CurriculumComponent
+from app.scraper.pages import page_registry
+from app.scraper.parsers.curricula import (
+    curriculum_report_anchor_title,
+    find_curriculum_report_anchor,
+    parse_curricula_list,
+    parse_curriculum,
+    parse_curriculum_components,
+)
+from app.scraper.parsers.utils import get_content_fingerprint
+from app.scraper.pipeline import WritePipeline
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.utils import get_page_html, get_url_html, goto, new_page
 
 
 async def get_programs_sigaa_ids(
@@ -38,14 +48,6 @@ def get_program_curricula_url(program_sigaa_id: int) -> str:
     return f"{curricula_list_base_url}?id={program_sigaa_id}"
 
 
-async def get_program_curricula_page(browser: Browser, program_sigaa_id: int) -> Page:
-    program_curricula_url = get_program_curricula_url(program_sigaa_id)
-
-    page = await get_page(browser, url=program_curricula_url)
-
-    return page
-
-
 async def get_curricula_tr_elements(
     page: Page, curriculum_sigaa_id: str | None = None
 ) -> list[ElementHandle]:
@@ -62,235 +64,213 @@ async def get_curricula_tr_elements(
     return curricula_tr
 
 
-async def get_curriculum_status(curriculum_tr: ElementHandle) -> bool:
-    active_elements = await curriculum_tr.xpath("td[contains(., 'Ativa')]")
-
-    return bool(active_elements)
-
-
 async def get_curriculum_page(
     browser: Browser, program_sigaa_id: int, curriculum_sigaa_id: str
 ) -> Page:
     program_curricula_url = get_program_curricula_url(program_sigaa_id)
 
-    page = await browser.newPage()
-    await page.goto(program_curricula_url)
-
-    [curriculum_tr] = await get_curricula_tr_elements(page, curriculum_sigaa_id)
-    button = await curriculum_tr.J("a[title='Relatório da Estrutura Curricular']")
-
-    if not button:
-        raise Exception("Could not find button to open curriculum page")
-
-    await button.click()
-    await page.waitForNavigation()
-
-    return page
-
-
-async def get_curriculum_sigaa_id_by_tr_element(curriculum_tr: ElementHandle) -> str:
-    raw_sigaa_id = await curriculum_tr.Jeval("td:first-child", ELEMENT_INNER_TEXT)
-
-    sigaa_id_pattern = "Detalhes da Estrutura Curricular (.*),"
-    sigaa_id_match = re.search(sigaa_id_pattern, raw_sigaa_id)
-
-    if not sigaa_id_match:
-        raise Exception("Could not find curriculum sigaa_id")
-
-    sigaa_id = sigaa_id_match.group(1).strip()
-
-    return sigaa_id
-
-
-async def get_curriculum_sigaa_id(curriculum_page: Page) -> str:
-    return await get_cell_text_by_header_text(curriculum_page, "Código")
-
-
-async def get_curriculum_start_period(curriculum_page: Page) -> tuple[int, int]:
-    header_text = "Período Letivo de Entrada em Vigor"
-    raw_start_period = await get_cell_text_by_header_text(curriculum_page, header_text)
-
-    [start_year, start_period] = raw_start_period.split(".")
-    start_year = int(start_year)
-    start_period = int(start_period)
-
-    return start_year, start_period
-
-
-async def get_curriculum_min_periods(curriculum_page: Page) -> int:
-    min_periods = await get_cell_text_by_header_text(curriculum_page, "Mínimo:")
-    min_periods = int(min_periods)
+    page = await new_page(browser)
 
-    return min_periods
+    async with page_registry.closing_on_error(page):
+        await goto(page, program_curricula_url)
 
+        [curriculum_tr] = await get_curricula_tr_elements(page, curriculum_sigaa_id)
+        button = await curriculum_tr.J(f"a[title='{curriculum_report_anchor_title}']")
 
-async def get_curriculum_max_periods(curriculum_page: Page) -> int:
-    max_periods = await get_cell_text_by_header_text(curriculum_page, "Máximo:")
-    max_periods = int(max_periods)
-
-    return max_periods
-
-
-async def get_curriculum_min_period_workload(curriculum_page: Page) -> int:
-    header_text = "Carga Horária Mínima por Período Letivo"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
-
-    min_period_workload = format_workload_to_number(raw_workload)
-
-    return min_period_workload
-
-
-def format_workload_to_number(raw_workload: str) -> int:
-    workload = int(raw_workload.replace("h", ""))
-
-    return workload
-
-
-async def get_curriculum_max_period_workload(curriculum_page: Page) -> int:
-    header_text = "Carga Horária Máxima por Período Letivo"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
-
-    max_period_workload = format_workload_to_number(raw_workload)
-
-    return max_period_workload
+        if not button:
+            raise Exception("Could not find button to open curriculum page")
 
+        async with rate_limiter.limit(program_curricula_url) as navigation:
+            [response, _] = await asyncio.gather(
+                page.waitForNavigation(), button.click()
+            )
+            navigation.status = response.status if response else None
 
-async def get_curriculum_min_workload(curriculum_page: Page) -> int:
-    header_text = "Total Mínima"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
+    return page
 
-    min_workload = format_workload_to_number(raw_workload)
 
-    return min_workload
+def get_curriculum_key(program_sigaa_id: int, curriculum_sigaa_id: str) -> str:
+    return f"curriculum:{program_sigaa_id}:{curriculum_sigaa_id}"
 
 
-async def get_curriculum_mandatory_components_workload(curriculum_page: Page) -> int:
-    header_text = "Total:"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
+async def get_curriculum_html(
+    browser: Browser, program_sigaa_id: int, curriculum_sigaa_id: str
+) -> str:
+    """Get the HTML of a curriculum structure report."""
 
-    mandatory_components_workload = format_workload_to_number(raw_workload)
+    key = get_curriculum_key(program_sigaa_id, curriculum_sigaa_id)
 
-    return mandatory_components_workload
+    if http_fetcher:
+        program_curricula_url = get_program_curricula_url(program_sigaa_id)
+        curricula_page = await http_fetcher.get(program_curricula_url)
 
+        anchor = find_curriculum_report_anchor(curricula_page.html, curriculum_sigaa_id)
+        report_page = await http_fetcher.click(curricula_page, anchor)
 
-async def get_curriculum_min_elective_components_workload(curriculum_page: Page) -> int:
-    header_text = "Carga Horária Optativa Mínima:"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
+        return http_fetcher.get_page_html(report_page, key)
 
-    min_elective_components_workload = format_workload_to_number(raw_workload)
+    curriculum_page = await get_curriculum_page(
+        browser, program_sigaa_id, curriculum_sigaa_id
+    )
 
-    return min_elective_components_workload
+    try:
+        return await get_page_html(curriculum_page, key)
+    finally:
+        await curriculum_page.close()
 
 
-async def get_curriculum_min_complementary_components_workload(
-    curriculum_page: Page,
-) -> int:
-    header_text = "Carga Horária Complementar Mínima:"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
+@metrics.timed("db.store_curricula")
+async def store_curricula(session: AsyncSession, curricula: list[Curriculum]):
+    """Store (or update) the scraped curricula."""
 
-    min_complementary_components_workload = format_workload_to_number(raw_workload)
+    programs_sigaa_ids = {curriculum.program_sigaa_id for curriculum in curricula}
+    programs_ids = await get_programs_ids_by_sigaa_ids(session, programs_sigaa_ids)
 
-    return min_complementary_components_workload
+    rows = []
 
+    for curriculum in curricula:
+        if curriculum.program_sigaa_id not in programs_ids:
+            raise Exception("Program not found")
 
-async def get_curriculum_max_complementary_components_workload(
-    curriculum_page: Page,
-) -> int:
-    header_text = "Carga Horária Máxima de Componentes Eletivos"
-    raw_workload = await get_cell_text_by_header_text(curriculum_page, header_text)
+        row = curriculum.dict(exclude={"program_sigaa_id"})
+        rows.append({**row, "program_id": programs_ids[curriculum.program_sigaa_id]})
 
-    max_complementary_components_workload = format_workload_to_number(raw_workload)
+    await upsert_curricula(session, rows)
 
-    return max_complementary_components_workload
 
+@metrics.timed("db.store_curricula_components")
+async def store_curricula_components(
+    session: AsyncSession, curricula: dict[str, list[CurriculumComponent]]
+):
+    """Store the components of the curricula (by SIGAA ID), replacing the previous ones.
 
-async def get_curriculum(
-    session: AsyncSession, curriculum_page: Page, program_sigaa_id: int, active: bool
-) -> Curriculum:
-    sigaa_id = await get_curriculum_sigaa_id(curriculum_page)
-    start_year, start_period = await get_curriculum_start_period(curriculum_page)
-    min_periods = await get_curriculum_min_periods(curriculum_page)
-    max_periods = await get_curriculum_max_periods(curriculum_page)
-    min_period_workload = await get_curriculum_min_period_workload(curriculum_page)
-    max_period_workload = await get_curriculum_max_period_workload(curriculum_page)
-    min_workload = await get_curriculum_min_workload(curriculum_page)
+    Components that are not stored yet (e.g. not scraped) are left out.
+    """
 
-    mandatory_components_workload = await get_curriculum_mandatory_components_workload(
-        curriculum_page
+    await replace_curricula_components(
+        session,
+        {
+            curriculum_sigaa_id: [member.dict() for member in members]
+            for curriculum_sigaa_id, members in curricula.items()
+        },
     )
 
-    min_elective_components_workload = (
-        await get_curriculum_min_elective_components_workload(curriculum_page)
-    )
 
-    max_elective_components_workload = min_elective_components_workload
+async def get_program_curricula(
+    browser: Browser, program_sigaa_id: int
+) -> list[tuple[str, bool]]:
+    """Get the SIGAA IDs and status of the curricula of a program."""
 
-    min_complementary_components_workload = (
-        await get_curriculum_min_complementary_components_workload(curriculum_page)
+    html = await get_url_html(
+        browser,
+        get_program_curricula_url(program_sigaa_id),
+        f"curricula:{program_sigaa_id}",
     )
 
-    max_complementary_components_workload = (
-        await get_curriculum_max_complementary_components_workload(curriculum_page)
-    )
+    return parse_curricula_list(html)
 
-    program = await get_program_by_sigaa_id(session, program_sigaa_id)
-
-    if not program:
-        raise Exception("Program not found")
-
-    curriculum = Curriculum(
-        sigaa_id=sigaa_id,
-        active=active,
-        start_year=start_year,
-        start_period=start_period,
-        min_periods=min_periods,
-        max_periods=max_periods,
-        min_period_workload=min_period_workload,
-        max_period_workload=max_period_workload,
-        min_workload=min_workload,
-        mandatory_components_workload=mandatory_components_workload,
-        min_elective_components_workload=min_elective_components_workload,
-        max_elective_components_workload=max_elective_components_workload,
-        min_complementary_components_workload=min_complementary_components_workload,
-        max_complementary_components_workload=max_complementary_components_workload,
-        program_id=program.id,
-    )
 
-    return curriculum
+# (key, curriculum if changed, components of its structure)
+CheckedCurriculum = tuple[str, Curriculum | None, list[CurriculumComponent]]
 
 
 async def scrape_curricula(
-    browser: Browser,
+    browser_pool: BrowserPool,
     session: AsyncSession,
+    checkpoint: Checkpoint,
+    frontier: ComponentFrontier,
     program_sigaa_id: int | None = None,
     only_active: bool = True,
+    incremental: bool = True,
+    max_pages: int | None = None,
 ):
-    """Scrape and store (or update) curricula."""
+    """Scrape and store (or update) curricula, adding their components to the frontier.
+
+    The structure of each changed curriculum is stored along it, with the
+    components already stored; unchanged curricula whose stored structure is
+    behind are caught up by `sync_curricula_components`. When `incremental`,
+    curricula whose report did not change since the last scrape are neither
+    parsed nor stored, and reports are fetched in order of change likelihood,
+    up to `max_pages`.
+    """
 
     programs_sigaa_ids: set[int]
     programs_sigaa_ids = await get_programs_sigaa_ids(session, program_sigaa_id)
 
+    curricula_targets: dict[str, tuple[int, str, bool]] = {}
+    programs_curricula_keys: dict[int, list[str]] = {}
+
     # There are too many programs (~150) to open all tabs at once
-    for p_sigaa_id in programs_sigaa_ids:
-        curricula_page = await get_program_curricula_page(browser, p_sigaa_id)
-        curricula_tr = await get_curricula_tr_elements(curricula_page)
+    for p_sigaa_id in checkpoint.pending("curricula", sorted(programs_sigaa_ids)):
+        program_curricula = await checkpoint.run(
+            "curricula",
+            p_sigaa_id,
+            lambda: browser_pool.run(
+                lambda browser: get_program_curricula(browser, p_sigaa_id)
+            ),
+        )
 
-        for curriculum_tr in curricula_tr:
-            active = await get_curriculum_status(curriculum_tr)
+        if program_curricula is None:
+            continue
 
+        programs_curricula_keys[p_sigaa_id] = []
+
+        for sigaa_id, active in program_curricula:
             if only_active and not active:
                 continue
 
-            sigaa_id = await get_curriculum_sigaa_id_by_tr_element(curriculum_tr)
-            curriculum_page = await get_curriculum_page(browser, p_sigaa_id, sigaa_id)
+            key = get_curriculum_key(p_sigaa_id, sigaa_id)
+            curricula_targets[key] = (p_sigaa_id, sigaa_id, active)
+            programs_curricula_keys[p_sigaa_id].append(key)
+
+    keys = checkpoint.pending("curriculum", list(curricula_targets))
+    detector = await ChangeDetector.load(session, keys, incremental)
+
+    async def get_curriculum(key: str) -> CheckedCurriculum:
+        p_sigaa_id, sigaa_id, active = curricula_targets[key]
+
+        async with browser_pool.browser() as browser:
+            html = await get_curriculum_html(browser, p_sigaa_id, sigaa_id)
+
+        # The structure is parsed from the same report, without navigations
+        curriculum_components = parse_curriculum_components(html)
+        frontier.add(p_sigaa_id, sigaa_id, curriculum_components)
+
+        # The status comes from the list page, so it is part of the fingerprint
+        if detector.has_changed(key, get_content_fingerprint(html, str(active))):
+            curriculum = parse_curriculum(html, p_sigaa_id, active)
+            return key, curriculum, curriculum_components
+
+        return key, None, curriculum_components
+
+    async def write(checked: list[CheckedCurriculum]):
+        checked_keys = [key for key, _, _ in checked]
+
+        await store_curricula(session, [c for _, c, _ in checked if c])
+        await store_curricula_components(
+            session,
+            {
+                curricula_targets[key][1]: curriculum_components
+                for key, curriculum, curriculum_components in checked
+                if curriculum
+            },
+        )
+        await detector.store(session, checked_keys)
+
+        checkpoint.mark_done("curriculum", checked_keys)
 
-            curriculum = await get_curriculum(
-                session, curriculum_page, p_sigaa_id, active
+    async with WritePipeline("Curricula", write) as pipeline:
+        for key in detector.prioritize(keys, max_pages):
+            result = await checkpoint.run(
+                "curriculum", key, lambda: get_curriculum(key)
             )
 
-            await store_or_update_curriculum(session, curriculum)
+            # Failed curricula were quarantined and come back as None
+            if result:
+                await pipeline.put(result)
 
-            await curriculum_page.close()
+    for p_sigaa_id, curricula_keys in programs_curricula_keys.items():
+        if all(checkpoint.is_done("curriculum", key) for key in curricula_keys):
+            checkpoint.mark_done("curricula", [p_sigaa_id])
 
-        await curricula_page.waitFor(1000)
-        await curricula_page.close()
+    detector.log("[Curricula]")
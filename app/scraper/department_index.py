@@ -0,0 +1,66 @@
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.department import (
+    get_department_by_acronym_and_title,
+    get_department_by_title,
+    get_departments,
+)
+from app.db.models import Department
+
+
+class DepartmentIndex:
+    """In-memory lookup of departments, scoped to a scrape run.
+
+    Departments don't change during a run, so they are loaded once after
+    `scrape_departments` and the database is only queried on a miss.
+    """
+
+    def __init__(self, departments: Iterable[Department] = ()):
+        self.by_sigaa_id: dict[int, Department] = {}
+        self.by_title: dict[str, Department] = {}
+        self.by_acronym_and_title: dict[tuple[str, str], Department] = {}
+        self.misses = 0
+
+        for department in departments:
+            self.add(department)
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "DepartmentIndex":
+        return cls(await get_departments(session))
+
+    def add(self, department: Department):
+        self.by_sigaa_id[department.sigaa_id] = department
+        self.by_title.setdefault(department.title, department)
+        self.by_acronym_and_title[(department.acronym, department.title)] = department
+
+    async def get_by_title(self, session: AsyncSession, title: str) -> Department:
+        department = self.by_title.get(title)
+
+        if department is None:
+            self.misses += 1
+            department = await get_department_by_title(session, title)
+            self.add(department)
+
+        return department
+
+    async def get_by_acronym_and_title(
+        self, session: AsyncSession, acronym: str, title: str
+    ) -> Department:
+        department = self.by_acronym_and_title.get((acronym, title))
+
+        if department is None:
+            self.misses += 1
+            department = await get_department_by_acronym_and_title(
+                session, acronym, title
+            )
+            self.add(department)
+
+        return department
+
+    def log(self):
+        print(
+            f"[Departments index] {len(self.by_sigaa_id)} departments, "
+            f"{self.misses} misses"
+        )
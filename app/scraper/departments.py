@@ -1,74 +1,138 @@
-from pyppeteer.browser import Browser, Page
+from pyppeteer.browser import Browser
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.department import store_or_update_department
-from app.scraper.constants import (
-    ELEMENT_INNER_TEXT,
-    components_link,
-    department_base_components_url,
+from app.db.component import upsert_components
+from app.db.department import upsert_departments
+from app.scraper.browser import BrowserPool
+from app.scraper.checkpoint import Checkpoint
+from app.scraper.constants import components_link, department_base_components_url
+from app.scraper.metrics import metrics
+from app.scraper.models.component import Component
+from app.scraper.models.department import Department
+from app.scraper.parsers.departments import (
+    parse_department,
+    parse_department_components,
+    parse_departments_sigaa_ids,
 )
-from app.scraper.utils import get_page
+from app.scraper.pipeline import WritePipeline
+from app.scraper.pool import PagePool
+from app.scraper.requisites import requisites_fields
+from app.scraper.utils import get_url_html
 
 department_log_base_prefix = "[Departments]"
 
 
-async def get_departments_sigaa_ids(page: Page) -> set[int]:
+async def get_departments_sigaa_ids(browser: Browser) -> set[int]:
     """Get the SIGAA IDs of the departments."""
 
-    options_selector = "select[id='form:unidades'] option"
+    html = await get_url_html(browser, components_link, "departments", javascript=False)
 
-    options_page_function = "(elements) => elements.map((element) => \
-        parseInt(element.getAttribute('value')))\
-        .filter((value) => value > 0)"
+    return parse_departments_sigaa_ids(html)
 
-    sigaa_ids: list[int] = await page.JJeval(options_selector, options_page_function)
 
-    departments_sigaa_ids = set()
-    departments_sigaa_ids.update(sigaa_ids)
+def get_department_components_url(sigaa_id: int) -> str:
+    return f"{department_base_components_url}?id={sigaa_id}"
 
-    return departments_sigaa_ids
 
+def log_department(department: Department):
+    """Log the department information."""
 
-async def get_department_components_page(browser: Browser, sigaa_id: int):
-    """Get the components page of a department."""
+    sigaa_id, acronym, title = department.sigaa_id, department.acronym, department.title
 
-    department_components_url = f"{department_base_components_url}?id={sigaa_id}"
+    print(f"{department_log_base_prefix}[{sigaa_id}] {acronym} - {title}")
 
-    department_components_page = await get_page(browser, url=department_components_url)
 
-    return department_components_page
+async def get_department(
+    browser: Browser, sigaa_id: int
+) -> tuple[Department, list[Component]]:
+    """Open a department page and parse it, along the components it lists."""
 
+    html = await get_url_html(
+        browser,
+        get_department_components_url(sigaa_id),
+        f"department:{sigaa_id}",
+        javascript=False,
+    )
 
-async def get_department_header_attributes(page: Page) -> tuple[str, str]:
-    header = await page.querySelector("#colDirTop")
+    department = parse_department(html, sigaa_id)
+    log_department(department)
 
-    if header is None:
-        raise Exception("Department header element not found")
+    return department, parse_department_components(html, department.title)
 
-    acronym = await header.Jeval("h1", ELEMENT_INNER_TEXT)
-    title = await header.Jeval("h2", ELEMENT_INNER_TEXT)
 
-    return acronym, title
+@metrics.timed("db.store_departments")
+async def store_departments(
+    session: AsyncSession, departments: list[Department]
+) -> dict[int, int]:
+    """Store (or update) the scraped departments, returning their ids by SIGAA ID."""
 
+    return await upsert_departments(session, [d.dict() for d in departments])
 
-def log_department(sigaa_id: int, acronym: str, title: str):
-    """Log the department information."""
 
-    print(f"{department_log_base_prefix}[{sigaa_id}] {acronym} - {title}")
+@metrics.timed("db.store_department_components")
+async def store_department_components(
+    session: AsyncSession, departments_components: dict[int, list[Component]]
+):
+    """Store (or update) the components listed by the departments (by ID).
+
+    Requisites are only listed on detail pages, so they are left as they are.
+    """
+
+    rows = [
+        {
+            **component.dict(exclude={"department_title", *requisites_fields}),
+            "department_id": department_id,
+        }
+        for department_id, components in departments_components.items()
+        for component in components
+    ]
+
+    await upsert_components(session, rows)
 
 
-async def scrape_departments(browser: Browser, session: AsyncSession):
-    components_page = await get_page(browser, url=components_link)
-    departments_sigaa_ids = await get_departments_sigaa_ids(components_page)
+async def scrape_departments(
+    browser_pool: BrowserPool, session: AsyncSession, checkpoint: Checkpoint
+):
+    """Scrape and store (or update) the departments and the components they list.
+
+    Most components are then stored without opening their detail pages, which
+    are only needed for requisites.
+    """
+
+    departments_sigaa_ids = await browser_pool.run(get_departments_sigaa_ids)
+    departments_sigaa_ids = checkpoint.pending(
+        "department", sorted(departments_sigaa_ids)
+    )
 
     print(f"{department_log_base_prefix} {len(departments_sigaa_ids)} to be scraped")
 
-    for sigaa_id in departments_sigaa_ids:
-        department_page = await get_department_components_page(browser, sigaa_id)
-        acronym, title = await get_department_header_attributes(department_page)
-        log_department(sigaa_id, acronym, title)
+    async def write(scraped: list[tuple[Department, list[Component]]]):
+        departments = [department for department, _ in scraped]
+        departments_ids = await store_departments(session, departments)
+
+        await store_department_components(
+            session,
+            {
+                departments_ids[department.sigaa_id]: components
+                for department, components in scraped
+            },
+        )
+
+        checkpoint.mark_done("department", [d.sigaa_id for d in departments])
+
+    async with WritePipeline("Departments", write) as pipeline:
+
+        async def scrape(sigaa_id: int):
+            result = await checkpoint.run(
+                "department",
+                sigaa_id,
+                lambda: browser_pool.run(
+                    lambda browser: get_department(browser, sigaa_id)
+                ),
+            )
 
-        await store_or_update_department(session, sigaa_id, acronym, title)
+            # Failed departments were quarantined and come back as None
+            if result:
+                await pipeline.put(result)
 
-        await department_page.waitFor(1000)
-        await department_page.close()
+        await PagePool("Departments").map(departments_sigaa_ids, scrape)
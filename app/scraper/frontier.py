@@ -0,0 +1,93 @@
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+from app.scraper.models.curriculum_component import CurriculumComponent
+
+CurriculumKey = tuple[int, str]  # (program_sigaa_id, curriculum_sigaa_id)
+
+
+class ComponentFrontier:
+    """Distinct components of the crawled curricula, and where to open them from.
+
+    Components are shared by many curricula (e.g. calculus), so each one is
+    scraped once, from any curriculum report that lists it. The frontier is
+    also saved along the job checkpoint, so a resumed job still knows the
+    components of the curricula crawled before it stopped.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.curricula: dict[CurriculumKey, list[CurriculumComponent]] = {}
+
+        if path and path.exists():
+            with open(path) as lines:
+                for line in lines:
+                    record = json.loads(line)
+                    self.curricula[(record["program"], record["curriculum"])] = [
+                        CurriculumComponent(**member) for member in record["members"]
+                    ]
+
+    def add(
+        self,
+        program_sigaa_id: int,
+        curriculum_sigaa_id: str,
+        curriculum_components: list[CurriculumComponent],
+    ):
+        """Add the components of a curriculum to the frontier."""
+
+        self.curricula[(program_sigaa_id, curriculum_sigaa_id)] = curriculum_components
+
+        if self.path:
+            record = {
+                "program": program_sigaa_id,
+                "curriculum": curriculum_sigaa_id,
+                "members": [member.dict() for member in curriculum_components],
+            }
+
+            with open(self.path, "a") as lines:
+                lines.write(json.dumps(record) + "\n")
+
+    @property
+    def components_sigaa_ids(self) -> list[str]:
+        """Get the distinct components of all curricula."""
+
+        return sorted(
+            {
+                member.component_sigaa_id
+                for members in self.curricula.values()
+                for member in members
+            }
+        )
+
+    def plan(
+        self, components_sigaa_ids: Iterable[str]
+    ) -> list[tuple[CurriculumKey, list[str]]]:
+        """Assign each component to a curriculum report it can be opened from.
+
+        Reports are picked greedily by how many unassigned components they
+        list, so all components are covered by few report navigations.
+        """
+
+        remaining = set(components_sigaa_ids)
+        curricula_components = {
+            curriculum_key: {member.component_sigaa_id for member in members}
+            for curriculum_key, members in self.curricula.items()
+        }
+
+        plan: list[tuple[CurriculumKey, list[str]]] = []
+
+        while remaining and curricula_components:
+            curriculum_key = max(
+                curricula_components,
+                key=lambda key: len(curricula_components[key] & remaining),
+            )
+            covered = curricula_components.pop(curriculum_key) & remaining
+
+            if not covered:
+                break
+
+            plan.append((curriculum_key, sorted(covered)))
+            remaining -= covered
+
+        return plan
@@ -0,0 +1,182 @@
+"""
+Browserless fetch of SIGAA's server-rendered (JSF) pages.
+
+Pages are fetched by a pooled HTTP client, keeping the connections alive and
+the session cookies. JSF command links (e.g. "Relatório da Estrutura
+Curricular") are form posts, so they are submitted with the form's fields and
+`javax.faces.ViewState`, as the browser would.
+"""
+
+import re
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit
+
+import httpx
+
+from app.core import config
+from app.scraper.metrics import metrics
+from app.scraper.parsers.dom import Element, parse_html
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.snapshots import snapshot_store
+
+VIEW_STATE = "javax.faces.ViewState"
+
+# e.g. jsfcljs(document.getElementById('form'),{'form:link':'form:link','id':'1'},'')
+command_link_pattern = re.compile(
+    r"getElementById\(\s*'([^']+)'\s*\)\s*,\s*\{([^}]*)\}"
+)
+command_link_param_pattern = re.compile(r"'([^']*)'\s*:\s*'([^']*)'")
+
+
+class HttpPage:
+    def __init__(self, url: str, html: str):
+        self.url = url
+        self.html = html
+
+
+def get_route(url: str, fields: dict[str, str] | None = None) -> str:
+    """Identify a page by its path and parameters (query or form fields).
+
+    The view state changes on every request, so it is ignored.
+    """
+
+    parts = urlsplit(url)
+    params = {**dict(parse_qsl(parts.query)), **(fields or {})}
+    params.pop(VIEW_STATE, None)
+
+    route = parts.path.lstrip("/")
+
+    return f"{route}?{urlencode(sorted(params.items()))}" if params else route
+
+
+def get_route_path(root: Path, route: str) -> Path:
+    return root / f"{quote(route, safe='/')}.html"
+
+
+def get_form_fields(html: str, form_id: str) -> tuple[str, dict[str, str]]:
+    """Get the action and the fields of a form, including its view state."""
+
+    form = parse_html(html).find("form", {"id": form_id})
+
+    if form is None:
+        raise Exception(f"Form not found ({form_id})")
+
+    fields: dict[str, str] = {}
+
+    for input_element in form.find_all("input"):
+        name = input_element.get("name")
+        input_type = (input_element.get("type") or "text").lower()
+
+        if not name or input_type in ("submit", "button", "image"):
+            continue
+
+        if input_type in ("checkbox", "radio") and input_element.get("checked") is None:
+            continue
+
+        fields[name] = input_element.get("value") or ""
+
+    return form.get("action") or "", fields
+
+
+def get_command_link_params(anchor: Element) -> tuple[str, dict[str, str]]:
+    """Get the form and the parameters a JSF command link submits."""
+
+    command_link_match = command_link_pattern.search(anchor.get("onclick") or "")
+
+    if not command_link_match:
+        raise Exception("Anchor is not a JSF command link")
+
+    form_id, raw_params = command_link_match.groups()
+
+    return form_id, dict(command_link_param_pattern.findall(raw_params))
+
+
+class HttpFetcher:
+    """Fetch pages over a pooled HTTP client, optionally recording them.
+
+    Recorded pages are named by route (see `get_route`), so a `ReplicaServer`
+    can serve them as a stand-in for SIGAA. The client is created on enter and
+    closed on exit, so the fetcher can be used by several runs (event loops).
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        record_dir: str | Path | None = None,
+    ):
+        self.max_connections = (
+            max_connections or config.settings.SCRAPER_HTTP_CONNECTIONS
+        )
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=config.settings.SCRAPER_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch(
+        self, method: str, url: str, fields: dict[str, str] | None = None
+    ) -> HttpPage:
+        if self.client is None:
+            raise Exception("HTTP fetcher used outside of its context")
+
+        async with rate_limiter.limit(url) as navigation:
+            response = await self.client.request(method, url, data=fields)
+            navigation.status = response.status_code
+            response.raise_for_status()
+
+        page = HttpPage(str(response.url), response.text)
+
+        metrics.count("pages")
+        metrics.count("bytes.html", len(response.content))
+
+        if self.record_dir:
+            route_path = get_route_path(self.record_dir, get_route(url, fields))
+            route_path.parent.mkdir(parents=True, exist_ok=True)
+            route_path.write_text(page.html)
+
+        return page
+
+    async def get(self, url: str) -> HttpPage:
+        return await self.fetch("GET", url)
+
+    async def click(self, page: HttpPage, anchor: Element) -> HttpPage:
+        """Submit the form of a JSF command link of the page."""
+
+        form_id, params = get_command_link_params(anchor)
+        action, fields = get_form_fields(page.html, form_id)
+
+        return await self.fetch("POST", urljoin(page.url, action), {**fields, **params})
+
+    def get_page_html(self, page: HttpPage, key: str) -> str:
+        """Get the HTML of a page, storing a snapshot of it under the given key."""
+
+        if snapshot_store:
+            snapshot_store.put(key, page.url, page.html)
+
+        return page.html
+
+    async def get_html(self, url: str, key: str) -> str:
+        return self.get_page_html(await self.get(url), key)
+
+
+http_fetcher: HttpFetcher | None = None
+
+if config.settings.SCRAPER_HTTP_FETCH:
+    http_fetcher = HttpFetcher(record_dir=config.settings.SCRAPER_HTTP_RECORD_DIR)
@@ -0,0 +1,98 @@
+import math
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.fingerprint import get_fingerprints, store_fingerprints
+from app.db.models import PageFingerprint
+from app.scraper.metrics import metrics
+
+
+def get_change_priority(fingerprint: PageFingerprint | None, now: datetime) -> float:
+    """Estimate how likely a page is to have changed since it was last checked.
+
+    The change rate is the (smoothed) fraction of checks that found a change,
+    weighted by the days since the last check. Unknown pages come first.
+    """
+
+    if fingerprint is None:
+        return math.inf
+
+    change_rate = (fingerprint.changes + 1) / (fingerprint.checks + 2)
+    days_since_checked = (now - fingerprint.checked_at).total_seconds() / 86400
+
+    return change_rate * days_since_checked
+
+
+class ChangeDetector:
+    """Detect which pages changed since the last scrape, by content fingerprint."""
+
+    def __init__(self, fingerprints: dict[str, PageFingerprint], incremental: bool):
+        self.fingerprints = fingerprints
+        self.incremental = incremental
+        self.content_hashes: dict[str, str] = {}
+        self.checked = 0
+        self.skipped = 0
+
+    @classmethod
+    async def load(
+        cls, session: AsyncSession, keys: list[str], incremental: bool = True
+    ) -> "ChangeDetector":
+        with metrics.time("db.load_fingerprints"):
+            fingerprints = await get_fingerprints(session, keys) if incremental else {}
+
+        return cls(fingerprints, incremental)
+
+    async def extend(self, session: AsyncSession, keys: list[str]):
+        """Load the fingerprints of more page keys."""
+
+        if self.incremental:
+            with metrics.time("db.load_fingerprints"):
+                self.fingerprints.update(await get_fingerprints(session, keys))
+
+    def prioritize(self, keys: list[str], max_pages: int | None = None) -> list[str]:
+        """Sort the keys by change priority, keeping at most `max_pages` of them."""
+
+        now = datetime.utcnow()
+
+        def priority(key: str) -> float:
+            return get_change_priority(self.fingerprints.get(key), now)
+
+        return sorted(keys, key=priority, reverse=True)[:max_pages]
+
+    def has_changed(self, key: str, content_hash: str) -> bool:
+        """Record the page fingerprint and check if it differs from the stored one."""
+
+        self.content_hashes[key] = content_hash
+        self.checked += 1
+        fingerprint = self.fingerprints.get(key)
+
+        if (
+            self.incremental
+            and fingerprint
+            and fingerprint.content_hash == content_hash
+        ):
+            self.skipped += 1
+            metrics.count("pages.unchanged")
+            return False
+
+        return True
+
+    async def store(self, session: AsyncSession, keys: Iterable[str] | None = None):
+        """Store the fingerprints of the given (or all) pages checked so far."""
+
+        keys = list(self.content_hashes) if keys is None else keys
+        content_hashes = {
+            key: self.content_hashes.pop(key)
+            for key in keys
+            if key in self.content_hashes
+        }
+
+        with metrics.time("db.store_fingerprints"):
+            await store_fingerprints(session, content_hashes)
+
+    def log(self, prefix: str):
+        print(
+            f"{prefix} {self.checked} pages checked, {self.skipped} unchanged skipped"
+        )
@@ -1,15 +1,29 @@
+import argparse
 import asyncio
-
-from pyppeteer import launch
+from contextlib import nullcontext
+from pathlib import Path
 
 # from pyppeteer.browser import Browser
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.session import async_session
+from app.core import config
+from app.core.session import async_engine, async_session
+from app.scraper.browser import BrowserPool
+from app.scraper.checkpoint import Checkpoint
 from app.scraper.components import scrape_components
+from app.scraper.coordinator import crawl_curricula
 from app.scraper.curricula import scrape_curricula
+from app.scraper.department_index import DepartmentIndex
 from app.scraper.departments import scrape_departments
+from app.scraper.frontier import ComponentFrontier
+from app.scraper.http import http_fetcher
+from app.scraper.metrics import count_db_statements, metrics, profiling
+from app.scraper.pages import page_registry
 from app.scraper.programs import scrape_programs
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.requisites import RequisiteGraph
+from app.scraper.resources import resource_filter
+from app.scraper.snapshots import snapshot_store
 
 # from app.scraper.components import get_component
 # from app.scraper.curricula import (
@@ -20,7 +34,6 @@ from app.scraper.programs import scrape_programs
 
 
 swe_program_sigaa_id = 414924
-swe_curriculum_sigaa_id = "6360/1"
 
 
 # async def scrape_curricula_by_program__sigaa_id(
@@ -42,14 +55,76 @@ swe_curriculum_sigaa_id = "6360/1"
 async def create_sigaa_data(
     session: AsyncSession,
     program_sigaa_id: int | None = None,
-    curriculum_sigaa_id: str | None = None,
+    resume: bool = True,
+    workers: int = 1,
+    incremental: bool = True,
 ):
-    browser = await launch(headless=False, executablePath="/usr/bin/google-chrome")
-
-    await scrape_departments(browser, session)
-    await scrape_programs(browser, session)
-    await scrape_curricula(browser, session, program_sigaa_id)
-    await scrape_components(browser, session, program_sigaa_id, curriculum_sigaa_id)
+    """Scrape the SIGAA catalog, resuming the latest unfinished job if `resume`.
+
+    With more than one worker, curricula are crawled by that many processes.
+    Unless `incremental`, unchanged pages are parsed and stored too.
+    """
+
+    checkpoint = Checkpoint.open(resume)
+    frontier = ComponentFrontier(checkpoint.get_path("frontier"))
+    requisites = RequisiteGraph(checkpoint.get_path("requisites"))
+
+    if snapshot_store:
+        # A resumed job skips the units done before, so it adds to their manifest
+        run_id = snapshot_store.start_run(checkpoint.job_id)
+        print(f"[Snapshots] Recording pages of run {run_id}")
+
+    # Component pages are opened from curriculum reports, so browsers are needed
+    # even when server-rendered pages are fetched over HTTP
+    async with BrowserPool() as browser_pool, page_registry, (
+        http_fetcher or nullcontext()
+    ):
+        await scrape_departments(browser_pool, session, checkpoint)
+
+        department_index = await DepartmentIndex.load(session)
+
+        await scrape_programs(browser_pool, session, checkpoint, department_index)
+
+        if workers > 1:
+            await crawl_curricula(
+                session,
+                checkpoint,
+                frontier,
+                program_sigaa_id,
+                workers,
+                incremental=incremental,
+            )
+        else:
+            await scrape_curricula(
+                browser_pool,
+                session,
+                checkpoint,
+                frontier,
+                program_sigaa_id,
+                incremental=incremental,
+            )
+
+        await scrape_components(
+            browser_pool,
+            session,
+            checkpoint,
+            department_index,
+            frontier,
+            requisites,
+            incremental=incremental,
+        )
+
+    department_index.log()
+    rate_limiter.log()
+    resource_filter.log()
+    metrics.log()
+
+    if config.settings.SCRAPER_METRICS_DIR:
+        metrics.save(
+            Path(config.settings.SCRAPER_METRICS_DIR) / f"{checkpoint.job_id}.json"
+        )
+
+    checkpoint.finish()
 
     # curricula_pages = await scrape_curricula_by_program__sigaa_id(
     #     browser, program_sigaa_id, session
@@ -66,13 +141,46 @@ async def create_sigaa_data(
 
     # await scrape_components_by_sigaa_ids(program_components_sigaa_ids, session)
 
-    await browser.close()
 
+def get_arguments_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scrape the SIGAA catalog")
+    parser.add_argument("--program", type=int, default=swe_program_sigaa_id)
+    parser.add_argument(
+        "--all-programs", action="store_true", help="scrape curricula of all programs"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes crawling curricula"
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true", help="start a new job from scratch"
+    )
+    parser.add_argument(
+        "--no-incremental",
+        action="store_true",
+        help="parse and store unchanged pages too",
+    )
+    parser.add_argument(
+        "--profile", type=Path, help="dump a cProfile of the run to this file"
+    )
+
+    return parser
+
+
+async def main(arguments: argparse.Namespace):
+    program_sigaa_id = None if arguments.all_programs else arguments.program
+
+    count_db_statements(async_engine)
 
-async def main():
     async with async_session() as session:
-        await create_sigaa_data(session, swe_program_sigaa_id, swe_curriculum_sigaa_id)
+        with profiling(arguments.profile):
+            await create_sigaa_data(
+                session,
+                program_sigaa_id,
+                resume=not arguments.no_resume,
+                workers=arguments.workers,
+                incremental=not arguments.no_incremental,
+            )
 
 
 if __name__ == "__main__":
-    asyncio.get_event_loop().run_until_complete(main())
+    asyncio.run(main(get_arguments_parser().parse_args()))
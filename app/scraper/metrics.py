@@ -0,0 +1,176 @@
+import cProfile
+import functools
+import inspect
+import json
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+metrics_log_base_prefix = "[Metrics]"
+
+
+def get_percentile(samples: list[float], percentile: float) -> float:
+    """Get a percentile of the samples (nearest rank)."""
+
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = round(percentile / 100 * (len(ordered) - 1))
+
+    return ordered[index]
+
+
+class Metrics:
+    """Time the stages of a scrape (navigation, evaluation, parsing, DB writes...).
+
+    Stages are timed in wall-clock seconds, so concurrent samples of a stage
+    overlap. Counters track pages, retries, bytes, etc.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, list[float]] = defaultdict(list)
+        self.counters: Counter[str] = Counter()
+        self.started_at = time.monotonic()
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the block as a sample of the stage, even if it raises."""
+
+        start = time.monotonic()
+
+        try:
+            yield
+        finally:
+            self.timings[stage].append(time.monotonic() - start)
+
+    def timed(self, stage: str) -> Callable[[F], F]:
+        """Time every call of a function (sync or async) as a sample of the stage."""
+
+        def decorator(function: F) -> F:
+            if inspect.iscoroutinefunction(function):
+
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    with self.time(stage):
+                        return await function(*args, **kwargs)
+
+                return async_wrapper  # type: ignore
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return function(*args, **kwargs)
+
+            return wrapper  # type: ignore
+
+        return decorator
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def export(self) -> dict[str, Any]:
+        """Export the raw samples, e.g. to merge them from a worker process."""
+
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def merge(self, exported: dict[str, Any]):
+        for stage, samples in exported["timings"].items():
+            self.timings[stage].extend(samples)
+
+        self.counters.update(exported["counters"])
+
+    def report(self) -> dict[str, Any]:
+        """Summarize the samples of each stage and the counters."""
+
+        stages = {
+            stage: {
+                "count": len(samples),
+                "total": sum(samples),
+                "p50": get_percentile(samples, 50),
+                "p95": get_percentile(samples, 95),
+                "max": max(samples),
+            }
+            for stage, samples in sorted(self.timings.items())
+            if samples
+        }
+
+        return {
+            "elapsed": time.monotonic() - self.started_at,
+            "stages": stages,
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def save(self, path: Path):
+        """Save the report as JSON."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+
+        print(f"{metrics_log_base_prefix} Report saved to {path}")
+
+    def log(self):
+        """Print the report as a table."""
+
+        report = self.report()
+
+        print(f"{metrics_log_base_prefix} Run took {report['elapsed']:.1f}s")
+        print(
+            f"{metrics_log_base_prefix} {'stage':<32} {'count':>7} {'total':>9} "
+            f"{'p50':>8} {'p95':>8} {'max':>8}"
+        )
+
+        for stage, summary in report["stages"].items():
+            print(
+                f"{metrics_log_base_prefix} {stage:<32} {summary['count']:>7} "
+                f"{summary['total']:>8.1f}s {summary['p50']:>7.3f}s "
+                f"{summary['p95']:>7.3f}s {summary['max']:>7.3f}s"
+            )
+
+        for name, value in report["counters"].items():
+            print(f"{metrics_log_base_prefix} {name}: {value}")
+
+
+def count_db_statements(engine: AsyncEngine):
+    """Count the SQL statements run through the engine."""
+
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *_: metrics.count("db.statements"),
+    )
+
+
+@contextmanager
+def profiling(path: Path | None) -> Iterator[None]:
+    """Profile the block with cProfile, dumping the stats to `path` if given.
+
+    The dump can be read with `pstats`, snakeviz, or flameprof.
+    """
+
+    if path is None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+
+    try:
+        yield
+    finally:
+        profile.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
+
+        print(f"{metrics_log_base_prefix} Profile saved to {path}")
+
+
+metrics = Metrics()
@@ -7,4 +7,10 @@ class Component(BaseModel):
     sigaa_id: str
     title: str
     type: Literal["COURSE", "ACTIVITY"]
-    department_id: int
+    department_title: str
+    # Only listed on department pages
+    workload: int | None = None
+    # Options (in disjunctive normal form) and corequisites, by SIGAA ID
+    prerequisites: list[list[str]] = []
+    corequisites: list[str] = []
+    equivalences: list[list[str]] = []
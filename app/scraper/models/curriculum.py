@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class Curriculum(BaseModel):
+    sigaa_id: str
+    active: bool
+    start_year: int
+    start_period: int
+    min_periods: int
+    max_periods: int
+    min_period_workload: int
+    max_period_workload: int
+    min_workload: int
+    mandatory_components_workload: int
+    min_elective_components_workload: int
+    max_elective_components_workload: int
+    min_complementary_components_workload: int
+    max_complementary_components_workload: int
+    program_sigaa_id: int
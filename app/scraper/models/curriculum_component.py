@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class CurriculumComponent(BaseModel):
+    component_sigaa_id: str
+    type: Literal["MANDATORY", "ELECTIVE"]
+    period: int | None = None
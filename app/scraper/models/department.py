@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class Department(BaseModel):
+    sigaa_id: int
+    acronym: str
+    title: str
@@ -0,0 +1,12 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class Program(BaseModel):
+    sigaa_id: int
+    title: str
+    degree: Literal["BACHELOR", "LICENTIATE"] | None
+    shift: Literal["DAY", "NIGHT"] | None
+    department_acronym: str
+    department_title: str
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from pyppeteer.browser import Browser
+from pyppeteer.page import Page
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+pages_log_base_prefix = "[Pages]"
+
+
+class OpenPage:
+    def __init__(self, browser: Browser, url: str | None):
+        self.browser = browser
+        self.url = url
+        self.opened_at = time.monotonic()
+
+    @property
+    def lifetime(self) -> float:
+        return time.monotonic() - self.opened_at
+
+
+class PageRegistry:
+    """Track the pages opened by the scraper, capping how many are open at once.
+
+    Pages are unregistered when closed, however they are closed. On exit, the
+    pages still open are reported as leaked, with their memory usage, and
+    closed. Entering the registry starts a new run (e.g. in a new event loop).
+    """
+
+    def __init__(self, max_open_pages: int, long_lived_seconds: float):
+        self.max_open_pages = max_open_pages
+        self.long_lived_seconds = long_lived_seconds
+        self.reset()
+
+    def reset(self):
+        self.pages: dict[Page, OpenPage] = {}
+        self.by_url: dict[tuple[int, str], Page] = {}
+        self.long_lived: list[tuple[str | None, float]] = []
+        self.opened = 0
+        self.opening = 0
+        # The condition is bound to the event loop of its first use
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "PageRegistry":
+        self.reset()
+
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.report()
+        await self.close_all()
+
+    async def open(self, browser: Browser) -> Page:
+        """Open a new page, waiting while too many pages are open."""
+
+        with metrics.time("wait.open_pages"):
+            async with self.condition:
+                await self.condition.wait_for(
+                    lambda: len(self.pages) + self.opening < self.max_open_pages
+                )
+                self.opening += 1
+
+        try:
+            with metrics.time("evaluation.new_page"):
+                page = await browser.newPage()
+        finally:
+            self.opening -= 1
+
+        self.register(page, browser)
+
+        return page
+
+    def register(self, page: Page, browser: Browser, url: str | None = None):
+        """Track a page, e.g. a tab opened by a form submit."""
+
+        self.pages[page] = OpenPage(browser, url)
+        self.opened += 1
+
+        if url:
+            self.by_url[(id(browser), url)] = page
+
+        page.on("close", lambda: asyncio.ensure_future(self.unregister(page)))
+
+    def set_url(self, page: Page, url: str):
+        open_page = self.pages[page]
+        open_page.url = url
+        self.by_url[(id(open_page.browser), url)] = page
+
+    def find(self, browser: Browser, url: str) -> Page | None:
+        """Find an open page of the browser by the URL it was opened with."""
+
+        return self.by_url.get((id(browser), url))
+
+    async def unregister(self, page: Page):
+        open_page = self.pages.pop(page, None)
+
+        if open_page is None:
+            return
+
+        if open_page.url:
+            self.by_url.pop((id(open_page.browser), open_page.url), None)
+
+        if open_page.lifetime > self.long_lived_seconds:
+            self.long_lived.append((open_page.url, open_page.lifetime))
+
+        async with self.condition:
+            self.condition.notify_all()
+
+    @asynccontextmanager
+    async def closing(self, page: Page) -> AsyncIterator[Page]:
+        """Close the page on exit, even on exceptions."""
+
+        try:
+            yield page
+        finally:
+            if not page.isClosed():
+                await page.close()
+
+    @asynccontextmanager
+    async def closing_on_error(self, page: Page) -> AsyncIterator[Page]:
+        """Close the page if its setup fails, so it is not left open."""
+
+        try:
+            yield page
+        except BaseException:
+            if not page.isClosed():
+                await page.close()
+
+            raise
+
+    async def close_all(self):
+        for page in list(self.pages):
+            if not page.isClosed():
+                await page.close()
+
+            await self.unregister(page)
+
+    async def report(self):
+        """Report the pages left open and the long-lived ones."""
+
+        print(
+            f"{pages_log_base_prefix} {self.opened} pages opened, "
+            f"{len(self.pages)} left open"
+        )
+
+        for page, open_page in list(self.pages.items()):
+            try:
+                page_metrics = await page.metrics()
+                heap = f"{page_metrics['JSHeapUsedSize'] / 1024 ** 2:.1f} MiB JS heap"
+            except Exception:
+                heap = "unknown memory"
+
+            print(
+                f"{pages_log_base_prefix} Leaked: {open_page.url} "
+                f"({open_page.lifetime:.0f}s, {heap})"
+            )
+
+        for url, lifetime in sorted(self.long_lived, key=lambda item: -item[1])[:10]:
+            print(f"{pages_log_base_prefix} Long-lived: {url} ({lifetime:.0f}s)")
+
+
+page_registry = PageRegistry(
+    config.settings.SCRAPER_MAX_OPEN_PAGES, config.settings.SCRAPER_LONG_LIVED_PAGE
+)
@@ -0,0 +1,76 @@
+from app.scraper.metrics import metrics
+from app.scraper.models.component import Component
+from app.scraper.parsers.dom import parse_html
+from app.scraper.parsers.expressions import parse_expression
+from app.scraper.parsers.utils import get_cell_text, get_header_cells_text
+
+component_type_map = {
+    "DISCIPLINA": "COURSE",
+    "ATIVIDADE": "ACTIVITY",
+}
+
+
+def get_component_type(cells: dict[str, str]) -> str:
+    header_text = "Tipo do Componente Curricular"
+
+    raw_type = get_cell_text(cells, header_text)
+
+    if raw_type not in component_type_map:
+        raise Exception(f"Invalid component type ({raw_type})")
+
+    return component_type_map[raw_type]
+
+
+def get_component_department_title(cells: dict[str, str]) -> str:
+    header_text = "Unidade Responsável"
+    department = get_cell_text(cells, header_text)
+
+    department_title = department.split(" - ")[0]
+
+    return department_title
+
+
+def get_component_options(cells: dict[str, str], th_text: str) -> list[list[str]]:
+    """Get the options of a requisite expression, none if it's missing."""
+
+    expression = next(
+        (text for header_text, text in cells.items() if th_text in header_text), ""
+    )
+
+    return [list(option) for option in parse_expression(expression)]
+
+
+def get_component_corequisites(cells: dict[str, str], sigaa_id: str) -> list[str]:
+    """Get the corequisites, which must all be taken, none if it has alternatives.
+
+    Corequisites are stored as pairs, so alternatives ("OU") can't be: rather
+    than making every alternative required, they are left out.
+    """
+
+    options = get_component_options(cells, "Co-Requisitos")
+
+    if len(options) > 1:
+        metrics.count("corequisites.alternatives")
+        print(f"[Components] Left out alternative corequisites ({sigaa_id})")
+
+        return []
+
+    return sorted(options[0]) if options else []
+
+
+@metrics.timed("parse.component")
+def parse_component(html: str) -> Component:
+    """Parse a component from its detail page."""
+
+    cells = get_header_cells_text(parse_html(html))
+    sigaa_id = get_cell_text(cells, "Código")
+
+    return Component(
+        sigaa_id=sigaa_id,
+        title=get_cell_text(cells, "Nome"),
+        type=get_component_type(cells),
+        department_title=get_component_department_title(cells),
+        prerequisites=get_component_options(cells, "Pré-Requisitos"),
+        corequisites=get_component_corequisites(cells, sigaa_id),
+        equivalences=get_component_options(cells, "Equivalências"),
+    )
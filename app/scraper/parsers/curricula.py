@@ -0,0 +1,249 @@
+import re
+
+from app.scraper.metrics import metrics
+from app.scraper.models.curriculum import Curriculum
+from app.scraper.models.curriculum_component import CurriculumComponent
+from app.scraper.parsers.dom import Element, parse_html
+from app.scraper.parsers.utils import (
+    format_workload_to_number,
+    get_cell_text,
+    get_header_cells_text,
+)
+
+curriculum_row_classes = ("linha_par", "linha_impar")
+curriculum_report_anchor_title = "Relatório da Estrutura Curricular"
+period_pattern = re.compile(r"(\d+)º\s*(?:Período|Nível)")
+
+
+def get_curricula_tr_elements(document: Element) -> list[Element]:
+    table = document.find("table", {"id": "table_lt"})
+
+    if table is None:
+        return []
+
+    return [
+        tr for tr in table.find_all("tr") if tr.get("class") in curriculum_row_classes
+    ]
+
+
+def parse_curriculum_status(curriculum_tr: Element) -> bool:
+    cells = curriculum_tr.element_children
+
+    return any(td.tag == "td" and "Ativa" in td.text for td in cells)
+
+
+def parse_curriculum_sigaa_id_by_tr_element(curriculum_tr: Element) -> str:
+    first_td = curriculum_tr.find("td")
+    raw_sigaa_id = first_td.text if first_td else ""
+
+    sigaa_id_pattern = "Detalhes da Estrutura Curricular (.*),"
+    sigaa_id_match = re.search(sigaa_id_pattern, raw_sigaa_id)
+
+    if not sigaa_id_match:
+        raise Exception("Could not find curriculum sigaa_id")
+
+    return sigaa_id_match.group(1).strip()
+
+
+def find_curriculum_report_anchor(html: str, curriculum_sigaa_id: str) -> Element:
+    """Find the anchor opening the structure report of a curriculum on its list."""
+
+    document = parse_html(html)
+
+    for curriculum_tr in get_curricula_tr_elements(document):
+        if curriculum_sigaa_id not in curriculum_tr.text:
+            continue
+
+        anchor = curriculum_tr.find("a", {"title": curriculum_report_anchor_title})
+
+        if anchor:
+            return anchor
+
+    raise Exception("Could not find button to open curriculum page")
+
+
+@metrics.timed("parse.curricula_list")
+def parse_curricula_list(html: str) -> list[tuple[str, bool]]:
+    """Parse the (sigaa_id, active) pairs from a program curricula list page."""
+
+    document = parse_html(html)
+
+    return [
+        (
+            parse_curriculum_sigaa_id_by_tr_element(curriculum_tr),
+            parse_curriculum_status(curriculum_tr),
+        )
+        for curriculum_tr in get_curricula_tr_elements(document)
+    ]
+
+
+def get_curriculum_sigaa_id(cells: dict[str, str]) -> str:
+    return get_cell_text(cells, "Código")
+
+
+def get_curriculum_start_period(cells: dict[str, str]) -> tuple[int, int]:
+    header_text = "Período Letivo de Entrada em Vigor"
+    raw_start_period = get_cell_text(cells, header_text)
+
+    [start_year, start_period] = raw_start_period.split(".")
+    start_year = int(start_year)
+    start_period = int(start_period)
+
+    return start_year, start_period
+
+
+def get_curriculum_min_periods(cells: dict[str, str]) -> int:
+    min_periods = get_cell_text(cells, "Mínimo:")
+    min_periods = int(min_periods)
+
+    return min_periods
+
+
+def get_curriculum_max_periods(cells: dict[str, str]) -> int:
+    max_periods = get_cell_text(cells, "Máximo:")
+    max_periods = int(max_periods)
+
+    return max_periods
+
+
+def get_curriculum_min_period_workload(cells: dict[str, str]) -> int:
+    header_text = "Carga Horária Mínima por Período Letivo"
+    raw_workload = get_cell_text(cells, header_text)
+
+    min_period_workload = format_workload_to_number(raw_workload)
+
+    return min_period_workload
+
+
+def get_curriculum_max_period_workload(cells: dict[str, str]) -> int:
+    header_text = "Carga Horária Máxima por Período Letivo"
+    raw_workload = get_cell_text(cells, header_text)
+
+    max_period_workload = format_workload_to_number(raw_workload)
+
+    return max_period_workload
+
+
+def get_curriculum_min_workload(cells: dict[str, str]) -> int:
+    header_text = "Total Mínima"
+    raw_workload = get_cell_text(cells, header_text)
+
+    min_workload = format_workload_to_number(raw_workload)
+
+    return min_workload
+
+
+def get_curriculum_mandatory_components_workload(cells: dict[str, str]) -> int:
+    header_text = "Total:"
+    raw_workload = get_cell_text(cells, header_text)
+
+    mandatory_components_workload = format_workload_to_number(raw_workload)
+
+    return mandatory_components_workload
+
+
+def get_curriculum_min_elective_components_workload(cells: dict[str, str]) -> int:
+    header_text = "Carga Horária Optativa Mínima:"
+    raw_workload = get_cell_text(cells, header_text)
+
+    min_elective_components_workload = format_workload_to_number(raw_workload)
+
+    return min_elective_components_workload
+
+
+def get_curriculum_min_complementary_components_workload(
+    cells: dict[str, str],
+) -> int:
+    header_text = "Carga Horária Complementar Mínima:"
+    raw_workload = get_cell_text(cells, header_text)
+
+    min_complementary_components_workload = format_workload_to_number(raw_workload)
+
+    return min_complementary_components_workload
+
+
+def get_curriculum_max_complementary_components_workload(
+    cells: dict[str, str],
+) -> int:
+    header_text = "Carga Horária Máxima de Componentes Eletivos"
+    raw_workload = get_cell_text(cells, header_text)
+
+    max_complementary_components_workload = format_workload_to_number(raw_workload)
+
+    return max_complementary_components_workload
+
+
+@metrics.timed("parse.curriculum")
+def parse_curriculum(html: str, program_sigaa_id: int, active: bool) -> Curriculum:
+    """Parse a curriculum from its structure report page."""
+
+    cells = get_header_cells_text(parse_html(html))
+
+    start_year, start_period = get_curriculum_start_period(cells)
+    min_elective_components_workload = get_curriculum_min_elective_components_workload(
+        cells
+    )
+
+    return Curriculum(
+        sigaa_id=get_curriculum_sigaa_id(cells),
+        active=active,
+        start_year=start_year,
+        start_period=start_period,
+        min_periods=get_curriculum_min_periods(cells),
+        max_periods=get_curriculum_max_periods(cells),
+        min_period_workload=get_curriculum_min_period_workload(cells),
+        max_period_workload=get_curriculum_max_period_workload(cells),
+        min_workload=get_curriculum_min_workload(cells),
+        mandatory_components_workload=get_curriculum_mandatory_components_workload(
+            cells
+        ),
+        min_elective_components_workload=min_elective_components_workload,
+        max_elective_components_workload=min_elective_components_workload,
+        min_complementary_components_workload=(
+            get_curriculum_min_complementary_components_workload(cells)
+        ),
+        max_complementary_components_workload=(
+            get_curriculum_max_complementary_components_workload(cells)
+        ),
+        program_sigaa_id=program_sigaa_id,
+    )
+
+
+@metrics.timed("parse.curriculum_components")
+def parse_curriculum_components(html: str) -> list[CurriculumComponent]:
+    """Parse the components of a curriculum report, in structure order.
+
+    Components are listed under their period ("1º Período" or "1º Nível"),
+    and the ones listed after the "Optativas" section are electives.
+    """
+
+    document = parse_html(html)
+
+    curriculum_components: list[CurriculumComponent] = []
+    components_sigaa_ids: set[str] = set()
+    component_type = "MANDATORY"
+    period: int | None = None
+
+    for element in document.iter():
+        if element.tag == "td":
+            if "Optativas" in element.own_text:
+                component_type = "ELECTIVE"
+                period = None
+            elif match := period_pattern.search(element.own_text):
+                period = int(match.group(1))
+
+        if element.tag != "tr" or "componentes" not in element.classes:
+            continue
+
+        first_td = element.find("td")
+        sigaa_id = (first_td.text if first_td else "").split(" - ")[0]
+
+        if sigaa_id and sigaa_id not in components_sigaa_ids:
+            components_sigaa_ids.add(sigaa_id)
+            curriculum_components.append(
+                CurriculumComponent(
+                    component_sigaa_id=sigaa_id, type=component_type, period=period
+                )
+            )
+
+    return curriculum_components
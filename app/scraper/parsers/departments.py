@@ -0,0 +1,118 @@
+import re
+
+from app.scraper.metrics import metrics
+from app.scraper.models.component import Component
+from app.scraper.models.department import Department
+from app.scraper.parsers.components import component_type_map
+from app.scraper.parsers.dom import parse_html
+
+# Header texts of the columns of the department components table
+department_components_columns = {
+    "sigaa_id": ("Código",),
+    "title": ("Nome", "Componente"),
+    "type": ("Tipo",),
+    "workload": ("CH", "Carga Horária"),
+}
+
+
+@metrics.timed("parse.departments")
+def parse_departments_sigaa_ids(html: str) -> set[int]:
+    """Parse the SIGAA IDs of the departments from the components search page."""
+
+    document = parse_html(html)
+    select = document.find("select", {"id": "form:unidades"})
+
+    if select is None:
+        raise Exception("Departments select element not found")
+
+    departments_sigaa_ids: set[int] = set()
+
+    for option in select.find_all("option"):
+        value = option.get("value") or ""
+
+        if value.isdigit() and int(value) > 0:
+            departments_sigaa_ids.add(int(value))
+
+    return departments_sigaa_ids
+
+
+@metrics.timed("parse.department")
+def parse_department(html: str, sigaa_id: int) -> Department:
+    """Parse a department from its components page."""
+
+    document = parse_html(html)
+    header = document.find(attrs={"id": "colDirTop"})
+
+    if header is None:
+        raise Exception("Department header element not found")
+
+    acronym = header.find("h1")
+    title = header.find("h2")
+
+    if acronym is None or title is None:
+        raise Exception("Department acronym or title not found")
+
+    return Department(sigaa_id=sigaa_id, acronym=acronym.text, title=title.text)
+
+
+def parse_workload(raw_workload: str) -> int | None:
+    workload_match = re.search("[0-9]+", raw_workload)
+
+    return int(workload_match.group()) if workload_match else None
+
+
+@metrics.timed("parse.department_components")
+def parse_department_components(html: str, department_title: str) -> list[Component]:
+    """Parse the components table of a department components page.
+
+    Components of types that are not stored (e.g. modules) are skipped.
+    """
+
+    document = parse_html(html)
+    table = document.find("table", class_name="listagem")
+
+    if table is None:
+        return []
+
+    headers = [th.text for th in table.find_all("th")]
+    columns: dict[str, int] = {}
+
+    for name, header_texts in department_components_columns.items():
+        index = next(
+            (
+                index
+                for index, header in enumerate(headers)
+                if any(header.startswith(text) for text in header_texts)
+            ),
+            None,
+        )
+
+        if index is None:
+            raise Exception(f"Department components column not found ({name})")
+
+        columns[name] = index
+
+    components: list[Component] = []
+
+    for tr in table.find_all("tr"):
+        cells = [td.text for td in tr.find_all("td")]
+
+        if len(cells) < len(headers):
+            continue
+
+        raw_type = cells[columns["type"]].upper()
+
+        if raw_type not in component_type_map:
+            continue
+
+        components.append(
+            Component(
+                sigaa_id=cells[columns["sigaa_id"]],
+                title=cells[columns["title"]],
+                type=component_type_map[raw_type],
+                department_title=department_title,
+                workload=parse_workload(cells[columns["workload"]]),
+            )
+        )
+
+    return components
@@ -0,0 +1,217 @@
+"""
+Minimal DOM built with the standard library `html.parser`.
+
+SIGAA pages are server-rendered JSF, so a small tree with tag, attribute and
+text lookups is enough to parse them without a browser.
+"""
+
+import re
+from collections.abc import Iterator
+from html.parser import HTMLParser
+
+from app.scraper.metrics import metrics
+
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Tags closed by the opening of another one, e.g. `<td>a<td>b`
+IMPLICITLY_CLOSED_TAGS = {
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "option": {"option"},
+    "li": {"li"},
+    "p": {"p"},
+}
+
+NON_TEXT_TAGS = {"script", "style"}
+
+# Tags whose text is separated from its surroundings, as `innerText` does
+SEPARATED_TEXT_TAGS = {"br", "div", "h1", "h2", "h3", "li", "p", "td", "th", "tr"}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class Element:
+    def __init__(
+        self, tag: str, attrs: dict[str, str], parent: "Element | None" = None
+    ):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: list["Element | str"] = []
+
+    def __repr__(self) -> str:
+        return f"<Element {self.tag} {self.attrs}>"
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        return self.attrs.get(name, default)
+
+    @property
+    def classes(self) -> list[str]:
+        return (self.attrs.get("class") or "").split()
+
+    @property
+    def element_children(self) -> list["Element"]:
+        return [child for child in self.children if isinstance(child, Element)]
+
+    def matches(
+        self,
+        tag: str | None = None,
+        attrs: dict[str, str] | None = None,
+        class_name: str | None = None,
+    ) -> bool:
+        if tag is not None and self.tag != tag:
+            return False
+
+        if attrs and any(self.attrs.get(k) != v for k, v in attrs.items()):
+            return False
+
+        if class_name is not None and class_name not in self.classes:
+            return False
+
+        return True
+
+    def iter(self) -> Iterator["Element"]:
+        """Iterate over the descendants, in document order."""
+
+        for child in self.element_children:
+            yield child
+            yield from child.iter()
+
+    def find_all(
+        self,
+        tag: str | None = None,
+        attrs: dict[str, str] | None = None,
+        class_name: str | None = None,
+    ) -> list["Element"]:
+        return [e for e in self.iter() if e.matches(tag, attrs, class_name)]
+
+    def find(
+        self,
+        tag: str | None = None,
+        attrs: dict[str, str] | None = None,
+        class_name: str | None = None,
+    ) -> "Element | None":
+        return next((e for e in self.iter() if e.matches(tag, attrs, class_name)), None)
+
+    def ancestors(self) -> Iterator["Element"]:
+        """Iterate over the ancestors, nearest first."""
+
+        parent = self.parent
+
+        while parent is not None:
+            yield parent
+            parent = parent.parent
+
+    def find_ancestor(self, tag: str) -> "Element | None":
+        return next((e for e in self.ancestors() if e.tag == tag), None)
+
+    def previous_siblings(self) -> list["Element"]:
+        """Get the previous element siblings, nearest first."""
+
+        if self.parent is None:
+            return []
+
+        siblings = self.parent.element_children
+        index = siblings.index(self)
+
+        return siblings[:index][::-1]
+
+    def next_siblings(self) -> list["Element"]:
+        """Get the next element siblings, nearest first."""
+
+        if self.parent is None:
+            return []
+
+        siblings = self.parent.element_children
+        index = siblings.index(self)
+
+        return siblings[index + 1 :]
+
+    def _texts(self) -> Iterator[str]:
+        for child in self.children:
+            if isinstance(child, str):
+                yield child
+            elif child.tag in SEPARATED_TEXT_TAGS:
+                yield " "
+                yield from child._texts()
+                yield " "
+            elif child.tag not in NON_TEXT_TAGS:
+                yield from child._texts()
+
+    @property
+    def text(self) -> str:
+        """Text of the element and its descendants, with collapsed whitespace."""
+
+        return normalize_text("".join(self._texts()))
+
+    @property
+    def own_text(self) -> str:
+        """Text of the element itself, without its descendants."""
+
+        texts = (child for child in self.children if isinstance(child, str))
+
+        return normalize_text("".join(texts))
+
+
+def normalize_text(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        closed_tags = IMPLICITLY_CLOSED_TAGS.get(tag, set())
+
+        while len(self.stack) > 1 and self.stack[-1].tag in closed_tags:
+            self.stack.pop()
+
+        parent = self.stack[-1]
+        element = Element(tag, {k: v or "" for k, v in attrs}, parent)
+        parent.children.append(element)
+
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        parent = self.stack[-1]
+        parent.children.append(Element(tag, {k: v or "" for k, v in attrs}, parent))
+
+    def handle_endtag(self, tag: str):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                break
+
+    def handle_data(self, data: str):
+        self.stack[-1].children.append(data)
+
+
+@metrics.timed("parse.html")
+def parse_html(html: str) -> Element:
+    """Parse an HTML document into an `Element` tree."""
+
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+
+    return builder.root
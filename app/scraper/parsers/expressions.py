@@ -0,0 +1,120 @@
+"""
+Parse SIGAA requisite expressions, e.g. "( MAT0025 E FIS0070 ) OU MAT0026".
+
+Grammar ("E" binds tighter than "OU"):
+
+    expression := term ("OU" term)*
+    term       := factor ("E" factor)*
+    factor     := CODE | "(" expression ")"
+
+Expressions are turned into disjunctive normal form: the options that
+satisfy it, each a set of components that must all be taken.
+"""
+
+import re
+from functools import lru_cache
+
+Option = frozenset[str]
+
+token_pattern = re.compile(r"\(|\)|[^\s()]+")
+code_pattern = re.compile(r"[A-Z]+\d+")
+empty_expressions = ("", "-")
+
+
+def tokenize_expression(expression: str) -> list[str]:
+    tokens = token_pattern.findall(expression)
+
+    for token in tokens:
+        if token not in ("(", ")", "E", "OU") and not code_pattern.fullmatch(token):
+            raise Exception(f"Invalid token in expression ({token})")
+
+    return tokens
+
+
+class ExpressionParser:
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+
+        return None
+
+    def take(self, expected: str | None = None) -> str:
+        token = self.peek()
+
+        if token is None or (expected and token != expected):
+            raise Exception(f"Expected {expected or 'a token'} at {self.position}")
+
+        self.position += 1
+
+        return token
+
+    def parse(self) -> set[Option]:
+        options = self.parse_expression()
+
+        if self.peek() is not None:
+            raise Exception(f"Unexpected token at {self.position} ({self.peek()})")
+
+        return options
+
+    def parse_expression(self) -> set[Option]:
+        options = self.parse_term()
+
+        while self.peek() == "OU":
+            self.take("OU")
+            options |= self.parse_term()
+
+        return options
+
+    def parse_term(self) -> set[Option]:
+        options = self.parse_factor()
+
+        while self.peek() == "E":
+            self.take("E")
+            factor_options = self.parse_factor()
+            options = {a | b for a in options for b in factor_options}
+
+        return options
+
+    def parse_factor(self) -> set[Option]:
+        if self.peek() == "(":
+            self.take("(")
+            options = self.parse_expression()
+            self.take(")")
+
+            return options
+
+        token = self.take()
+
+        if token in ("E", "OU", ")"):
+            raise Exception(f"Unexpected token at {self.position - 1} ({token})")
+
+        return {frozenset([token])}
+
+
+def get_minimal_options(options: set[Option]) -> list[Option]:
+    """Drop options containing another option, as they are never needed."""
+
+    return [
+        option for option in options if not any(other < option for other in options)
+    ]
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(expression: str) -> tuple[tuple[str, ...], ...]:
+    """Parse an expression into its options, sorted (memoized on the text).
+
+    Many components share the same expression, so it's parsed once.
+    """
+
+    expression = expression.strip()
+
+    if expression in empty_expressions:
+        return ()
+
+    options = ExpressionParser(tokenize_expression(expression)).parse()
+
+    return tuple(sorted(tuple(sorted(o)) for o in get_minimal_options(options)))
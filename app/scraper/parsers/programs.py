@@ -0,0 +1,73 @@
+import re
+
+from app.scraper.constants import program_degree_map, program_shift_map
+from app.scraper.metrics import metrics
+from app.scraper.models.program import Program
+from app.scraper.parsers.dom import Element, parse_html
+
+program_row_classes = ("linhaPar", "linhaImpar")
+
+
+def is_program_row(tr: Element) -> bool:
+    return any(class_name in tr.classes for class_name in program_row_classes)
+
+
+def parse_program_sigaa_id(program_tr: Element) -> int:
+    """Parse the SIGAA ID of a program from its tr element."""
+
+    anchor = program_tr.find("a")
+    program_url = anchor.get("href", "") if anchor else ""
+
+    sigaa_id_match = re.search("id=([0-9]+)", program_url or "")
+
+    if not sigaa_id_match:
+        raise Exception(f"SIGAA ID not found on program URL: {program_url}")
+
+    return int(sigaa_id_match.group(1))
+
+
+def parse_program_department_attributes(program_tr: Element) -> tuple[str, str]:
+    """Parse the department acronym and title from the row preceding the program."""
+
+    department_tr = next(
+        (tr for tr in program_tr.previous_siblings() if not tr.classes), None
+    )
+
+    if department_tr is None:
+        raise Exception("Program department row not found")
+
+    [department_acronym, department_title] = department_tr.text.split(" - ", 1)
+
+    return department_acronym.strip(), department_title.strip()
+
+
+def parse_program(program_tr: Element) -> Program:
+    """Parse a program from its tr element."""
+
+    [title_td, degree_td, shift_td, *_] = program_tr.find_all("td")
+
+    raw_degree = degree_td.text.upper()
+    raw_shift = shift_td.text.upper()
+
+    department_acronym, department_title = parse_program_department_attributes(
+        program_tr
+    )
+
+    return Program(
+        sigaa_id=parse_program_sigaa_id(program_tr),
+        title=title_td.text,
+        degree=program_degree_map.get(raw_degree),
+        shift=program_shift_map.get(raw_shift),
+        department_acronym=department_acronym,
+        department_title=department_title,
+    )
+
+
+@metrics.timed("parse.programs")
+def parse_programs(html: str) -> list[Program]:
+    """Parse the programs from the graduation programs list page."""
+
+    document = parse_html(html)
+    programs_tr = [tr for tr in document.find_all("tr") if is_program_row(tr)]
+
+    return [parse_program(program_tr) for program_tr in programs_tr]
@@ -0,0 +1,51 @@
+import hashlib
+
+from app.scraper.metrics import metrics
+from app.scraper.parsers.dom import Element, parse_html
+
+
+def get_header_cells_text(document: Element) -> dict[str, str]:
+    """Get the text of every "th -> td" pair of the document."""
+
+    cells: dict[str, str] = {}
+
+    for th in document.find_all("th"):
+        td = next((e for e in th.next_siblings() if e.tag == "td"), None)
+
+        if td is not None:
+            cells.setdefault(th.text, td.text)
+
+    return cells
+
+
+def get_cell_text(cells: dict[str, str], th_text: str) -> str:
+    """Get the text of the first cell whose header contains the given text."""
+
+    for header_text, cell_text in cells.items():
+        if th_text in header_text:
+            return cell_text
+
+    raise Exception(f"Cell with header '{th_text}' not found")
+
+
+def format_workload_to_number(raw_workload: str) -> int:
+    workload = int(raw_workload.replace("h", ""))
+
+    return workload
+
+
+@metrics.timed("parse.fingerprint")
+def get_content_fingerprint(html: str, *extra: str) -> str:
+    """Hash the text of the page content, ignoring markup, scripts and view state.
+
+    Only the text of the `#conteudo` container is used (when present), so the
+    server name and timestamps in SIGAA's header and footer don't count as
+    changes.
+    """
+
+    document = parse_html(html)
+    content = document.find(attrs={"id": "conteudo"}) or document
+
+    text = "\n".join([content.text, *extra])
+
+    return hashlib.sha256(text.encode()).hexdigest()
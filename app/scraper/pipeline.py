@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+T = TypeVar("T")
+
+# Sent by `__aexit__` to stop the writer once the queue is drained
+STOP = object()
+
+
+class WritePipeline(Generic[T]):
+    """Stream scraped records to a writer task, which stores them in batches.
+
+    The queue is bounded, so a slow database makes `put` wait (back-pressure)
+    instead of piling up records, while fetching and writing overlap. The
+    writer is the only user of the `AsyncSession` while the pipeline runs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write: Callable[[list[T]], Awaitable[None]],
+        batch_size: int | None = None,
+        max_size: int | None = None,
+    ):
+        self.name = name
+        self.write = write
+        self.batch_size = batch_size or config.settings.SCRAPER_CHECKPOINT_BATCH_SIZE
+        self.queue: asyncio.Queue = asyncio.Queue(
+            max_size or config.settings.SCRAPER_PIPELINE_MAX_SIZE
+        )
+        self.writer: asyncio.Task | None = None
+        self.error: BaseException | None = None
+        self.records = 0
+        self.batches = 0
+        self.write_elapsed = 0.0
+
+    async def __aenter__(self) -> "WritePipeline[T]":
+        self.writer = asyncio.create_task(self.run_writer())
+
+        return self
+
+    async def __aexit__(self, exc_type, *exc_info):
+        assert self.writer
+
+        if exc_type:
+            self.writer.cancel()
+            return
+
+        await self.queue.put(STOP)
+        await self.writer
+
+        self.log()
+
+        if self.error:
+            raise self.error
+
+    async def put(self, record: T):
+        """Queue a record, waiting while the queue is full."""
+
+        if self.error:
+            raise self.error
+
+        # Time spent waiting here is back-pressure from the database
+        with metrics.time(f"wait.pipeline.{self.name}"):
+            await self.queue.put(record)
+
+    async def run_writer(self):
+        stopped = False
+
+        while not stopped:
+            batch = [await self.queue.get()]
+
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            if batch[-1] is STOP:
+                batch.pop()
+                stopped = True
+
+            # After a failure, keep draining so producers are not blocked
+            if not batch or self.error:
+                continue
+
+            start = time.monotonic()
+
+            try:
+                with metrics.time(f"db.pipeline.{self.name}"):
+                    await self.write(batch)
+            except Exception as error:
+                self.error = error
+
+            self.write_elapsed += time.monotonic() - start
+
+            # A failed batch is not written, so it's not counted
+            if self.error:
+                continue
+
+            self.records += len(batch)
+            metrics.count("records", len(batch))
+            self.batches += 1
+
+    def log(self):
+        print(
+            f"[{self.name}] {self.records} records written in {self.batches} "
+            f"batches ({self.write_elapsed:.1f}s writing)"
+        )
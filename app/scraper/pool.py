@@ -0,0 +1,57 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
+from app.core import config
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class PagePool:
+    """Run page workers concurrently, up to a maximum number of open pages.
+
+    Workers must not share an `AsyncSession`: they should only fetch and parse,
+    returning the data to be stored by the caller.
+    """
+
+    def __init__(self, name: str, concurrency: int | None = None):
+        self.name = name
+        self.concurrency = concurrency or config.settings.SCRAPER_MAX_CONCURRENCY
+        self.pages = 0
+        self.elapsed = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    async def map(
+        self, items: Iterable[T], worker: Callable[[T], Awaitable[R]]
+    ) -> list[R]:
+        """Run the worker for each item and return the results in the same order."""
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(item: T) -> R:
+            async with semaphore:
+                result = await worker(item)
+                self.pages += 1
+
+                return result
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(run(item) for item in items))
+        self.elapsed += time.monotonic() - start
+
+        self.log()
+
+        return list(results)
+
+    def log(self):
+        """Log the pool throughput."""
+
+        print(
+            f"[{self.name}] {self.pages} pages in {self.elapsed:.1f}s "
+            f"({self.pages_per_second:.2f} pages/s, concurrency {self.concurrency})"
+        )
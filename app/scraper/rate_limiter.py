@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+rate_limiter_log_base_prefix = "[Rate limiter]"
+
+
+class Navigation:
+    """Outcome of a navigation, filled in by the caller."""
+
+    def __init__(self):
+        self.status: int | None = None
+
+
+class HostRate:
+    """Token bucket of a host, refilled at an adaptive rate (pages/s)."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.navigations = 0
+        self.errors = 0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.refilled_at) * self.rate
+        )
+        self.refilled_at = now
+
+
+class RateLimiter:
+    """Pace navigations per host, adapting the rate to the responses (AIMD).
+
+    The rate grows additively while responses are fast and is cut
+    multiplicatively on slow responses, errors or HTTP 5xx/429, always staying
+    between `min_rate` and `max_rate` (the politeness limit).
+    """
+
+    def __init__(
+        self,
+        min_rate: float,
+        max_rate: float,
+        target_latency: float,
+        increase: float = 0.1,
+        slow_decrease: float = 0.8,
+        error_decrease: float = 0.5,
+        burst: float = 1.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.increase = increase
+        self.slow_decrease = slow_decrease
+        self.error_decrease = error_decrease
+        self.burst = burst
+        self.hosts: dict[str, HostRate] = {}
+
+    def get_host_rate(self, url: str) -> HostRate:
+        host = urlsplit(url).netloc
+
+        if host not in self.hosts:
+            initial_rate = min(max(1.0, self.min_rate), self.max_rate)
+            self.hosts[host] = HostRate(initial_rate, self.burst)
+
+        return self.hosts[host]
+
+    def get_rate(self, url: str) -> float:
+        """Get the current rate (pages/s) of the URL's host."""
+
+        return self.get_host_rate(url).rate
+
+    async def acquire(self, url: str):
+        """Wait until a navigation to the URL's host is allowed."""
+
+        host_rate = self.get_host_rate(url)
+
+        async with host_rate.lock:
+            host_rate.refill()
+
+            if host_rate.tokens < 1:
+                with metrics.time("wait.rate_limit"):
+                    await asyncio.sleep((1 - host_rate.tokens) / host_rate.rate)
+
+                host_rate.refill()
+
+            host_rate.tokens -= 1
+
+    def record(
+        self, url: str, latency: float, status: int | None = None, error: bool = False
+    ):
+        """Adapt the rate of the URL's host to a navigation outcome."""
+
+        host_rate = self.get_host_rate(url)
+        host_rate.navigations += 1
+
+        if error or (status and (status >= 500 or status == 429)):
+            host_rate.errors += 1
+            rate = host_rate.rate * self.error_decrease
+        elif latency > self.target_latency:
+            rate = host_rate.rate * self.slow_decrease
+        else:
+            rate = host_rate.rate + self.increase
+
+        host_rate.rate = min(max(rate, self.min_rate), self.max_rate)
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[Navigation]:
+        """Pace a navigation and record its latency and status."""
+
+        await self.acquire(url)
+
+        navigation = Navigation()
+        start = time.monotonic()
+        metrics.count("navigations")
+
+        try:
+            with metrics.time("navigation"):
+                yield navigation
+        except Exception:
+            metrics.count("navigations.errors")
+            self.record(url, time.monotonic() - start, error=True)
+            raise
+
+        self.record(url, time.monotonic() - start, navigation.status)
+
+    def log(self):
+        for host, host_rate in self.hosts.items():
+            print(
+                f"{rate_limiter_log_base_prefix} {host}: {host_rate.rate:.2f} pages/s, "
+                f"{host_rate.navigations} navigations, {host_rate.errors} errors"
+            )
+
+
+rate_limiter = RateLimiter(
+    config.settings.SCRAPER_MIN_RATE,
+    config.settings.SCRAPER_MAX_RATE,
+    config.settings.SCRAPER_TARGET_LATENCY,
+)
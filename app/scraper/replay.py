@@ -0,0 +1,112 @@
+"""
+Re-ingest a scrape run from its page snapshots, without opening a browser.
+
+Usage: python -m app.scraper.replay [run_id]  (defaults to the latest run)
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.session import async_session
+from app.scraper.components import store_components
+from app.scraper.curricula import store_curricula, store_curricula_components
+from app.scraper.department_index import DepartmentIndex
+from app.scraper.departments import store_department_components, store_departments
+from app.scraper.parsers.components import parse_component
+from app.scraper.parsers.curricula import (
+    parse_curricula_list,
+    parse_curriculum,
+    parse_curriculum_components,
+)
+from app.scraper.parsers.departments import (
+    parse_department,
+    parse_department_components,
+)
+from app.scraper.parsers.programs import parse_programs
+from app.scraper.programs import store_programs
+from app.scraper.requisites import RequisiteGraph
+from app.scraper.snapshots import SnapshotStore, snapshot_store
+
+replay_log_base_prefix = "[Replay]"
+
+
+async def replay_snapshots(
+    session: AsyncSession, store: SnapshotStore, run_id: str | None = None
+):
+    """Parse and store every page recorded on a run."""
+
+    run_id = run_id or store.get_latest_run_id()
+
+    if not run_id:
+        raise Exception("No snapshot runs found")
+
+    start = time.monotonic()
+
+    departments = []
+    departments_components = {}
+
+    for [sigaa_id], html in store.iter_pages(run_id, "department"):
+        department = parse_department(html, int(sigaa_id))
+        departments.append(department)
+        departments_components[department.sigaa_id] = parse_department_components(
+            html, department.title
+        )
+
+    departments_ids = await store_departments(session, departments)
+    await store_department_components(
+        session,
+        {
+            departments_ids[sigaa_id]: components
+            for sigaa_id, components in departments_components.items()
+        },
+    )
+
+    department_index = await DepartmentIndex.load(session)
+
+    for _, html in store.iter_pages(run_id, "programs"):
+        await store_programs(session, parse_programs(html), department_index)
+
+    curricula_status: dict[tuple[int, str], bool] = {}
+
+    for [program_sigaa_id], html in store.iter_pages(run_id, "curricula"):
+        for sigaa_id, active in parse_curricula_list(html):
+            curricula_status[(int(program_sigaa_id), sigaa_id)] = active
+
+    curricula = []
+    curricula_components = {}
+
+    for [program_sigaa_id, sigaa_id], html in store.iter_pages(run_id, "curriculum"):
+        active = curricula_status.get((int(program_sigaa_id), sigaa_id), True)
+        curricula.append(parse_curriculum(html, int(program_sigaa_id), active))
+        curricula_components[sigaa_id] = parse_curriculum_components(html)
+
+    await store_curricula(session, curricula)
+
+    components = [
+        parse_component(html) for _, html in store.iter_pages(run_id, "component")
+    ]
+    await store_components(session, components, department_index)
+    await store_curricula_components(session, curricula_components)
+
+    requisites = RequisiteGraph()
+    requisites.add(components)
+    await requisites.store(session)
+
+    elapsed = time.monotonic() - start
+
+    print(f"{replay_log_base_prefix}[{run_id}] replayed in {elapsed:.1f}s")
+
+
+async def main(run_id: str | None = None):
+    if not snapshot_store:
+        raise Exception("Snapshots are disabled (SCRAPER_SNAPSHOTS_DIR is empty)")
+
+    async with async_session() as session:
+        await replay_snapshots(session, snapshot_store, run_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*sys.argv[1:2]))
@@ -0,0 +1,94 @@
+"""
+Serve recorded pages over HTTP, as a local stand-in for SIGAA.
+
+Pages recorded by an `HttpFetcher` (see SCRAPER_HTTP_RECORD_DIR) are served
+by route, so GET and form-post pages are found without SIGAA. Point
+SCRAPER_BASE_URL to the replica (e.g. http://127.0.0.1:8080/sigaa/public) to
+scrape it, for tests and benchmarks.
+
+Usage: python -m app.scraper.replica <pages dir> [port]
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+from app.scraper.http import get_route, get_route_path
+
+replica_log_base_prefix = "[Replica]"
+
+
+class ReplicaRequestHandler(BaseHTTPRequestHandler):
+    server: "ReplicaServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_page(get_route(self.path))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode()
+
+        self.send_page(get_route(self.path, dict(parse_qsl(body))))
+
+    def send_page(self, route: str):
+        route_path = get_route_path(self.server.root, route)
+        self.server.requests += 1
+
+        if not route_path.is_file():
+            self.send_error(404, f"Page not recorded ({route})")
+            return
+
+        content = route_path.read_bytes()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Set-Cookie", "JSESSIONID=replica; Path=/")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class ReplicaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root: str | Path, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), ReplicaRequestHandler)
+        self.root = Path(root)
+        self.requests = 0
+        self.thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "ReplicaServer":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def main(root: str, port: int = 8080):
+    server = ReplicaServer(root, port=port)
+    print(f"{replica_log_base_prefix} Serving {root} at {server.url}")
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], *map(int, sys.argv[2:3]))
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.requisite import replace_requisites
+from app.scraper.metrics import metrics
+from app.scraper.models.component import Component
+
+requisites_fields = ("prerequisites", "corequisites", "equivalences")
+
+
+class RequisiteGraph:
+    """Requisites of the scraped components, stored at once at the end of a crawl.
+
+    Requisites reference components that may not be scraped yet, so they are
+    only stored once every component is. The graph is saved along the job
+    checkpoint, so a resumed job still stores the requisites of the components
+    scraped before it stopped.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.components: dict[str, dict[str, list]] = {}
+
+        if path and path.exists():
+            with open(path) as lines:
+                for line in lines:
+                    record = json.loads(line)
+                    self.components[record.pop("component")] = record
+
+    def add(self, components: list[Component]):
+        """Add the requisites of the components, replacing the previous ones."""
+
+        records = [
+            {
+                "component": component.sigaa_id,
+                **component.dict(include=set(requisites_fields)),
+            }
+            for component in components
+        ]
+
+        for record in records:
+            self.components[record["component"]] = {
+                field: record[field] for field in requisites_fields
+            }
+
+        if self.path and records:
+            with open(self.path, "a") as lines:
+                lines.writelines(json.dumps(record) + "\n" for record in records)
+
+    @metrics.timed("db.store_requisites")
+    async def store(self, session: AsyncSession):
+        """Store the requisites of every component, replacing the previous ones."""
+
+        await replace_requisites(
+            session,
+            {key: value["prerequisites"] for key, value in self.components.items()},
+            {key: value["equivalences"] for key, value in self.components.items()},
+            {key: value["corequisites"] for key, value in self.components.items()},
+        )
+
+        print(
+            f"[Requisites] Stored the requisites of {len(self.components)} components"
+        )
@@ -0,0 +1,70 @@
+import asyncio
+from collections import Counter
+
+from pyppeteer.network_manager import Request
+from pyppeteer.page import Page
+
+from app.core import config
+from app.scraper.metrics import metrics
+
+resources_log_base_prefix = "[Resources]"
+
+
+class ResourceFilter:
+    """Abort requests of resources the scraper doesn't read (images, CSS etc).
+
+    Aborted requests never reach SIGAA, so their size is unknown: only their
+    count is measured, along with the bytes actually transferred (as encoded
+    on the wire, from CDP, so chunked and compressed responses count too).
+    """
+
+    def __init__(self, blocked_types: list[str]):
+        self.blocked_types = set(blocked_types)
+        self.blocked: Counter[str] = Counter()
+        self.allowed = 0
+        self.transferred_bytes = 0
+
+    async def setup(self, page: Page, javascript: bool = True):
+        """Filter the requests of a page, optionally disabling its JavaScript."""
+
+        if not javascript:
+            await page.setJavaScriptEnabled(False)
+
+        # Pages' sessions emit the CDP network events
+        page._client.on("Network.loadingFinished", self.on_loading_finished)
+
+        if not self.blocked_types:
+            return
+
+        await page.setRequestInterception(True)
+
+        # Event handlers are not awaited by pyppeteer
+        page.on(
+            "request", lambda request: asyncio.ensure_future(self.on_request(request))
+        )
+
+    async def on_request(self, request: Request):
+        if request.resourceType in self.blocked_types:
+            self.blocked[request.resourceType] += 1
+            metrics.count("requests.blocked")
+            await request.abort()
+        else:
+            self.allowed += 1
+            await request.continue_()
+
+    def on_loading_finished(self, event: dict):
+        transferred_bytes = int(event.get("encodedDataLength", 0))
+        self.transferred_bytes += transferred_bytes
+        metrics.count("bytes.transferred", transferred_bytes)
+
+    def log(self):
+        blocked = ", ".join(f"{count} {kind}" for kind, count in self.blocked.items())
+
+        print(
+            f"{resources_log_base_prefix} {self.allowed} requests allowed "
+            f"({self.transferred_bytes / 1024:.0f} KiB transferred), "
+            f"{sum(self.blocked.values())} blocked ({blocked or 'none'})"
+        )
+
+
+resource_filter = ResourceFilter(config.settings.SCRAPER_BLOCKED_RESOURCES)
@@ -0,0 +1,108 @@
+"""
+Content-addressed store of the raw pages fetched by the scraper.
+
+Pages are stored gzip-compressed under `objects/`, named by the SHA-256 of
+their content, so identical pages are stored once across runs. Each run has a
+JSON lines manifest under `runs/` mapping the page key (e.g. `department:673`)
+to its URL and content hash, which allows replaying a run without SIGAA.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core import config
+
+
+class SnapshotStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+        self.run_id: str | None = None
+
+    def start_run(self, run_id: str | None = None) -> str:
+        """Start recording the pages of a run, adding to its manifest if it exists."""
+
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+
+        return self.run_id
+
+    def get_object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.html.gz"
+
+    def get_manifest_path(self, run_id: str) -> Path:
+        return self.runs_dir / f"{run_id}.jsonl"
+
+    def put(self, key: str, url: str, html: str) -> str:
+        """Store a page and record it on the current run manifest."""
+
+        content = html.encode()
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self.get_object_path(digest)
+
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes may store the same page at once
+            temporary_path = object_path.with_suffix(f".{os.getpid()}.tmp")
+            temporary_path.write_bytes(gzip.compress(content))
+            temporary_path.replace(object_path)
+
+        if self.run_id:
+            entry = {
+                "key": key,
+                "url": url,
+                "sha256": digest,
+                "size": len(content),
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+            with open(self.get_manifest_path(self.run_id), "a") as manifest:
+                manifest.write(json.dumps(entry) + "\n")
+
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Get the content of a stored page."""
+
+        return gzip.decompress(self.get_object_path(digest).read_bytes()).decode()
+
+    def get_runs_ids(self) -> list[str]:
+        return sorted(path.stem for path in self.runs_dir.glob("*.jsonl"))
+
+    def get_latest_run_id(self) -> str | None:
+        runs_ids = self.get_runs_ids()
+
+        return runs_ids[-1] if runs_ids else None
+
+    def load_manifest(self, run_id: str) -> dict[str, dict]:
+        """Load the manifest of a run, keeping the last entry of each key."""
+
+        manifest: dict[str, dict] = {}
+
+        with open(self.get_manifest_path(run_id)) as lines:
+            for line in lines:
+                entry = json.loads(line)
+                manifest[entry["key"]] = entry
+
+        return manifest
+
+    def iter_pages(self, run_id: str, kind: str) -> Iterator[tuple[list[str], str]]:
+        """Iterate over the (key arguments, html) of the pages of a kind in a run."""
+
+        for key, entry in self.load_manifest(run_id).items():
+            [key_kind, *arguments] = key.split(":")
+
+            if key_kind == kind:
+                yield arguments, self.get(entry["sha256"])
+
+
+snapshot_store: SnapshotStore | None = None
+
+if config.settings.SCRAPER_SNAPSHOTS_DIR:
+    snapshot_store = SnapshotStore(config.settings.SCRAPER_SNAPSHOTS_DIR)
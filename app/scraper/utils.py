@@ -1,23 +1,93 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from pyppeteer.browser import Browser
+from pyppeteer.page import Page
 
 from app.scraper.constants import default_language, graduation_curricula_link
+from app.scraper.http import http_fetcher
+from app.scraper.metrics import metrics
+from app.scraper.pages import page_registry
+from app.scraper.rate_limiter import rate_limiter
+from app.scraper.resources import resource_filter
+from app.scraper.snapshots import snapshot_store
+
+
+async def goto(page: Page, url: str):
+    """Navigate to the URL, paced by the adaptive per-host rate limiter."""
+
+    async with rate_limiter.limit(url) as navigation:
+        response = await page.goto(url)
+        navigation.status = response.status if response else None
+
+    return response
+
+
+async def new_page(browser: Browser, javascript: bool = True) -> Page:
+    """Open a new page, filtering the resources the scraper doesn't read."""
 
+    page = await page_registry.open(browser)
+    await resource_filter.setup(page, javascript)
 
-async def get_page(browser: Browser, url: str):
+    return page
+
+
+async def get_page(browser: Browser, url: str, javascript: bool = True):
     """Get an opened page from the browser, if it doesn't exist, open a new one."""
 
-    pages = await browser.pages()
+    page = page_registry.find(browser, url)
 
-    for page in pages:
-        if page.url == url:
-            return page
+    if page:
+        return page
 
-    page = await browser.newPage()
+    page = await new_page(browser, javascript)
 
-    await page.goto(url)
+    async with page_registry.closing_on_error(page):
+        await goto(page, url)
+
+    page_registry.set_url(page, url)
 
     return page
 
 
+@asynccontextmanager
+async def open_page(
+    browser: Browser, url: str, javascript: bool = True
+) -> AsyncIterator[Page]:
+    """Get a page of the URL, closing it on exit, even on exceptions."""
+
+    page = await get_page(browser, url, javascript)
+
+    async with page_registry.closing(page):
+        yield page
+
+
+async def get_page_html(page: Page, key: str) -> str:
+    """Get the HTML of a page, storing a snapshot of it under the given key."""
+
+    with metrics.time("evaluation.content"):
+        html: str = await page.content()
+
+    metrics.count("pages")
+    metrics.count("bytes.html", len(html.encode()))
+
+    if snapshot_store:
+        snapshot_store.put(key, page.url, html)
+
+    return html
+
+
+async def get_url_html(
+    browser: Browser, url: str, key: str, javascript: bool = True
+) -> str:
+    """Get the HTML of a URL, without opening a page if HTTP fetch is enabled."""
+
+    if http_fetcher:
+        return await http_fetcher.get_html(url, key)
+
+    async with open_page(browser, url, javascript) as page:
+        return await get_page_html(page, key)
+
+
 def get_graduation_program_curricula_link(program_sigaa_id: int) -> str:
     return f"{graduation_curricula_link}?lc={default_language}&id={program_sigaa_id}"
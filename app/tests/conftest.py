@@ -45,8 +45,8 @@ async def session(test_db_setup_sessionmaker) -> AsyncGenerator[AsyncSession, No
     async with async_session() as session:
         yield session
 
-        # delete all data from all tables after test
-        for name, table in Base.metadata.tables.items():
+        # delete all data from all tables after test, referencing tables first
+        for table in reversed(Base.metadata.sorted_tables):
             await session.execute(delete(table))
         await session.commit()
 
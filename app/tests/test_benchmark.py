@@ -0,0 +1,96 @@
+import pytest
+
+from app.core import config
+from app.scraper.benchmark import SyntheticSite, base_path, create_database, get_results
+from app.scraper.components import component_anchor_title
+from app.scraper.http import HttpFetcher
+from app.scraper.parsers.components import parse_component
+from app.scraper.parsers.curricula import (
+    find_curriculum_report_anchor,
+    parse_curricula_list,
+    parse_curriculum,
+    parse_curriculum_components,
+)
+from app.scraper.parsers.departments import (
+    parse_department_components,
+    parse_departments_sigaa_ids,
+)
+from app.scraper.parsers.dom import parse_html
+from app.scraper.parsers.programs import parse_programs
+from app.scraper.replica import ReplicaServer
+
+
+async def test_synthetic_site_is_scrapable(tmp_path):
+    site = SyntheticSite(departments=2, programs=1, curricula=2, components=6)
+    site.generate(tmp_path)
+
+    async def crawl(base_url: str):
+        async with HttpFetcher() as fetcher:
+            search_page = await fetcher.get(
+                f"{base_url}/componentes/busca_componentes.jsf"
+            )
+            assert parse_departments_sigaa_ids(search_page.html) == {100, 101}
+
+            department_page = await fetcher.get(
+                f"{base_url}/departamento/componentes.jsf?id=101"
+            )
+            components = parse_department_components(
+                department_page.html, "DEPARTAMENTO 1"
+            )
+            assert len(components) == 6
+
+            programs_page = await fetcher.get(
+                f"{base_url}/curso/lista.jsf?nivel=G&aba=p-graduacao"
+            )
+            [program, _] = parse_programs(programs_page.html)
+            assert program.department_title == "DEPARTAMENTO 0"
+
+            curricula_page = await fetcher.get(
+                f"{base_url}/curso/curriculo.jsf?id={program.sigaa_id}"
+            )
+            [(sigaa_id, active), _] = parse_curricula_list(curricula_page.html)
+
+            anchor = find_curriculum_report_anchor(curricula_page.html, sigaa_id)
+            report_page = await fetcher.click(curricula_page, anchor)
+
+            curriculum = parse_curriculum(report_page.html, program.sigaa_id, active)
+            assert curriculum.sigaa_id == sigaa_id
+
+            members = parse_curriculum_components(report_page.html)
+            assert [member.type for member in members].count("ELECTIVE") == 3
+
+            component_anchor = parse_html(report_page.html).find(
+                "a", {"title": component_anchor_title}
+            )
+            component_page = await fetcher.click(report_page, component_anchor)
+
+            return members[0].component_sigaa_id, parse_component(component_page.html)
+
+    with ReplicaServer(tmp_path) as server:
+        sigaa_id, component = await crawl(f"{server.url}{base_path}")
+
+    assert component.sigaa_id == sigaa_id
+    assert component.department_title == "DEPARTAMENTO 0"
+
+
+def test_get_results():
+    report = {
+        "elapsed": 10.0,
+        "stages": {},
+        "counters": {"pages": 50, "cdp.calls": 1000, "records": 40, "db.statements": 8},
+    }
+
+    results = get_results(report, 512 * 1024)
+
+    assert results["pages_per_second"] == 5
+    assert results["cdp_calls_per_page"] == 20
+    assert results["db_statements_per_record"] == 0.2
+    assert results["peak_rss_mib"] == 512
+
+
+async def test_create_database_refuses_the_configured_one():
+    with pytest.raises(Exception, match="configured one"):
+        await create_database(config.settings.DEFAULT_DATABASE_DB)
+
+    with pytest.raises(Exception, match="Invalid benchmark database name"):
+        await create_database("benchmark; DROP DATABASE app")
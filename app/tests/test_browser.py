@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from app.core import config
+from app.scraper import browser as browser_module
+from app.scraper.browser import BrowserPool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.handlers = []
+        self.closed = False
+
+    def on(self, event: str, handler):
+        self.handlers.append(handler)
+
+    def open_page(self):
+        for handler in self.handlers:
+            handler(SimpleNamespace(type="page"))
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_browser_pool_retires_browsers_after_max_pages(monkeypatch):
+    launched: list[FakeBrowser] = []
+
+    async def launch_browser(profile: str = "0") -> FakeBrowser:
+        launched.append(FakeBrowser())
+        return launched[-1]
+
+    monkeypatch.setattr(browser_module, "launch_browser", launch_browser)
+    monkeypatch.setattr(config.settings, "SCRAPER_BROWSER_MAX_PAGES", 2)
+
+    async with BrowserPool(size=1) as pool:
+        async with pool.browser() as first:
+            first.open_page()
+            first.open_page()
+
+            # The first browser is full, so it is retired while still leased
+            async with pool.browser() as second:
+                assert second is not first
+                assert pool.retired[0].browser is first
+
+            assert not first.closed
+
+        # Closed on its last release
+        assert first.closed
+        assert not pool.retired
+        assert not second.closed
+
+    assert second.closed
+    assert len(launched) == 2
+
+
+async def test_browser_pools_use_distinct_profiles(monkeypatch):
+    profiles: list[str] = []
+
+    async def launch_browser(profile: str = "0") -> FakeBrowser:
+        profiles.append(profile)
+        return FakeBrowser()
+
+    monkeypatch.setattr(browser_module, "launch_browser", launch_browser)
+
+    async with BrowserPool(size=2), BrowserPool(size=1, profile_prefix="worker-1-"):
+        pass
+
+    assert profiles == ["0", "1", "worker-1-0"]
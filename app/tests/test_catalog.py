@@ -0,0 +1,172 @@
+import json
+import tarfile
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import config
+from app.db.catalog import (
+    add_member,
+    catalog_models,
+    export_catalog,
+    import_catalog,
+    read_catalog_snapshot,
+)
+from app.db.curriculum_component import has_curricula_components
+from app.db.models import (
+    Component,
+    Corequisite,
+    Curriculum,
+    CurriculumComponent,
+    Department,
+    Program,
+)
+from app.initial_data import import_catalog_snapshot
+
+
+async def test_export_and_import_catalog(session: AsyncSession, tmp_path):
+    department = Department(sigaa_id=673, acronym="FGA", title="FACULDADE DO GAMA")
+    session.add(department)
+    await session.flush()
+
+    compilers, data_structures = (
+        Component(
+            sigaa_id=sigaa_id,
+            title=title,
+            type="COURSE",
+            workload=60,
+            department_id=department.id,
+        )
+        for sigaa_id, title in [
+            ("FGA0003", "COMPILADORES 1"),
+            ("FGA0030", "ESTRUTURAS DE DADOS 2"),
+        ]
+    )
+    session.add_all([compilers, data_structures])
+    await session.flush()
+
+    session.add(
+        Corequisite(component_id=compilers.id, corequisite_id=data_structures.id)
+    )
+    await session.commit()
+
+    snapshot_path = tmp_path / "catalog.tar.gz"
+    manifest = await export_catalog(session, snapshot_path)
+
+    assert manifest["tables"]["component"]["rows"] == 2
+    assert manifest["tables"]["corequisite"]["rows"] == 1
+
+    await session.execute(delete(Corequisite))
+    await session.execute(delete(Component))
+    session.add(Department(sigaa_id=518, acronym="FT", title="FACULDADE DE TECNOLOGIA"))
+    await session.commit()
+
+    await import_catalog(session, snapshot_path)
+
+    result = await session.execute(select(Component.sigaa_id, Component.workload))
+    assert sorted(result.tuples().all()) == [("FGA0003", 60), ("FGA0030", 60)]
+
+    result = await session.execute(select(Department.sigaa_id))
+    assert result.scalars().all() == [673]
+
+    # Sequences continue after the imported ids
+    session.add(Department(sigaa_id=518, acronym="FT", title="FACULDADE DE TECNOLOGIA"))
+    await session.commit()
+
+    # Imported rows reference each other, so they're removed children first
+    for model in reversed(catalog_models):
+        await session.execute(delete(model))
+    await session.commit()
+
+
+async def test_import_catalog_snapshot_on_startup(
+    session: AsyncSession, tmp_path, monkeypatch, capsys
+):
+    department = Department(sigaa_id=673, acronym="FGA", title="FACULDADE DO GAMA")
+    session.add(department)
+    await session.flush()
+
+    program = Program(
+        sigaa_id=414924,
+        title="ENGENHARIA DE SOFTWARE",
+        degree="BACHELOR",
+        shift="DAY",
+        department_id=department.id,
+    )
+    component = Component(
+        sigaa_id="FGA0003",
+        title="COMPILADORES 1",
+        type="COURSE",
+        workload=60,
+        department_id=department.id,
+    )
+    session.add_all([program, component])
+    await session.flush()
+
+    workloads = dict.fromkeys(
+        [
+            "min_period_workload",
+            "max_period_workload",
+            "min_workload",
+            "mandatory_components_workload",
+            "min_elective_components_workload",
+            "max_elective_components_workload",
+            "min_complementary_components_workload",
+            "max_complementary_components_workload",
+        ],
+        0,
+    )
+    curriculum = Curriculum(
+        sigaa_id="6360/2",
+        active=True,
+        start_year=2017,
+        start_period=1,
+        min_periods=8,
+        max_periods=16,
+        program_id=program.id,
+        **workloads,
+    )
+    session.add(curriculum)
+    await session.flush()
+
+    session.add(
+        CurriculumComponent(
+            type="MANDATORY",
+            period=5,
+            percentage_prerequisite=0,
+            curriculum_id=curriculum.id,
+            component_id=component.id,
+        )
+    )
+    await session.commit()
+
+    snapshot_path = tmp_path / "catalog.tar.gz"
+    await export_catalog(session, snapshot_path)
+
+    for model in reversed(catalog_models):
+        await session.execute(delete(model))
+    await session.commit()
+
+    monkeypatch.setattr(config.settings, "CATALOG_SNAPSHOT_PATH", str(snapshot_path))
+
+    await import_catalog_snapshot(session)
+    assert "Catalog imported (5 rows)" in capsys.readouterr().out
+
+    assert await has_curricula_components(session)
+    result = await session.execute(select(Curriculum.sigaa_id))
+    assert result.scalars().all() == ["6360/2"]
+
+    # A loaded catalog is not replaced
+    await import_catalog_snapshot(session)
+    assert "Catalog already loaded" in capsys.readouterr().out
+
+
+def test_read_catalog_snapshot_checks_version(tmp_path):
+    snapshot_path = tmp_path / "catalog.tar.gz"
+
+    with tarfile.open(snapshot_path, "w:gz") as archive:
+        add_member(archive, "manifest.json", json.dumps({"version": 0}).encode())
+
+    with pytest.raises(Exception, match="version"):
+        read_catalog_snapshot(snapshot_path)
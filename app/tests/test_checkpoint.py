@@ -0,0 +1,40 @@
+from app.scraper.checkpoint import Checkpoint
+
+
+async def fail():
+    raise Exception("Unexpected page")
+
+
+def test_checkpoint_resumes_done_units(tmp_path):
+    path = tmp_path / "job.jsonl"
+
+    checkpoint = Checkpoint("job", path)
+    checkpoint.mark_done("department", [673, 674])
+
+    resumed = Checkpoint("job", path)
+
+    assert resumed.is_done("department", "673")
+    assert resumed.pending("department", [673, 674, 675]) == [675]
+    assert not resumed.finished
+
+    resumed.finish()
+
+    assert Checkpoint("job", path).finished
+
+
+async def test_checkpoint_quarantines_failed_units(tmp_path):
+    path = tmp_path / "job.jsonl"
+
+    checkpoint = Checkpoint("job", path, max_attempts=2)
+    result = await checkpoint.run("component", "FGA0003", fail)
+
+    assert result is None
+    assert checkpoint.pending("component", ["FGA0003"]) == ["FGA0003"]
+
+    resumed = Checkpoint("job", path, max_attempts=2)
+    await resumed.run("component", "FGA0003", fail)
+
+    assert resumed.pending("component", ["FGA0003"]) == []
+    assert (
+        Checkpoint("job", path, max_attempts=2).pending("component", ["FGA0003"]) == []
+    )
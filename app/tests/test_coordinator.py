@@ -0,0 +1,24 @@
+import asyncio
+from queue import Queue
+
+from app.scraper.coordinator import get_shards, put_result
+
+
+def test_get_shards_splits_programs_round_robin():
+    assert get_shards([1, 2, 3, 4, 5], 2) == [[1, 3, 5], [2, 4]]
+    assert get_shards([1, 2], 4) == [[1], [2]]
+
+
+async def test_put_result_waits_for_room_off_the_loop():
+    results: Queue = Queue(maxsize=1)
+    results.put(("program", 1, True))
+
+    put = asyncio.create_task(put_result(results, ("program", 2, True)))
+
+    # The loop keeps running while the queue is full
+    await asyncio.sleep(0.05)
+    assert not put.done()
+
+    assert results.get() == ("program", 1, True)
+    await asyncio.wait_for(put, 1)
+    assert results.get() == ("program", 2, True)
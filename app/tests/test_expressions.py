@@ -0,0 +1,41 @@
+import pytest
+
+from app.scraper.parsers.expressions import parse_expression
+
+
+def test_parse_expression():
+    assert parse_expression("( MAT0025 E FIS0070 ) OU MAT0026") == (
+        ("FIS0070", "MAT0025"),
+        ("MAT0026",),
+    )
+
+    # "E" binds tighter than "OU"
+    assert parse_expression("MAT0025 E FIS0070 OU MAT0026") == (
+        ("FIS0070", "MAT0025"),
+        ("MAT0026",),
+    )
+
+    assert parse_expression("( MAT0025 OU MAT0026 ) E ( FIS0070 OU FIS0071 )") == (
+        ("FIS0070", "MAT0025"),
+        ("FIS0070", "MAT0026"),
+        ("FIS0071", "MAT0025"),
+        ("FIS0071", "MAT0026"),
+    )
+
+
+def test_parse_expression_simplifies_options():
+    assert parse_expression("(( MAT0025 )) OU ( MAT0025 E FIS0070 )") == (("MAT0025",),)
+    assert parse_expression("MAT0025 OU MAT0025") == (("MAT0025",),)
+
+
+def test_parse_empty_expression():
+    assert parse_expression("") == ()
+    assert parse_expression(" - ") == ()
+
+
+@pytest.mark.parametrize(
+    "expression", ["( MAT0025 E FIS0070", "MAT0025 OU", "MAT0025 FIS0070", "CÁLCULO 1"]
+)
+def test_parse_invalid_expression(expression):
+    with pytest.raises(Exception):
+        parse_expression(expression)
@@ -0,0 +1,26 @@
+from app.scraper.frontier import ComponentFrontier
+from app.scraper.models.curriculum_component import CurriculumComponent
+
+
+def get_members(*components_sigaa_ids: str) -> list[CurriculumComponent]:
+    return [
+        CurriculumComponent(component_sigaa_id=sigaa_id, type="MANDATORY")
+        for sigaa_id in components_sigaa_ids
+    ]
+
+
+def test_frontier_scrapes_shared_components_once(tmp_path):
+    path = tmp_path / "job.frontier.jsonl"
+
+    frontier = ComponentFrontier(path)
+    frontier.add(414924, "6360/1", get_members("MAT0025", "FGA0003", "FGA0030"))
+    frontier.add(414924, "6360/2", get_members("MAT0025", "FGA0003"))
+    frontier.add(418010, "6600/1", get_members("MAT0025", "IFD0171"))
+
+    assert frontier.components_sigaa_ids == ["FGA0003", "FGA0030", "IFD0171", "MAT0025"]
+    assert frontier.plan(frontier.components_sigaa_ids) == [
+        ((414924, "6360/1"), ["FGA0003", "FGA0030", "MAT0025"]),
+        ((418010, "6600/1"), ["IFD0171"]),
+    ]
+
+    assert ComponentFrontier(path).curricula == frontier.curricula
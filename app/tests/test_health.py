@@ -0,0 +1,75 @@
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import (
+    Component,
+    Curriculum,
+    CurriculumComponent,
+    Department,
+    Program,
+)
+from app.main import app
+
+
+async def test_read_liveness(client: AsyncClient):
+    response = await client.get(app.url_path_for("read_liveness"))
+    assert response.status_code == 200
+
+
+async def test_read_readiness(client: AsyncClient, session: AsyncSession):
+    response = await client.get(app.url_path_for("read_readiness"))
+    assert response.status_code == 503
+
+    department = Department(sigaa_id=673, acronym="FGA", title="FACULDADE DO GAMA")
+    session.add(department)
+    await session.flush()
+
+    program = Program(
+        sigaa_id=414924,
+        title="ENGENHARIA DE SOFTWARE",
+        degree="BACHELOR",
+        shift="DAY",
+        department_id=department.id,
+    )
+    component = Component(
+        sigaa_id="FGA0003",
+        title="COMPILADORES 1",
+        type="COURSE",
+        department_id=department.id,
+    )
+    session.add_all([program, component])
+    await session.flush()
+
+    curriculum = Curriculum(
+        sigaa_id="6360/1",
+        active=True,
+        start_year=2017,
+        start_period=1,
+        min_periods=8,
+        max_periods=16,
+        min_period_workload=210,
+        max_period_workload=480,
+        min_workload=3480,
+        mandatory_components_workload=2760,
+        min_elective_components_workload=480,
+        max_elective_components_workload=480,
+        min_complementary_components_workload=240,
+        max_complementary_components_workload=240,
+        program_id=program.id,
+    )
+    session.add(curriculum)
+    await session.flush()
+
+    session.add(
+        CurriculumComponent(
+            type="MANDATORY",
+            period=1,
+            percentage_prerequisite=0,
+            curriculum_id=curriculum.id,
+            component_id=component.id,
+        )
+    )
+    await session.commit()
+
+    response = await client.get(app.url_path_for("read_readiness"))
+    assert response.status_code == 200
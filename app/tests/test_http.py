@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.scraper.http import HttpFetcher, get_route, get_route_path
+from app.scraper.parsers.curricula import find_curriculum_report_anchor
+from app.scraper.replica import ReplicaServer
+
+curricula_list_path = "sigaa/public/curso/curriculo.jsf"
+
+curricula_list_html = """
+<form id="formCurriculosCurso" action="/sigaa/public/curso/curriculo.jsf">
+    <input type="hidden" name="formCurriculosCurso" value="formCurriculosCurso">
+    <input type="hidden" name="javax.faces.ViewState" value="j_id3">
+    <table id="table_lt">
+        <tr class="linha_par">
+            <td>Detalhes da Estrutura Curricular 6360/1, Criado em 2017</td>
+            <td>Ativa</td>
+            <td>
+                <a title="Relatório da Estrutura Curricular" href="#" onclick="if(typeof
+                jsfcljs == 'function'){jsfcljs(document.getElementById(
+                'formCurriculosCurso'),{'formCurriculosCurso:j_id_jsp_1':
+                'formCurriculosCurso:j_id_jsp_1','id':'1074'},'');}return false">
+                </a>
+            </td>
+        </tr>
+    </table>
+</form>
+"""
+
+curriculum_html = "<h3>Estrutura Curricular 6360/1</h3>"
+
+
+async def test_http_fetcher_submits_command_links(tmp_path):
+    curricula_list_url = f"/{curricula_list_path}?id=414924"
+    report_fields = {
+        "formCurriculosCurso": "formCurriculosCurso",
+        "formCurriculosCurso:j_id_jsp_1": "formCurriculosCurso:j_id_jsp_1",
+        "id": "1074",
+    }
+
+    for route, html in [
+        (get_route(curricula_list_url), curricula_list_html),
+        (get_route(f"/{curricula_list_path}", report_fields), curriculum_html),
+    ]:
+        route_path = get_route_path(tmp_path / "pages", route)
+        route_path.parent.mkdir(parents=True, exist_ok=True)
+        route_path.write_text(html)
+
+    fetcher = HttpFetcher(record_dir=tmp_path / "recorded")
+
+    async def crawl(base_url: str) -> str:
+        async with fetcher:
+            curricula_page = await fetcher.get(f"{base_url}{curricula_list_url}")
+
+            anchor = find_curriculum_report_anchor(curricula_page.html, "6360/1")
+            report_page = await fetcher.click(curricula_page, anchor)
+
+            assert fetcher.client
+            assert fetcher.client.cookies.get("JSESSIONID") == "replica"
+
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetcher.get(f"{base_url}/sigaa/public/missing.jsf")
+
+            return report_page.html
+
+    with ReplicaServer(tmp_path / "pages") as server:
+        assert await crawl(server.url) == curriculum_html
+
+        # Each run gets its own client, even in another event loop
+        run = asyncio.to_thread(asyncio.run, crawl(server.url))
+        assert await run == curriculum_html
+
+    # Pages are recorded by route, so they can be served by a replica
+    recorded = sorted(path.name for path in (tmp_path / "recorded").rglob("*.html"))
+    assert len(recorded) == 2
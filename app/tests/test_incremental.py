@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from app.db.models import PageFingerprint
+from app.scraper.incremental import ChangeDetector
+from app.scraper.parsers.utils import get_content_fingerprint
+
+
+def test_content_fingerprint_ignores_page_chrome():
+    html = '<div id="conteudo">{}</div><div id="rodape">{}</div>'
+
+    assert get_content_fingerprint(html.format("6360/1", "sigaa01")) == (
+        get_content_fingerprint(html.format("6360/1", "sigaa07"))
+    )
+    assert get_content_fingerprint(html.format("6360/1", "")) != (
+        get_content_fingerprint(html.format("6360/2", ""))
+    )
+
+
+def test_change_detector_skips_unchanged_and_prioritizes():
+    now = datetime.utcnow()
+    fingerprints = {
+        "component:A": PageFingerprint(
+            key="component:A",
+            content_hash="a",
+            checks=10,
+            changes=1,
+            checked_at=now - timedelta(days=1),
+            changed_at=now,
+        ),
+        "component:B": PageFingerprint(
+            key="component:B",
+            content_hash="b",
+            checks=10,
+            changes=9,
+            checked_at=now - timedelta(days=1),
+            changed_at=now,
+        ),
+    }
+    detector = ChangeDetector(fingerprints, incremental=True)
+
+    keys = ["component:A", "component:B", "component:C"]
+    assert detector.prioritize(keys) == ["component:C", "component:B", "component:A"]
+    assert detector.prioritize(keys, max_pages=1) == ["component:C"]
+
+    assert not detector.has_changed("component:A", "a")
+    assert detector.has_changed("component:B", "changed")
+    assert detector.has_changed("component:C", "c")
+    assert detector.skipped == 1
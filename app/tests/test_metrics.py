@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import pytest
+
+from app.scraper.metrics import Metrics, get_percentile
+
+
+def test_get_percentile():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert get_percentile(samples, 50) == 51.0
+    assert get_percentile(samples, 95) == 95.0
+    assert get_percentile([], 95) == 0.0
+
+
+async def test_metrics_times_stages_even_on_errors():
+    metrics = Metrics()
+
+    @metrics.timed("parse")
+    def parse(html: str) -> str:
+        return html.upper()
+
+    @metrics.timed("navigation")
+    async def navigate():
+        await asyncio.sleep(0)
+        raise Exception("timeout")
+
+    assert parse("a") == "A"
+
+    with pytest.raises(Exception):
+        await navigate()
+
+    metrics.count("pages", 2)
+
+    report = metrics.report()
+    assert report["stages"]["parse"]["count"] == 1
+    assert report["stages"]["navigation"]["count"] == 1
+    assert report["counters"] == {"pages": 2}
+
+
+def test_metrics_merge_and_save(tmp_path):
+    worker_metrics = Metrics()
+
+    with worker_metrics.time("navigation"):
+        worker_metrics.count("pages")
+
+    metrics = Metrics()
+    metrics.count("pages")
+    metrics.merge(worker_metrics.export())
+    metrics.save(tmp_path / "report.json")
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["stages"]["navigation"]["count"] == 1
+    assert report["counters"]["pages"] == 2
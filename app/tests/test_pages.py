@@ -0,0 +1,56 @@
+import asyncio
+
+from pyee import EventEmitter
+
+from app.scraper.pages import PageRegistry
+
+
+class FakePage(EventEmitter):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    def isClosed(self) -> bool:
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+        self.emit("close")
+
+
+class FakeBrowser:
+    async def newPage(self) -> FakePage:
+        return FakePage()
+
+
+async def test_page_registry_caps_open_pages_and_finds_by_url():
+    browser = FakeBrowser()
+    registry = PageRegistry(max_open_pages=2, long_lived_seconds=60)
+
+    async def crawl():
+        async with registry:
+            first = await registry.open(browser)
+            registry.set_url(first, "https://sigaa.unb.br/a")
+            second = await registry.open(browser)
+
+            assert registry.find(browser, "https://sigaa.unb.br/a") is first
+
+            third = asyncio.ensure_future(registry.open(browser))
+            await asyncio.sleep(0)
+            assert not third.done()
+
+            async with registry.closing(first):
+                pass
+
+            await third
+
+            assert registry.find(browser, "https://sigaa.unb.br/a") is None
+            assert len(registry.pages) == 2
+
+        assert second.isClosed()
+        assert registry.pages == {}
+
+    await crawl()
+
+    # The registry can be entered again by another run, in its own event loop
+    await asyncio.to_thread(asyncio.run, crawl())
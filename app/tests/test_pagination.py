@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.db.models import Department
+from app.main import app
+
+
+def test_cursor():
+    assert decode_cursor(encode_cursor(4242)) == 4242
+
+    for cursor in ["", "not a cursor", encode_cursor("4242")]:  # type: ignore
+        with pytest.raises(HTTPException):
+            decode_cursor(cursor)
+
+
+async def test_read_departments_by_cursor(client: AsyncClient, session: AsyncSession):
+    session.add_all(
+        Department(sigaa_id=sigaa_id, acronym=f"D{sigaa_id}", title=f"D {sigaa_id}")
+        for sigaa_id in range(1, 6)
+    )
+    await session.commit()
+
+    url = app.url_path_for("read_departments")
+    sigaa_ids = []
+    pages = 0
+
+    response = await client.get(url, params={"limit": 2})
+
+    while True:
+        assert response.status_code == 200
+        sigaa_ids.extend(department["sigaa_id"] for department in response.json())
+        pages += 1
+
+        if "Link" not in response.headers:
+            break
+
+        next_url = response.headers["Link"].split(";")[0].strip("<>")
+        assert response.headers["X-Next-Cursor"] in next_url
+
+        response = await client.get(next_url)
+
+    assert sigaa_ids == [1, 2, 3, 4, 5]
+    assert pages == 3
+
+    # skip/limit still works
+    response = await client.get(url, params={"skip": 3, "limit": 10})
+    assert [department["sigaa_id"] for department in response.json()] == [4, 5]
+    assert "Link" not in response.headers
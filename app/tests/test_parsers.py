@@ -0,0 +1,191 @@
+from app.scraper.parsers.components import parse_component
+from app.scraper.parsers.curricula import (
+    parse_curricula_list,
+    parse_curriculum,
+    parse_curriculum_components,
+)
+from app.scraper.parsers.departments import (
+    parse_department,
+    parse_department_components,
+    parse_departments_sigaa_ids,
+)
+from app.scraper.parsers.programs import parse_programs
+
+components_search_html = """
+<select id="form:unidades">
+    <option value="0">-- SELECIONE --</option>
+    <option value="673">FGA</option>
+    <option value="518">FT</option>
+</select>
+"""
+
+department_html = """
+<div id="colDirTop">
+    <h1> FGA </h1>
+    <h2>FACULDADE DO GAMA</h2>
+</div>
+<table class="listagem">
+    <tr><th>Código</th><th>Nome</th><th>Tipo</th><th>CH Total</th></tr>
+    <tr class="linhaPar">
+        <td>FGA0003</td><td>COMPILADORES 1</td><td>DISCIPLINA</td><td>60h</td>
+    </tr>
+    <tr class="linhaImpar">
+        <td>FGA0250</td><td>ESTÁGIO SUPERVISIONADO</td><td>ATIVIDADE</td><td>-</td>
+    </tr>
+    <tr class="linhaPar">
+        <td>FGA0900</td><td>MÓDULO INTEGRADOR</td><td>MÓDULO</td><td>30h</td>
+    </tr>
+</table>
+"""
+
+programs_html = """
+<table class="listagem">
+    <tr><td colspan="3">FGA - FACULDADE DO GAMA</td></tr>
+    <tr class="linhaPar">
+        <td><a href="/sigaa/public/curso/portal.jsf?lc=pt_BR&amp;id=414924">
+            ENGENHARIA DE SOFTWARE</a></td>
+        <td>Bacharel</td>
+        <td>Diurno</td>
+    </tr>
+    <tr class="linhaImpar">
+        <td><a href="/sigaa/public/curso/portal.jsf?id=414925">ENGENHARIA</a></td>
+        <td>Tecnólogo</td>
+        <td>Noturno</td>
+    </tr>
+</table>
+"""
+
+curricula_list_html = """
+<table id="table_lt">
+    <tr class="linha_par">
+        <td>Detalhes da Estrutura Curricular 6360/1, Criado em 2017</td>
+        <td>Ativa</td>
+    </tr>
+    <tr class="linha_impar">
+        <td>Detalhes da Estrutura Curricular 6360/-2, Criado em 2011</td>
+        <td>Inativa</td>
+    </tr>
+</table>
+"""
+
+curriculum_html = """
+<table>
+    <tr><th>Código:</th><td>6360/1</td></tr>
+    <tr><th>Período Letivo de Entrada em Vigor:</th><td>2017.1</td></tr>
+    <tr><th>Mínimo:</th><td>8</td><th>Máximo:</th><td>16</td></tr>
+    <tr><th>Carga Horária Mínima por Período Letivo:</th><td>210h</td></tr>
+    <tr><th>Carga Horária Máxima por Período Letivo:</th><td>480h</td></tr>
+    <tr><th>Total Mínima:</th><td>3480h</td></tr>
+    <tr><th>Total:</th><td>2760h</td></tr>
+    <tr><th>Carga Horária Optativa Mínima:</th><td>480h</td></tr>
+    <tr><th>Carga Horária Complementar Mínima:</th><td>240h</td></tr>
+    <tr><th>Carga Horária Máxima de Componentes Eletivos:</th><td>240h</td></tr>
+</table>
+<table>
+    <tr><td>1º Período</td></tr>
+    <tr class="componentes"><td>FGA0161 - ENGENHARIA E AMBIENTE</td></tr>
+    <tr class="componentes"><td>FGA0158 - ORIENTACAO A OBJETOS</td></tr>
+    <tr><td>2º Período</td></tr>
+    <tr class="componentes"><td>FGA0124 - PROJETO DE ALGORITMOS</td></tr>
+</table>
+<table>
+    <tr><td>Optativas</td></tr>
+    <tr class="componentes"><td>FGA0003 - COMPILADORES 1</td></tr>
+    <tr class="componentes"><td>FGA0030 - ESTRUTURAS DE DADOS 2</td></tr>
+</table>
+"""
+
+component_html = """
+<table class="visualizacao">
+    <tr><th>Tipo do Componente Curricular:</th><td>DISCIPLINA</td></tr>
+    <tr><th>Unidade Responsável:</th><td>FACULDADE DO GAMA - FGA</td></tr>
+    <tr><th>Código:</th><td>FGA0003</td></tr>
+    <tr><th>Nome:</th><td>COMPILADORES 1</td></tr>
+    <tr><th>Pré-Requisitos:</th><td>( FGA0030 E FGA0124 ) OU FGA0085</td></tr>
+    <tr><th>Co-Requisitos:</th><td>-</td></tr>
+    <tr><th>Equivalências:</th><td>( ENE0042 )</td></tr>
+</table>
+"""
+
+
+def test_parse_departments():
+    assert parse_departments_sigaa_ids(components_search_html) == {673, 518}
+
+    department = parse_department(department_html, 673)
+    assert department.acronym == "FGA"
+    assert department.title == "FACULDADE DO GAMA"
+
+    [compilers, internship] = parse_department_components(
+        department_html, department.title
+    )
+    assert (compilers.sigaa_id, compilers.title) == ("FGA0003", "COMPILADORES 1")
+    assert (compilers.type, compilers.workload) == ("COURSE", 60)
+    assert compilers.department_title == "FACULDADE DO GAMA"
+    assert (internship.type, internship.workload) == ("ACTIVITY", None)
+
+
+def test_parse_programs():
+    [software, engineering] = parse_programs(programs_html)
+
+    assert software.sigaa_id == 414924
+    assert software.title == "ENGENHARIA DE SOFTWARE"
+    assert software.degree == "BACHELOR"
+    assert software.shift == "DAY"
+    assert software.department_acronym == "FGA"
+    assert software.department_title == "FACULDADE DO GAMA"
+
+    assert engineering.degree is None
+    assert engineering.shift == "NIGHT"
+
+
+def test_parse_curricula():
+    assert parse_curricula_list(curricula_list_html) == [
+        ("6360/1", True),
+        ("6360/-2", False),
+    ]
+
+    curriculum = parse_curriculum(curriculum_html, 414924, True)
+    assert curriculum.sigaa_id == "6360/1"
+    assert (curriculum.start_year, curriculum.start_period) == (2017, 1)
+    assert (curriculum.min_periods, curriculum.max_periods) == (8, 16)
+    assert curriculum.min_workload == 3480
+    assert curriculum.mandatory_components_workload == 2760
+    assert curriculum.max_elective_components_workload == 480
+
+    assert [
+        (member.component_sigaa_id, member.type, member.period)
+        for member in parse_curriculum_components(curriculum_html)
+    ] == [
+        ("FGA0161", "MANDATORY", 1),
+        ("FGA0158", "MANDATORY", 1),
+        ("FGA0124", "MANDATORY", 2),
+        ("FGA0003", "ELECTIVE", None),
+        ("FGA0030", "ELECTIVE", None),
+    ]
+
+
+def test_parse_component():
+    component = parse_component(component_html)
+
+    assert component.sigaa_id == "FGA0003"
+    assert component.title == "COMPILADORES 1"
+    assert component.prerequisites == [["FGA0030", "FGA0124"], ["FGA0085"]]
+    assert component.corequisites == []
+    assert component.equivalences == [["ENE0042"]]
+    assert component.type == "COURSE"
+    assert component.department_title == "FACULDADE DO GAMA"
+
+
+def test_parse_component_corequisites():
+    def with_corequisites(expression: str) -> str:
+        return component_html.replace(
+            "<th>Co-Requisitos:</th><td>-</td>",
+            f"<th>Co-Requisitos:</th><td>{expression}</td>",
+        )
+
+    component = parse_component(with_corequisites("( FGA0030 E FGA0124 )"))
+    assert component.corequisites == ["FGA0030", "FGA0124"]
+
+    # Alternatives can't be stored as pairs, so they're left out
+    component = parse_component(with_corequisites("( FGA0030 OU FGA0124 )"))
+    assert component.corequisites == []
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from app.scraper.pipeline import WritePipeline
+
+
+async def test_write_pipeline_writes_in_batches():
+    batches: list[list[int]] = []
+
+    async def write(records: list[int]):
+        await asyncio.sleep(0.01)
+        batches.append(records)
+
+    async with WritePipeline("Test", write, batch_size=3, max_size=2) as pipeline:
+        for record in range(10):
+            await pipeline.put(record)
+
+    assert [record for batch in batches for record in batch] == list(range(10))
+    assert all(len(batch) <= 3 for batch in batches)
+
+
+async def test_write_pipeline_raises_writer_errors():
+    async def write(records: list[int]):
+        raise Exception("Database is down")
+
+    with pytest.raises(Exception, match="Database is down"):
+        async with WritePipeline("Test", write, batch_size=2, max_size=1) as pipeline:
+            for record in range(10):
+                await pipeline.put(record)
+
+    # Failed batches are not counted as written
+    assert (pipeline.records, pipeline.batches) == (0, 0)
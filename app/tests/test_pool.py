@@ -0,0 +1,44 @@
+import asyncio
+
+from app.scraper.pool import PagePool
+
+
+async def test_map_caps_concurrency_and_keeps_order():
+    pool = PagePool("Test", concurrency=2)
+    running = 0
+    max_running = 0
+
+    async def worker(item: int) -> int:
+        nonlocal running, max_running
+
+        running += 1
+        max_running = max(max_running, running)
+
+        # Later items finish first
+        await asyncio.sleep(0.01 * (5 - item))
+        running -= 1
+
+        return item * 10
+
+    assert await pool.map(range(5), worker) == [0, 10, 20, 30, 40]
+    assert max_running == 2
+
+
+async def test_map_counts_pages_per_second():
+    pool = PagePool("Test", concurrency=4)
+
+    async def worker(item: int) -> int:
+        await asyncio.sleep(0.01)
+
+        return item
+
+    await pool.map(range(4), worker)
+    await pool.map(range(2), worker)
+
+    assert pool.pages == 6
+    assert pool.elapsed > 0
+    assert pool.pages_per_second == pool.pages / pool.elapsed
+
+
+def test_pages_per_second_without_pages():
+    assert PagePool("Test", concurrency=1).pages_per_second == 0.0
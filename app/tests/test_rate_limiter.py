@@ -0,0 +1,34 @@
+import pytest
+
+from app.scraper.rate_limiter import RateLimiter
+
+url = "https://sigaa.unb.br/sigaa/public/departamento/componentes.jsf"
+
+
+def test_rate_limiter_adapts_to_responses():
+    rate_limiter = RateLimiter(min_rate=0.5, max_rate=2.0, target_latency=1.0)
+
+    for _ in range(20):
+        rate_limiter.record(url, latency=0.1, status=200)
+
+    assert rate_limiter.get_rate(url) == 2.0
+
+    rate_limiter.record(url, latency=3.0, status=200)
+    assert rate_limiter.get_rate(url) == pytest.approx(1.6)
+
+    rate_limiter.record(url, latency=0.1, status=503)
+    assert rate_limiter.get_rate(url) == pytest.approx(0.8)
+
+    rate_limiter.record(url, latency=0.1, error=True)
+    assert rate_limiter.get_rate(url) == 0.5
+
+
+async def test_rate_limiter_backs_off_on_failed_navigations():
+    rate_limiter = RateLimiter(min_rate=0.1, max_rate=100.0, target_latency=1.0)
+
+    with pytest.raises(Exception, match="Navigation timeout"):
+        async with rate_limiter.limit(url):
+            raise Exception("Navigation timeout")
+
+    assert rate_limiter.get_rate(url) == 0.5
+    assert rate_limiter.hosts["sigaa.unb.br"].errors == 1
@@ -0,0 +1,48 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import (
+    Component,
+    Department,
+    PrerequisiteComponent,
+    PrerequisiteOption,
+)
+from app.db.requisite import replace_requisites
+
+
+async def test_replace_requisites_leaves_out_incomplete_options(
+    session: AsyncSession,
+):
+    department = Department(sigaa_id=673, acronym="FGA", title="FACULDADE DO GAMA")
+    session.add(department)
+    await session.flush()
+
+    session.add_all(
+        Component(
+            sigaa_id=sigaa_id,
+            title=sigaa_id,
+            type="COURSE",
+            workload=60,
+            department_id=department.id,
+        )
+        for sigaa_id in ["FGA0003", "FGA0030", "FGA0124"]
+    )
+    await session.commit()
+
+    # FGA0085 is not stored, so neither is the option it's in
+    await replace_requisites(
+        session,
+        {"FGA0003": [["FGA0030", "FGA0085"], ["FGA0124"], ["FGA0085"]]},
+        {},
+        {},
+    )
+
+    result = await session.execute(select(PrerequisiteOption.id))
+    [option_id] = result.scalars().all()
+
+    result = await session.execute(
+        select(PrerequisiteComponent.prerequisite_option_id, Component.sigaa_id).join(
+            Component, Component.id == PrerequisiteComponent.component_id
+        )
+    )
+    assert result.tuples().all() == [(option_id, "FGA0124")]
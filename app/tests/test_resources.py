@@ -0,0 +1,38 @@
+from app.scraper.resources import ResourceFilter
+
+
+class FakeRequest:
+    def __init__(self, resource_type: str):
+        self.resourceType = resource_type
+        self.outcome: str | None = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+async def test_resource_filter_aborts_blocked_types():
+    resource_filter = ResourceFilter(["image", "stylesheet"])
+    requests = [FakeRequest(kind) for kind in ["document", "image", "stylesheet"]]
+
+    for request in requests:
+        await resource_filter.on_request(request)
+
+    assert [request.outcome for request in requests] == [
+        "continued",
+        "aborted",
+        "aborted",
+    ]
+    assert resource_filter.allowed == 1
+    assert sum(resource_filter.blocked.values()) == 2
+
+
+def test_resource_filter_measures_transferred_bytes():
+    resource_filter = ResourceFilter([])
+
+    resource_filter.on_loading_finished({"requestId": "1", "encodedDataLength": 2048})
+    resource_filter.on_loading_finished({"requestId": "2", "encodedDataLength": 512})
+
+    assert resource_filter.transferred_bytes == 2560
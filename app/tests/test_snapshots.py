@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from app.scraper.snapshots import SnapshotStore
+
+
+def test_snapshot_store_deduplicates_content(tmp_path: Path):
+    store = SnapshotStore(tmp_path)
+    run_id = store.start_run("run-1")
+
+    digest = store.put("department:673", "https://example.com/?id=673", "<h1>FGA</h1>")
+    same_digest = store.put(
+        "department:518", "https://example.com/?id=518", "<h1>FGA</h1>"
+    )
+
+    assert digest == same_digest
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 1
+    assert store.get(digest) == "<h1>FGA</h1>"
+
+    assert store.get_latest_run_id() == run_id
+    assert list(store.load_manifest(run_id)) == ["department:673", "department:518"]
+    assert [args for args, _ in store.iter_pages(run_id, "department")] == [
+        ["673"],
+        ["518"],
+    ]
+
+
+def test_snapshot_store_resumes_run(tmp_path: Path):
+    store = SnapshotStore(tmp_path)
+
+    store.start_run("job-1")
+    store.put("programs", "https://example.com/programs", "<h1>Programs</h1>")
+
+    # A resumed job records its remaining pages on the same run
+    store = SnapshotStore(tmp_path)
+    store.start_run("job-1")
+    store.put("department:673", "https://example.com/?id=673", "<h1>FGA</h1>")
+
+    assert store.get_runs_ids() == ["job-1"]
+    assert list(store.load_manifest("job-1")) == ["programs", "department:673"]
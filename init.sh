@@ -5,3 +5,6 @@ alembic upgrade head
 
 echo "Creating initial data..."
 python -m app.initial_data
+
+# The SIGAA catalog is loaded by a separate job (see "Catalog" in README.md),
+# so the API starts without crawling it